@@ -1,10 +1,15 @@
 import { DailyPuzzle, PuzzleData, CluesData } from './types';
 import { getESTDateString } from './timezone';
 
-// Helper function for case-agnostic clue lookup
+// Fallback clue lookup for puzzles without an embedded clue (scripts/join_clues.py
+// normally embeds them at build time). Clue files use upper-case keys, so try a
+// direct probe before the case-agnostic scan.
 function findClue(clues: CluesData, word: string): string {
   const normalizedWord = word.toUpperCase();
-  const matchingKey = Object.keys(clues).find(key => key.toUpperCase() === normalizedWord);
+  if (clues[normalizedWord]) {
+    return clues[normalizedWord];
+  }
+  const matchingKey = Object.keys(clues).find(key => key.trim().toUpperCase() === normalizedWord);
   return matchingKey ? clues[matchingKey] : "I literally have no clue";
 }
 
@@ -2,6 +2,60 @@ import { NextApiRequest, NextApiResponse } from 'next';
 import fs from 'fs';
 import path from 'path';
 
+// Shards written by scripts/shard_definitions.py
+const SHARD_DIR = path.join(process.cwd(), 'lib', 'data', 'definitions');
+
+type ShardManifest = {
+  layout: 'word' | 'month';
+  shards: string[];
+  words: Record<string, [number, number, number]>;
+};
+
+let manifestCache: { mtimeMs: number; manifest: ShardManifest } | undefined;
+
+// Re-read when shard_definitions.py rewrites the manifest. A missing or unreadable
+// manifest isn't cached, so shards written after startup are picked up.
+function loadManifest(): ShardManifest | null {
+  const manifestPath = path.join(SHARD_DIR, 'manifest.json');
+  try {
+    const { mtimeMs } = fs.statSync(manifestPath);
+    let cached = manifestCache;
+    if (!cached || cached.mtimeMs !== mtimeMs) {
+      cached = manifestCache = { mtimeMs, manifest: JSON.parse(fs.readFileSync(manifestPath, 'utf8')) };
+    }
+    return cached.manifest;
+  } catch (_) {
+    manifestCache = undefined;
+    return null;
+  }
+}
+
+// Reads only this word's bytes: words/<WORD>.json, or its byte range in a month shard.
+// Returns undefined when there are no shards, so the caller falls back to the full file.
+function readFromShards(upperWord: string): unknown | null | undefined {
+  const wordFile = path.join(SHARD_DIR, 'words', `${upperWord}.json`);
+  if (fs.existsSync(wordFile)) {
+    return JSON.parse(fs.readFileSync(wordFile, 'utf8'));
+  }
+  const manifest = loadManifest();
+  if (!manifest) {
+    return undefined;
+  }
+  const hit = manifest.words[upperWord];
+  if (!hit || manifest.layout !== 'month') {
+    return null;
+  }
+  const [shard, offset, length] = hit;
+  const buffer = Buffer.alloc(length);
+  const fd = fs.openSync(path.join(SHARD_DIR, manifest.shards[shard]), 'r');
+  try {
+    fs.readSync(fd, buffer, 0, length, offset);
+  } finally {
+    fs.closeSync(fd);
+  }
+  return JSON.parse(buffer.toString('utf8'));
+}
+
 export default function handler(req: NextApiRequest, res: NextApiResponse) {
   const { word } = req.query;
 
@@ -10,12 +64,15 @@ export default function handler(req: NextApiRequest, res: NextApiResponse) {
   }
 
   try {
-    const filePath = path.join(process.cwd(), 'lib', 'data', 'word-definitions-2025.json');
-    const fileContent = fs.readFileSync(filePath, 'utf8');
-    const definitionsData = JSON.parse(fileContent);
-
     const upperWord = word.toUpperCase();
-    const wordDefinition = definitionsData.definitions[upperWord];
+    let wordDefinition = /^[A-Z]+$/.test(upperWord) ? readFromShards(upperWord) : null;
+
+    if (wordDefinition === undefined) {
+      const filePath = path.join(process.cwd(), 'lib', 'data', 'word-definitions-2025.json');
+      const fileContent = fs.readFileSync(filePath, 'utf8');
+      const definitionsData = JSON.parse(fileContent);
+      wordDefinition = definitionsData.definitions[upperWord];
+    }
 
     if (!wordDefinition) {
       return res.status(404).json({ error: 'Word not found in definitions.' });
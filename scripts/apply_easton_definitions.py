@@ -4,9 +4,14 @@
 # and extracts all Scripture references into the "examples" array.
 
 from __future__ import annotations
-import argparse, json, re, sys
+import argparse, json, mmap, os, re, sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import instrument
+from json_output import add_output_args, output_options, write_json
+from word_roots import lemma_candidates
 
 # ---------- Scripture reference parsing ----------
 
@@ -42,72 +47,94 @@ FULL_RX = re.compile(
     r'(?P<book>(?:[1-3]\s*)?[A-Z][A-Za-z. ]+?)\s*(?P<chap>\d+)\s*:\s*(?P<v1>\d+)',
 )
 
+# extract_refs finds exactly the refs FULL_RX.search would, but in one left-to-right
+# pass. A FULL_RX match always has its book inside a maximal run of [A-Za-z. ]
+# characters and its "chap:verse" right after that run ends, so each run needs
+# one check (first capital, then the tail) instead of a regex retry per capital.
+_RUN_RX = re.compile(r'[A-Za-z. ]+')
+_CAP_RX = re.compile(r'[A-Z]')
+_TAIL_RX = re.compile(r'\s*(\d+)\s*:\s*(\d+)')
+_WS_RX = re.compile(r'\s*')
+_VERSES_RX = re.compile(r'\s*(\d+)(?:\s*-\s*(\d+))?')
+_CHAP_VERSES_RX = re.compile(r'\s*(\d+)\s*:\s*(\d+)(?:\s*-\s*(\d+))?')
+_SPACES_RX = re.compile(r'\s+')
+
 def _norm_book(b: str) -> str:
-    b = re.sub(r'\s+', ' ', b.strip())
+    b = _SPACES_RX.sub(' ', b.strip())
     if b in BOOK_ALIASES: return BOOK_ALIASES[b]
     if b.endswith('.') and b[:-1] in BOOK_ALIASES: return BOOK_ALIASES[b[:-1]]
     return b
 
+def _next_full_ref(text: str, i: int):
+    """Leftmost FULL_RX match at or after i as (book, chap, v1, end), or None."""
+    for run in _RUN_RX.finditer(text, i):
+        a, r = run.span()
+        cap = _CAP_RX.search(text, a, r - 1)  # book needs a capital plus >= 1 more char
+        if not cap:
+            continue
+        tail = _TAIL_RX.match(text, r)
+        if not tail:
+            continue
+        # optional "[1-3]\s*" book-number prefix directly before the capital
+        start = s = cap.start()
+        while s > i and text[s - 1].isspace():
+            s -= 1
+        if s > i and text[s - 1] in '123':
+            start = s - 1
+        return _norm_book(text[start:r]), int(tail.group(1)), int(tail.group(2)), tail.end()
+    return None
+
+@instrument.timed("extract_refs")
 def extract_refs(text: str) -> List[str]:
     """Extract refs like 'Matt. 1:16, 20; Luke 2:5; Deut. 20:7; 24:5' → list of fully-qualified refs."""
-    refs: List[str] = []
+    out: List[str] = []
+    seen = set()
+
+    def add(book: str, chap: int, vstart: int, vend: int):
+        for v in range(vstart, vend + 1):
+            r = f"{book} {chap}:{v}"
+            if r not in seen:
+                seen.add(r); out.append(r)
+
     i, n = 0, len(text)
+    book = None  # None: scanning for a full ref; otherwise inside that ref's list
     while i < n:
-        m = FULL_RX.search(text, i)
-        if not m: break
-        book = _norm_book(m.group('book'))
-        chap = int(m.group('chap'))
-        v1 = int(m.group('v1'))
-        refs.append(f"{book} {chap}:{v1}")
-        i = m.end()
-
-        while i < n:
-            j = i
-            while j < n and text[j].isspace(): j += 1
-            if j >= n: i = j; break
-
-            if text[j] == ',':
-                j += 1
-                m2 = re.match(r'\s*(\d+)(?:\s*-\s*(\d+))?', text[j:])
-                if not m2: i = j; break
+        if book is None:
+            m = _next_full_ref(text, i)
+            if not m: break
+            book, chap, v1, i = m
+            add(book, chap, v1, v1)
+            continue
+
+        j = _WS_RX.match(text, i).end()
+        if j >= n: break
+        c = text[j]
+        if c == ',':
+            m2 = _VERSES_RX.match(text, j + 1)
+            if m2:
                 vstart = int(m2.group(1))
-                vend = int(m2.group(2)) if m2.group(2) else vstart
-                for v in range(vstart, vend + 1):
-                    refs.append(f"{book} {chap}:{v}")
-                i = j + m2.end()
+                add(book, chap, vstart, int(m2.group(2)) if m2.group(2) else vstart)
+                i = m2.end()
                 continue
-
-            if text[j] == ';':
-                j += 1
-                m3 = re.match(r'\s*(\d+)\s*:\s*(\d+)(?:\s*-\s*(\d+))?', text[j:])
-                if m3:
-                    chap2 = int(m3.group(1))
-                    vstart = int(m3.group(2))
-                    vend = int(m3.group(3)) if m3.group(3) else vstart
-                    for v in range(vstart, vend + 1):
-                        refs.append(f"{book} {chap2}:{v}")
-                    i = j + m3.end()
-                    continue
-                m4 = FULL_RX.match(text, j)
-                if m4:
-                    book = _norm_book(m4.group('book'))
-                    chap = int(m4.group('chap'))
-                    v1 = int(m4.group('v1'))
-                    refs.append(f"{book} {chap}:{v1}")
-                    i = m4.end()
-                    continue
-                i = j
-                break
-            break
-
-    out, seen = [], set()
-    for r in refs:
-        if r not in seen:
-            seen.add(r); out.append(r)
+            i = j + 1
+        elif c == ';':
+            m3 = _CHAP_VERSES_RX.match(text, j + 1)
+            if m3:
+                # "; 24:5" lists under the same book; later ", N" verses keep the
+                # chapter of the full ref, as the previous implementation did
+                vstart = int(m3.group(2))
+                add(book, int(m3.group(1)), vstart, int(m3.group(3)) if m3.group(3) else vstart)
+                i = m3.end()
+                continue
+            # "; Luke 2:5" starts a new full ref; rescan from here
+            i = j + 1
+        book = None
     return out
 
 # ---------- Easton loader & index ----------
 
+INDEX_VERSION = 2
+
 def _canon_key(s: str) -> str:
     return re.sub(r'[^A-Za-z0-9]+', '', s).upper()
 
@@ -119,6 +146,20 @@ def _variants(term: str) -> Iterable[str]:
     if k.endswith('ES'): yield k[:-2]
     if k.endswith('S'): yield k[:-1]
 
+def _parse_record(line) -> Optional[Tuple[str, str]]:
+    """(term, body) from one JSONL line, or None if it is unusable."""
+    try:
+        obj = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if not isinstance(obj, dict): return None
+    term = obj.get("term") or obj.get("Term") or obj.get("title") or obj.get("Title")
+    body = obj.get("definitions") or obj.get("body") or obj.get("text") or ""
+    if isinstance(body, list): body = " ".join(map(str, body))
+    body = str(body)
+    if not term or not body: return None
+    return term, body
+
 def load_easton(path: Path) -> Tuple[Dict[str, str], int]:
     """Return index map canonical_key -> body, and count of lines read."""
     idx: Dict[str, str] = {}
@@ -128,21 +169,182 @@ def load_easton(path: Path) -> Tuple[Dict[str, str], int]:
             line = line.strip()
             if not line: continue
             lines += 1
-            try:
-                obj = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            term = obj.get("term") or obj.get("Term") or obj.get("title") or obj.get("Title")
-            body = obj.get("definitions") or obj.get("body") or obj.get("text") or ""
-            if isinstance(body, list): body = " ".join(map(str, body))
-            body = str(body)
-            if not term or not body: continue
+            rec = _parse_record(line)
+            if not rec: continue
+            term, body = rec
             for v in _variants(term):
                 # don't overwrite a previously set exact term with a later duplicate
                 if v not in idx:
                     idx[v] = body
     return idx, lines
 
+class EastonIndex:
+    """
+    Read-only canonical_key -> body mapping over the Easton JSONL file.
+    Keys map to the (byte offset, length) of their line; bodies are decoded
+    from an mmap of the file on first access, so only looked-up entries are
+    ever materialized. Variant keys share their record's offset; `headwords`
+    holds only the keys of real terms, without the singularized variants.
+    """
+    def __init__(self, path: Path, offsets: Dict[str, List[int]], lines: int, index_path: Path = None,
+                 headwords: Iterable[str] = ()):
+        self.path = path
+        self.index_path = index_path
+        self.offsets = offsets
+        self.headwords = frozenset(headwords)
+        self.lines = lines
+        self._bodies: Dict[int, str] = {}
+        self._file = path.open('rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if path.stat().st_size else b""
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.offsets
+
+    def __getitem__(self, key: str) -> str:
+        off, length = self.offsets[key]
+        body = self._bodies.get(off)
+        if body is None:
+            body = self._bodies[off] = _parse_record(self._mm[off:off + length])[1]
+        return body
+
+    def get(self, key: str, default=None):
+        return self[key] if key in self.offsets else default
+
+    def keys(self):
+        return self.offsets.keys()
+
+    def close(self):
+        if self._mm: self._mm.close()
+        self._file.close()
+
+def _source_stamp(path: Path) -> dict:
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+def build_easton_index(path: Path, index_path: Path) -> Tuple[Dict[str, List[int]], List[str], int]:
+    """Scan the JSONL once, recording each variant key's line offset and the term keys; persist to index_path."""
+    offsets: Dict[str, List[int]] = {}
+    terms = set()
+    lines = 0
+    off = 0
+    with path.open('rb') as f:
+        for raw in f:
+            start, off = off, off + len(raw)
+            if not raw.strip(): continue
+            lines += 1
+            rec = _parse_record(raw)
+            if not rec: continue
+            terms.add(_canon_key(rec[0]))
+            for v in _variants(rec[0]):
+                # first occurrence wins, as in load_easton
+                if v not in offsets:
+                    offsets[v] = [start, len(raw)]
+    terms.discard("")
+    payload = {"version": INDEX_VERSION, "source": _source_stamp(path), "lines": lines, "keys": offsets,
+               "terms": sorted(terms)}
+    tmp = index_path.with_name(f".{index_path.name}.tmp")
+    tmp.write_text(json.dumps(payload, separators=(',', ':')), encoding='utf-8')
+    os.replace(tmp, index_path)
+    return offsets, payload["terms"], lines
+
+def open_easton_index(path: Path, index_path: Path = None, rebuild: bool = False) -> Tuple[EastonIndex, int]:
+    """
+    Load the persisted offset index for `path` (default: <easton>.idx.json),
+    building it first if it is missing, stale (source size/mtime changed) or
+    `rebuild` is set. Returns the index and the count of JSONL lines.
+    """
+    index_path = index_path or path.with_name(path.name + ".idx.json")
+    meta = None
+    if not rebuild and index_path.exists():
+        try:
+            meta = json.loads(index_path.read_text(encoding='utf-8'))
+            if meta.get("version") != INDEX_VERSION or meta.get("source") != _source_stamp(path):
+                meta = None
+        except (ValueError, AttributeError):
+            meta = None
+    if meta is None:
+        offsets, terms, lines = build_easton_index(path, index_path)
+    else:
+        offsets, terms, lines = meta["keys"], meta["terms"], meta["lines"]
+    return EastonIndex(path, offsets, lines, index_path, terms), lines
+
+# ---------- Fuzzy headword matching ----------
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, or limit + 1 as soon as it must exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+def _deletions(s: str, depth: int) -> set:
+    out = {s}
+    frontier = {s}
+    for _ in range(depth):
+        frontier = {x[:i] + x[i + 1:] for x in frontier for i in range(len(x))}
+        out |= frontier
+    return out
+
+class HeadwordMatcher:
+    """
+    Resolves keys with no exact or plural match in Easton against real term
+    headwords. Inflection rules (irregular forms, then -ETH/-ED/-ING/...
+    suffixes) are tried first; after that, for words of MIN_EDIT_LEN letters
+    or more, the nearest headword within edit distance 1 (or `max_distance`
+    from 10 letters) is taken. The edit-distance search uses a symmetric
+    deletion index built on first use: two strings within distance d share a
+    <= d-deletion variant, so candidates come from dict hits, not a scan.
+    """
+    MIN_EDIT_LEN = 8  # shorter words have too many real near neighbours (GRAPE/GRACE, BREAK/BREAD)
+
+    def __init__(self, headwords: Iterable[str], max_distance: int = 2):
+        self.headwords = headwords
+        self.max_distance = max_distance
+        self._deletes: Dict[str, List[str]] = None
+
+    def _build(self):
+        self._deletes = {}
+        for h in self.headwords:
+            for d in _deletions(h, self.max_distance):
+                self._deletes.setdefault(d, []).append(h)
+
+    def limit_for(self, key: str) -> int:
+        return 1 if len(key) < 10 else self.max_distance
+
+    def match(self, key: str) -> Optional[Tuple[str, str]]:
+        """Return (headword, "lemma" | "edit") for the best approximate match, or None."""
+        for cand in lemma_candidates(key):
+            if cand in self.headwords:
+                return cand, "lemma"
+        if len(key) < self.MIN_EDIT_LEN:
+            return None
+        if self._deletes is None:
+            self._build()
+        limit = self.limit_for(key)
+        cands = set()
+        for d in _deletions(key, limit):
+            cands.update(self._deletes.get(d, ()))
+        best = None
+        for h in cands:
+            dist = _edit_distance(key, h, limit)
+            if dist > limit:
+                continue
+            prefix = len(os.path.commonprefix((key, h)))
+            rank = (dist, -prefix, abs(len(h) - len(key)), h)
+            if best is None or rank < best:
+                best = rank
+        return (best[3], "edit") if best else None
+
 # ---------- wordDefinitions.json helpers ----------
 
 def load_defs(path: Path) -> dict:
@@ -151,74 +353,151 @@ def load_defs(path: Path) -> dict:
         raise RuntimeError("wordDefinitions.json missing {\"definitions\": {...}}")
     return data
 
-def save_defs(data: dict, path: Path):
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+def save_defs(data: dict, path: Path, **output):
+    write_json(path, data, **output)
 
 # ---------- Merge ----------
 
+def resolve_word(word: str, easton_index, matcher: HeadwordMatcher = None) -> Tuple[Optional[str], Optional[str], Optional[list]]:
+    """
+    Return (how, headword, entries) for one WORD. how is "direct", "fuzzy"
+    (plural/singular variant), "lemma" / "edit" (via matcher) or None if
+    Easton has no match.
+    """
+    # wordDefinitions.json stores an array for each WORD key
+    match_key = _canon_key(word)
+    body = None
+    how = None
+    headword = None
+
+    # direct match or simple variants
+    if match_key in easton_index:
+        headword, how = match_key, "direct"
+    else:
+        # try plural/singular variants and spacing/punct changes
+        for v in _variants(word):
+            if v in easton_index:
+                headword, how = v, "fuzzy"
+                break
+        if how is None and matcher is not None:
+            hit = matcher.match(match_key)
+            if hit:
+                headword, how = hit
+    if headword is not None:
+        body = easton_index[headword]
+
+    if not body:
+        return None, None, None
+
+    # normalize body and extract scripture refs
+    if not isinstance(body, str):
+        body = str(body)
+    examples = extract_refs(body)
+
+    return how, headword, [{
+        "partOfSpeech": "",
+        "definitions": [body.strip()],
+        "examples": examples,
+    }]
+
+# Per-process Easton index (and matcher) for --workers; opened once by the pool initializer
+_worker_index = None
+_worker_matcher = None
+
+def _init_worker(easton_path: Path, index_path: Path, fuzzy_headwords: bool):
+    global _worker_index, _worker_matcher
+    _worker_index, _ = open_easton_index(easton_path, index_path)
+    _worker_matcher = HeadwordMatcher(_worker_index.headwords) if fuzzy_headwords else None
+
+def _resolve_chunk(words: List[str]) -> List[Tuple[str, Optional[str], Optional[str], Optional[list]]]:
+    return [(w, *resolve_word(w, _worker_index, _worker_matcher)) for w in words]
+
+def resolve_all(words: List[str], easton_index, matcher: HeadwordMatcher, workers: int, chunk_size: int):
+    """
+    Yield (word, how, headword, entries) in the order of `words`. With workers > 1 the
+    words are split into chunks resolved across a process pool; chunks come
+    back in submission order, so results match the serial path exactly.
+    """
+    if workers <= 1 or len(words) <= chunk_size:
+        for w in words:
+            yield (w, *resolve_word(w, easton_index, matcher))
+        return
+    chunks = [words[k:k + chunk_size] for k in range(0, len(words), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(easton_index.path, easton_index.index_path, matcher is not None)) as pool:
+        for results in pool.map(_resolve_chunk, chunks):
+            yield from results
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--defs", required=True)
     ap.add_argument("--easton", required=True)
     ap.add_argument("--out", required=True)
+    ap.add_argument("--index", help="offset index path (default: <easton>.idx.json, built on first use)")
+    ap.add_argument("--rebuild-index", action="store_true", help="rebuild the Easton offset index even if it looks current")
+    ap.add_argument("--workers", type=int, default=1, help="process pool size for lookup + ref extraction (1=serial)")
+    ap.add_argument("--fuzzy-headwords", action="store_true",
+                    help="also replace definitions via lemma / edit-distance headword matches "
+                         "(default: only list them as candidates)")
+    ap.add_argument("--no-candidates", action="store_true",
+                    help="don't look for lemma / edit-distance candidates at all")
+    ap.add_argument("--chunk-size", type=int, default=200, help="words per worker task with --workers")
+    add_output_args(ap)
+    instrument.add_instrument_args(ap)
     args = ap.parse_args()
+    instrument.start(args, "apply_easton_definitions")
 
     defs_path = Path(args.defs)
     easton_path = Path(args.easton)
     out_path = Path(args.out)
 
-    easton_index, lines = load_easton(easton_path)
+    with instrument.stage("index"):
+        easton_index, lines = open_easton_index(easton_path, Path(args.index) if args.index else None,
+                                                rebuild=args.rebuild_index)
     print(f"Loaded Easton: {lines} lines, {len(easton_index)} indexed keys")
 
-    data = load_defs(defs_path)
+    with instrument.stage("load"):
+        data = load_defs(defs_path)
     defs: dict = data["definitions"]
 
+    with instrument.stage("headword_matcher"):
+        matcher = None if args.no_candidates else HeadwordMatcher(easton_index.headwords)
+
     replaced = 0
-    direct = 0
-    fuzzy = 0
+    counts = {"direct": 0, "fuzzy": 0, "lemma": 0, "edit": 0}
+    approximate: List[str] = []
     missing_words: List[str] = []
 
-    for word, entries in defs.items():
-        # wordDefinitions.json stores an array for each WORD key
-        match_key = _canon_key(word)
-        body = None
-
-        # direct match or simple variants
-        if match_key in easton_index:
-            body = easton_index[match_key]
-            how = "direct"
-            direct += 1
-        else:
-            # try plural/singular variants and spacing/punct changes
-            for v in _variants(word):
-                if v in easton_index:
-                    body = easton_index[v]
-                    how = "fuzzy"
-                    fuzzy += 1
-                    break
-
-        if not body:
-            missing_words.append(word)
-            continue
-
-        # normalize body and extract scripture refs
-        if not isinstance(body, str):
-            body = str(body)
-        examples = extract_refs(body)
-
-        defs[word] = [{
-            "partOfSpeech": "",
-            "definitions": [body.strip()],
-            "examples": examples,
-        }]
-
-        replaced += 1
+    with instrument.stage("resolve"):
+        for word, how, headword, entries in resolve_all(list(defs), easton_index, matcher,
+                                                        args.workers, max(1, args.chunk_size)):
+            if how is None:
+                missing_words.append(word)
+                continue
+            if how in ("lemma", "edit"):
+                approximate.append(f"{word} -> {headword} ({how})")
+                if not args.fuzzy_headwords:
+                    missing_words.append(word)
+                    continue
+            counts[how] += 1
+            defs[word] = entries
+            replaced += 1
+    for how, n in counts.items():
+        instrument.count(f"matched_{how}", n)
+    instrument.count("missing", len(missing_words))
 
-    save_defs(data, out_path)
-    print(f"Replaced {replaced} entries (direct: {direct}, fuzzy: {fuzzy})")
+    easton_index.close()
+    with instrument.stage("write"):
+        save_defs(data, out_path, **output_options(args))
+    print(f"Replaced {replaced} entries (direct: {counts['direct']}, fuzzy: {counts['fuzzy']}, "
+          f"lemma: {counts['lemma']}, edit: {counts['edit']})")
+    if approximate:
+        print(f"Approximate headword matches ({len(approximate)}"
+              + ("):" if args.fuzzy_headwords else ", not applied; pass --fuzzy-headwords to use them):"))
+        print("\n".join(approximate))
     if missing_words:
         print(f"Missing ({len(missing_words)}):")
         print("\n".join(sorted(set(missing_words))))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
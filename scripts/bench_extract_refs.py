@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# bench_extract_refs.py
+# Benchmarks extract_refs over an Easton JSONL corpus and checks that it returns
+# exactly what the previous regex-search implementation (kept below as the
+# reference) returned for every body. Exits 1 on any mismatch.
+#
+# Usage:
+#   python3 scripts/bench_extract_refs.py --easton data/easton.jsonl
+#   python3 scripts/bench_extract_refs.py --easton data/easton.jsonl --repeat 5 --concat
+
+from __future__ import annotations
+import argparse, re, sys, time
+from pathlib import Path
+from typing import Callable, List
+
+from apply_easton_definitions import FULL_RX, _norm_book, extract_refs, load_easton
+
+# Edge cases checked even without a corpus
+CASES = [
+    "Matt. 1:16, 20; Luke 2:5; Deut. 20:7; 24:5",
+    "See Gen. 1:1-3, 5 - 7; 2:4, 9",
+    "1 Sam. 3:4; 2 Sam. 5:6,7;3 John 1:2",
+    "2\nKings 4:1, 2 Sam. 1:1",
+    "Ps. 23:1;Ps. 24:1 ; ; 25:1",
+    "(Rev. 21:2, 10; comp. Isa. 1:1), and Heb. 11:10.",
+    "no refs here at all, Just Words.",
+    "A 1:2, B 3:4-2",
+]
+
+def legacy_extract_refs(text: str) -> List[str]:
+    """The FULL_RX.search / re.match(text[j:]) implementation extract_refs replaced."""
+    refs: List[str] = []
+    i, n = 0, len(text)
+    while i < n:
+        m = FULL_RX.search(text, i)
+        if not m: break
+        book = _norm_book(m.group('book'))
+        chap = int(m.group('chap'))
+        v1 = int(m.group('v1'))
+        refs.append(f"{book} {chap}:{v1}")
+        i = m.end()
+
+        while i < n:
+            j = i
+            while j < n and text[j].isspace(): j += 1
+            if j >= n: i = j; break
+
+            if text[j] == ',':
+                j += 1
+                m2 = re.match(r'\s*(\d+)(?:\s*-\s*(\d+))?', text[j:])
+                if not m2: i = j; break
+                vstart = int(m2.group(1))
+                vend = int(m2.group(2)) if m2.group(2) else vstart
+                for v in range(vstart, vend + 1):
+                    refs.append(f"{book} {chap}:{v}")
+                i = j + m2.end()
+                continue
+
+            if text[j] == ';':
+                j += 1
+                m3 = re.match(r'\s*(\d+)\s*:\s*(\d+)(?:\s*-\s*(\d+))?', text[j:])
+                if m3:
+                    chap2 = int(m3.group(1))
+                    vstart = int(m3.group(2))
+                    vend = int(m3.group(3)) if m3.group(3) else vstart
+                    for v in range(vstart, vend + 1):
+                        refs.append(f"{book} {chap2}:{v}")
+                    i = j + m3.end()
+                    continue
+                m4 = FULL_RX.match(text, j)
+                if m4:
+                    book = _norm_book(m4.group('book'))
+                    chap = int(m4.group('chap'))
+                    v1 = int(m4.group('v1'))
+                    refs.append(f"{book} {chap}:{v1}")
+                    i = m4.end()
+                    continue
+                i = j
+                break
+            break
+
+    out, seen = [], set()
+    for r in refs:
+        if r not in seen:
+            seen.add(r); out.append(r)
+    return out
+
+def time_it(fn: Callable[[str], List[str]], bodies: List[str], repeat: int):
+    best, total_refs = float("inf"), 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        total_refs = sum(len(fn(b)) for b in bodies)
+        best = min(best, time.perf_counter() - t0)
+    return best, total_refs
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark extract_refs and check it against the legacy implementation.")
+    ap.add_argument("--easton", help="Easton JSONL corpus (omit to check only the built-in cases)")
+    ap.add_argument("--repeat", type=int, default=3, help="timing runs per implementation; best is reported")
+    ap.add_argument("--concat", action="store_true", help="also time the whole corpus joined into one body")
+    args = ap.parse_args()
+
+    bodies = list(CASES)
+    if args.easton:
+        idx, lines = load_easton(Path(args.easton))
+        bodies += list(dict.fromkeys(idx.values()))
+        print(f"Loaded {lines} lines, {len(bodies) - len(CASES)} distinct bodies")
+
+    mismatches = [b for b in bodies if extract_refs(b) != legacy_extract_refs(b)]
+    print(f"Equivalence: {len(bodies) - len(mismatches)}/{len(bodies)} bodies identical")
+    for b in mismatches[:5]:
+        print(f"  MISMATCH: {b[:120]!r}")
+
+    chars = sum(len(b) for b in bodies)
+    runs = [("corpus", bodies)]
+    if args.concat:
+        runs.append(("concatenated", [" ".join(bodies)]))
+    for label, sample in runs:
+        t_old, refs_old = time_it(legacy_extract_refs, sample, args.repeat)
+        t_new, refs_new = time_it(extract_refs, sample, args.repeat)
+        print(f"[{label}] {chars:,} chars | legacy {t_old * 1000:.1f} ms ({refs_old} refs) | "
+              f"single-pass {t_new * 1000:.1f} ms ({refs_new} refs) | {t_old / max(t_new, 1e-9):.1f}x")
+
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
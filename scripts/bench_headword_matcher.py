@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# bench_headword_matcher.py
+# Measures HeadwordMatcher build time and per-lookup latency over the full set
+# of Easton headwords, against a linear edit-distance scan as the baseline.
+#
+# Usage:
+#   python3 scripts/bench_headword_matcher.py --easton data/easton.jsonl
+#   python3 scripts/bench_headword_matcher.py --easton data/easton.jsonl --queries 2000 --scan-sample 50
+
+from __future__ import annotations
+import argparse, random, statistics, string, time
+from pathlib import Path
+from typing import List
+
+from apply_easton_definitions import HeadwordMatcher, _edit_distance, open_easton_index
+
+# Puzzle words that used to fall through to "missing"
+KNOWN_MISSES = ["BEGAT", "SMOTE", "DWELT", "CHOSEN", "SPAKE", "SLAIN", "LOVETH", "WROUGHT"]
+
+def mutate(word: str, rng: random.Random) -> str:
+    i = rng.randrange(len(word))
+    op = rng.choice(("sub", "ins", "del"))
+    if op == "sub":
+        return word[:i] + rng.choice(string.ascii_uppercase) + word[i + 1:]
+    if op == "ins":
+        return word[:i] + rng.choice(string.ascii_uppercase) + word[i:]
+    return word[:i] + word[i + 1:] if len(word) > 1 else word
+
+def linear_scan(key: str, headwords: List[str], limit: int):
+    best = None
+    for h in headwords:
+        d = _edit_distance(key, h, limit)
+        if d <= limit and (best is None or (d, h) < best):
+            best = (d, h)
+    return best
+
+def summarize(label: str, samples: List[float]):
+    us = sorted(s * 1e6 for s in samples)
+    p95 = us[min(len(us) - 1, int(len(us) * 0.95))]
+    print(f"  {label:<12} n={len(us):<6} mean {statistics.mean(us):9.1f} us | "
+          f"p50 {statistics.median(us):9.1f} us | p95 {p95:9.1f} us | max {us[-1]:9.1f} us")
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark fuzzy Easton headword lookups.")
+    ap.add_argument("--easton", required=True, help="Easton JSONL corpus")
+    ap.add_argument("--queries", type=int, default=1000, help="mutated-headword queries to time")
+    ap.add_argument("--scan-sample", type=int, default=20, help="queries to time with the linear-scan baseline")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    index, lines = open_easton_index(Path(args.easton))
+    headwords = sorted(index.headwords)
+    print(f"Easton: {lines} lines, {len(headwords)} headwords")
+
+    matcher = HeadwordMatcher(index.headwords)
+    t0 = time.perf_counter()
+    matcher._build()
+    print(f"Deletion index: {len(matcher._deletes):,} entries built in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    rng = random.Random(args.seed)
+    edited = [mutate(rng.choice(headwords), rng) for _ in range(args.queries)]
+    edited = [q for q in edited if q not in index]
+
+    print("Matcher latency:")
+    for label, queries in (("known misses", KNOWN_MISSES), ("edited", edited)):
+        samples, hits = [], 0
+        for q in queries:
+            t0 = time.perf_counter()
+            hits += matcher.match(q) is not None
+            samples.append(time.perf_counter() - t0)
+        summarize(label, samples)
+        print(f"  {'':<12} resolved {hits}/{len(queries)}")
+
+    sample = edited[:args.scan_sample]
+    if sample:
+        samples = []
+        for q in sample:
+            t0 = time.perf_counter()
+            linear_scan(q, headwords, matcher.limit_for(q))
+            samples.append(time.perf_counter() - t0)
+        print("Linear scan baseline:")
+        summarize("edited", samples)
+    index.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# bench_scheduler.py
+# Times schedule_range over a multi-year span with all three lengths and
+# checks the result against the repeat-window, week-mix and shared-root rules.
+# Exits 1 if any constraint is violated or the schedule comes up short.
+#
+# Usage:
+#   python3 scripts/bench_scheduler.py
+#   python3 scripts/bench_scheduler.py --years 10 --min-gap 730 --repeat 5
+
+import argparse, json, statistics, sys, time
+from datetime import date, timedelta
+from pathlib import Path
+
+from build_daily_puzzles import ALPHA57, check_schedule, parse_week_mix, schedule_range
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "lib" / "data"
+
+def load_dictionaries(data_dir: Path):
+    pool, seen = [], set()
+    for n in (5, 6, 7):
+        for w in json.loads((data_dir / f"dictionary{n}.json").read_text(encoding="utf-8")):
+            s = str(w).strip().upper()
+            if ALPHA57.match(s) and s not in seen:
+                seen.add(s)
+                pool.append(s)
+    return pool
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the constraint-aware puzzle scheduler.")
+    ap.add_argument("--data-dir", default=str(DATA_DIR), help="where dictionary{5,6,7}.json live (default lib/data)")
+    ap.add_argument("--start", default="2026-01-01")
+    ap.add_argument("--years", type=int, default=10)
+    ap.add_argument("--min-gap", type=int, default=365)
+    ap.add_argument("--week-mix", default="5:2,6:3,7:2")
+    ap.add_argument("--repeat", type=int, default=3, help="timed runs (median reported)")
+    args = ap.parse_args()
+
+    pool = load_dictionaries(Path(args.data_dir))
+    week_mix = parse_week_mix(args.week_mix)
+    start = date.fromisoformat(args.start)
+    end = date(start.year + args.years, start.month, start.day) - timedelta(days=1)
+    days = (end - start).days + 1
+    print(f"Pool: {len(pool)} words | {start} → {end} ({days} days) | min gap {args.min_gap} | mix {args.week_mix}")
+
+    times = []
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        puzzles = schedule_range(pool, start, end, args.min_gap, week_mix)
+        times.append(time.perf_counter() - t0)
+
+    med = statistics.median(times)
+    print(f"schedule_range: median {med * 1000:.1f} ms over {args.repeat} runs ({med / days * 1e6:.1f} us/day)")
+    violations = check_schedule(puzzles, args.min_gap, week_mix)
+    print("Violations: " + ", ".join(f"{k}={v}" for k, v in violations.items()))
+    if len(puzzles) != days or any(violations.values()):
+        print(f"FAILED: scheduled {len(puzzles)}/{days} days", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
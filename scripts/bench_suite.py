@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# bench_suite.py
+# Offline benchmarks for the data-script hot paths over synthetic corpora at
+# 1x, 10x and 100x the size of the current lib/data files. Nothing here needs
+# the network or wordfreq: the frequency list is a synthetic freq_snapshot file.
+#
+# Benchmarks (input that scales in brackets):
+#   extract_refs        apply_easton_definitions.extract_refs over every Easton body   [Easton entries]
+#   load_easton         apply_easton_definitions.load_easton on the JSONL file          [Easton entries]
+#   to_structured       build_word_definitions_full.to_structured on API payloads      [payloads]
+#   collect_for_length  build_common_wordlists scoring + 6/7 selection from a snapshot [ranked words]
+#   schedule            build_daily_puzzles.schedule_range + split_by_year, 2 years     [pool]
+#                       (the scheduler that replaced assign_by_year)
+#   build_for_length    build_puzzles_from_clues.build_for_length, 2 years, 5/6/7      [clue maps]
+#   check_dictionary    check_dictionary.check_dictionary on dictionary{5,6,7}         [dictionaries]
+#   clean_dictionary    clean_dictionary.clean_dictionary on the same files            [dictionaries]
+#
+# Corpora are generated once per (scale, seed) under --corpus-dir and reused.
+# Results go to a JSON file (default .cache/bench/results-<timestamp>.json);
+# --compare OLD.json prints per-benchmark ratios and exits 1 when any
+# benchmark got slower than --threshold.
+#
+# Usage:
+#   python3 scripts/bench_suite.py
+#   python3 scripts/bench_suite.py --scales 1 10 100 --repeat 5 --out /tmp/bench.json
+#   python3 scripts/bench_suite.py --only extract_refs load_easton --compare .cache/bench/results-20261001-120000.json
+
+from __future__ import annotations
+import argparse, contextlib, io, json, platform, random, string, sys, time
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import build_puzzles_from_clues
+from apply_easton_definitions import extract_refs, load_easton
+from build_common_wordlists import collect_for_length, score_candidates
+from build_daily_puzzles import DEFAULT_WEEK_MIX, schedule_range, split_by_year
+from build_word_definitions_full import to_structured
+from check_dictionary import check_dictionary
+from clean_dictionary import clean_dictionary
+from freq_snapshot import load_freq_source, write_snapshot
+from json_output import write_json
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BENCH_DIR = REPO_ROOT / ".cache" / "bench"
+
+# 1x sizes, from lib/data at the time of writing (Easton's dictionary has ~4k entries;
+# build_common_wordlists scans wordfreq's top 300k by default)
+BASE = {"dictionary": 2500, "easton": 4000, "clues": 730, "payloads": 365, "ranked": 300_000}
+FREQ_CAP = 3_000_000  # wordfreq's English list is far smaller than 100x of 300k
+LENGTHS = (5, 6, 7)
+YEARS = [2030, 2031]
+BOOKS = ["Gen.", "Ex.", "Lev.", "Deut.", "1 Sam.", "2 Kings", "Ps.", "Isa.", "Matt.", "Luke", "John", "Rom.", "Heb."]
+FILLER = ("the of and unto Lord Israel Moses saying in wilderness spoke dwell people king city "
+          "son father land house name God temple priest").split()
+
+# ---------- corpus generators ----------
+
+def random_words(rng: random.Random, count: int, lengths: Tuple[int, ...]) -> List[str]:
+    """`count` distinct lowercase words, lengths drawn from `lengths`."""
+    out, seen = [], set()
+    letters = string.ascii_lowercase
+    while len(out) < count:
+        w = "".join(rng.choices(letters, k=rng.choice(lengths)))
+        if w not in seen:
+            seen.add(w)
+            out.append(w)
+    return out
+
+def ref_group(rng: random.Random) -> str:
+    book = rng.choice(BOOKS)
+    chap, verse = rng.randint(1, 50), rng.randint(1, 30)
+    tail = f", {rng.randint(1, 30)}; {rng.randint(1, 50)}:{verse}-{verse + rng.randint(1, 4)}"
+    return f"({book} {chap}:{verse}{tail if rng.random() < 0.6 else ''})"
+
+def gen_easton(path: Path, entries: int, rng: random.Random):
+    with path.open("w", encoding="utf-8") as f:
+        for term in random_words(rng, entries, (4, 5, 6, 7, 8, 9)):
+            parts = []
+            for _ in range(rng.randint(2, 6)):
+                parts += rng.choices(FILLER, k=rng.randint(4, 14))
+                parts.append(ref_group(rng))
+            f.write(json.dumps({"term": term.capitalize(), "definitions": " ".join(parts)}) + "\n")
+
+def gen_dictionary(path: Path, n: int, count: int, rng: random.Random):
+    """Mostly clean n-letter words plus ~1% case-variant duplicates and ~0.5% wrong lengths."""
+    words = random_words(rng, count, (n,))
+    for i in rng.sample(range(len(words)), max(1, count // 100)):
+        words.append(words[i].upper())
+    for w in random_words(rng, max(1, count // 200), (n - 1, n + 1)):
+        words.insert(rng.randrange(len(words)), w)
+    path.write_text(json.dumps(words), encoding="utf-8")
+
+def gen_clues(corpus: Path, count: int, rng: random.Random):
+    """clues-{YEAR}.json maps split across YEARS, words of every length."""
+    words = [w.upper() for w in random_words(rng, count, LENGTHS)]
+    per_year = -(-len(words) // len(YEARS))
+    for i, y in enumerate(YEARS):
+        chunk = words[i * per_year:(i + 1) * per_year]
+        clues = {w: " ".join(rng.choices(FILLER, k=rng.randint(3, 7))).capitalize() for w in chunk}
+        (corpus / f"clues-{y}.json").write_text(json.dumps(clues), encoding="utf-8")
+
+def gen_payloads(path: Path, count: int, rng: random.Random):
+    """dictionaryapi.dev-shaped responses, one JSON array per line."""
+    with path.open("w", encoding="utf-8") as f:
+        for w in random_words(rng, count, LENGTHS):
+            meanings = []
+            for pos in rng.sample(["noun", "verb", "adjective", "adverb"], rng.randint(1, 3)):
+                defs = [{"definition": " ".join(rng.choices(FILLER, k=rng.randint(6, 16))) + ".",
+                         "example": " ".join(rng.choices(FILLER, k=8)) if rng.random() < 0.4 else "",
+                         "synonyms": [], "antonyms": []} for _ in range(rng.randint(1, 6))]
+                meanings.append({"partOfSpeech": pos, "definitions": defs})
+            f.write(json.dumps([{"word": w, "meanings": meanings}]) + "\n")
+
+def gen_snapshot(path: Path, count: int, rng: random.Random):
+    """A ranked word list with zipf falling from 7.5 to 1.0, as a freq_snapshot file."""
+    words = random_words(rng, count, (3, 4, 5, 6, 7, 8, 9, 10))
+    pairs = [(w, 7.5 - 6.5 * i / max(count - 1, 1)) for i, w in enumerate(words)]
+    write_snapshot(path, "en", pairs, "synthetic")
+
+def corpus_for(root: Path, scale: int, seed: int) -> Path:
+    """Generate (or reuse) every corpus file for one scale."""
+    corpus = root / f"x{scale}-seed{seed}"
+    done = corpus / ".complete"
+    if done.exists():
+        return corpus
+    corpus.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+    rng = random.Random(f"{seed}:{scale}")
+    gen_easton(corpus / "easton.jsonl", BASE["easton"] * scale, rng)
+    for n in LENGTHS:
+        gen_dictionary(corpus / f"dictionary{n}.json", n, BASE["dictionary"] * scale, rng)
+    gen_clues(corpus, BASE["clues"] * scale, rng)
+    gen_payloads(corpus / "payloads.jsonl", BASE["payloads"] * scale, rng)
+    gen_snapshot(corpus / "freq.snap", min(BASE["ranked"] * scale, FREQ_CAP), rng)
+    done.touch()
+    print(f"[corpus] x{scale} generated in {time.perf_counter() - t0:.1f}s -> {corpus}", file=sys.stderr)
+    return corpus
+
+# ---------- benchmarks ----------
+# Each takes the corpus dir and returns (run, items): run() is what gets timed,
+# items is the size of the input it processes.
+
+def bench_extract_refs(corpus: Path):
+    bodies = list(dict.fromkeys(load_easton(corpus / "easton.jsonl")[0].values()))
+    return lambda: sum(len(extract_refs(b)) for b in bodies), len(bodies)
+
+def bench_load_easton(corpus: Path):
+    path = corpus / "easton.jsonl"
+    return lambda: load_easton(path), load_easton(path)[1]
+
+def bench_to_structured(corpus: Path):
+    payloads = [json.loads(line) for line in (corpus / "payloads.jsonl").open(encoding="utf-8")]
+    return lambda: sum(len(to_structured(p)) for p in payloads), len(payloads)
+
+def bench_collect_for_length(corpus: Path):
+    snap = str(corpus / "freq.snap")
+    top_n_list, _ = load_freq_source(snap)
+    count = len(top_n_list("en", FREQ_CAP))
+
+    def run():
+        top_n_list, zipf_frequency = load_freq_source(snap)
+        scored = score_candidates(top_n_list("en", count), [6, 7], "en", zipf_frequency)
+        return [collect_for_length(n, 2500, 4.0, 2.8, 0.1, "en", count, scored=scored) for n in (6, 7)]
+    return run, count
+
+def bench_schedule(corpus: Path):
+    pool = sorted({str(w).upper() for n in LENGTHS
+                   for w in json.loads((corpus / f"dictionary{n}.json").read_text(encoding="utf-8"))
+                   if len(str(w)) == n})
+    start, end = date(YEARS[0], 1, 1), date(YEARS[-1], 12, 31)
+    return lambda: split_by_year(schedule_range(pool, start, end, 365, DEFAULT_WEEK_MIX)), len(pool)
+
+def bench_build_for_length(corpus: Path):
+    clues = sum(len(json.loads(p.read_text(encoding="utf-8"))) for p in corpus.glob("clues-*.json"))
+
+    def run():
+        build_puzzles_from_clues.DATA_DIR = corpus  # inputs and puzzles{N}-{YEAR}.json live in the corpus
+        random.seed(0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for n in LENGTHS:
+                build_puzzles_from_clues.build_for_length(n, YEARS, date(YEARS[0], 1, 1), quiet=True)
+    return run, clues
+
+def bench_check_dictionary(corpus: Path):
+    paths = [corpus / f"dictionary{n}.json" for n in LENGTHS]
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for p in paths:
+                check_dictionary(p)
+    return run, sum(len(json.loads(p.read_text(encoding="utf-8"))) for p in paths)
+
+def bench_clean_dictionary(corpus: Path):
+    paths = [corpus / f"dictionary{n}.json" for n in LENGTHS]
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for p in paths:
+                clean_dictionary(str(p), str(p.with_name(p.stem + "_cleaned.json")))
+    return run, sum(len(json.loads(p.read_text(encoding="utf-8"))) for p in paths)
+
+BENCHMARKS: Dict[str, Callable[[Path], Tuple[Callable[[], object], int]]] = {
+    "extract_refs": bench_extract_refs,
+    "load_easton": bench_load_easton,
+    "to_structured": bench_to_structured,
+    "collect_for_length": bench_collect_for_length,
+    "schedule": bench_schedule,
+    "build_for_length": bench_build_for_length,
+    "check_dictionary": bench_check_dictionary,
+    "clean_dictionary": bench_clean_dictionary,
+}
+
+def time_it(run: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+def compare(results: Dict[str, dict], old_path: Path, threshold: float) -> List[str]:
+    """Print new/old best-time ratios; return the keys that regressed past `threshold`."""
+    old = json.loads(old_path.read_text(encoding="utf-8"))["results"]
+    regressed = []
+    print(f"\nvs {old_path}:")
+    for key, rec in results.items():
+        if key not in old:
+            continue
+        ratio = rec["best_seconds"] / max(old[key]["best_seconds"], 1e-9)
+        flag = "REGRESSION" if ratio > 1 + threshold else ""
+        if flag:
+            regressed.append(key)
+        print(f"  {key:<28} {old[key]['best_seconds'] * 1000:10.1f} ms -> {rec['best_seconds'] * 1000:10.1f} ms "
+              f"({ratio:5.2f}x) {flag}")
+    return regressed
+
+def main():
+    ap = argparse.ArgumentParser(description="Offline benchmarks of the data scripts over synthetic corpora.")
+    ap.add_argument("--scales", nargs="+", type=int, default=[1, 10], help="corpus sizes as multiples of lib/data (default 1 10)")
+    ap.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), metavar="BENCH", help="run only these benchmarks")
+    ap.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark; the best is compared (default 3)")
+    ap.add_argument("--seed", type=int, default=1, help="corpus generator seed")
+    ap.add_argument("--corpus-dir", default=str(BENCH_DIR / "corpora"), help="where generated corpora are kept")
+    ap.add_argument("--out", help="results JSON (default .cache/bench/results-<timestamp>.json)")
+    ap.add_argument("--compare", help="earlier results JSON to compare against")
+    ap.add_argument("--threshold", type=float, default=0.25, help="slowdown counted as a regression (default 0.25 = 25%%)")
+    args = ap.parse_args()
+
+    names = args.only or list(BENCHMARKS)
+    results: Dict[str, dict] = {}
+    for scale in args.scales:
+        corpus = corpus_for(Path(args.corpus_dir), scale, args.seed)
+        for name in names:
+            run, items = BENCHMARKS[name](corpus)
+            samples = time_it(run, max(1, args.repeat))
+            best = min(samples)
+            results[f"{name}@x{scale}"] = {
+                "benchmark": name, "scale": scale, "items": items,
+                "best_seconds": round(best, 6), "mean_seconds": round(sum(samples) / len(samples), 6),
+                "us_per_item": round(best * 1e6 / max(items, 1), 3),
+            }
+            print(f"x{scale:<4} {name:<20} {items:>10,} items  best {best * 1000:10.1f} ms  "
+                  f"{best * 1e6 / max(items, 1):9.2f} us/item", flush=True)
+
+    out = Path(args.out or BENCH_DIR / f"results-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    write_json(out, {
+        "metadata": {
+            "generated": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(), "machine": platform.machine(),
+            "scales": args.scales, "repeat": args.repeat, "seed": args.seed, "base_sizes": BASE,
+        },
+        "results": results,
+    }, compress=False, quiet=True)
+    print(f"Results -> {out}")
+
+    if args.compare:
+        regressed = compare(results, Path(args.compare), args.threshold)
+        if regressed:
+            print(f"{len(regressed)} regression(s) over {args.threshold:.0%}: {', '.join(regressed)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
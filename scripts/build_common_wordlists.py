@@ -13,57 +13,87 @@ Usage examples:
   python3 scripts/build_common_wordlists.py --size 5000
   python3 scripts/build_common_wordlists.py --only 6 --size 8000
   python3 scripts/build_common_wordlists.py --min-zipf 4.2
+  python3 scripts/build_common_wordlists.py --freq-snapshot data/wordfreq-en-300k.bin   (no wordfreq needed)
 """
 
-import argparse, json, os, re
-from typing import List
-from wordfreq import top_n_list, zipf_frequency
+import argparse, os, re
+from bisect import bisect_right
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import instrument
+from freq_snapshot import load_freq_source
+from json_output import add_output_args, output_options, write_json
 
 ALPHA_RE = re.compile(r"^[a-z]+$")
 
-def is_clean_common(word: str, want_len: int, min_zipf: float, lang: str) -> bool:
-    if not word.islower():
-        return False
-    if not ALPHA_RE.match(word):
-        return False
-    if len(word) != want_len:
-        return False
-    if zipf_frequency(word, lang) < min_zipf:
-        return False
-    return True
+@instrument.timed("score_candidates")
+def score_candidates(base: Iterable[str],
+                     lengths: Iterable[int],
+                     lang: str,
+                     zipf_frequency: Callable[[str, str], float]) -> Dict[int, List[Tuple[str, float]]]:
+    """
+    One pass over the frequency-ranked word list: keep clean words of the wanted
+    lengths (first occurrence, list order) with their ZIPF score, looked up once.
+    """
+    want = set(lengths)
+    scored: Dict[int, List[Tuple[str, float]]] = {n: [] for n in want}
+    seen = set()
+    for w in base:
+        if len(w) not in want or w in seen:
+            continue
+        if not w.islower() or not ALPHA_RE.match(w):
+            continue
+        seen.add(w)
+        scored[len(w)].append((w, zipf_frequency(w, lang)))
+    instrument.count("zipf_lookups", len(seen))
+    return scored
+
+def pick_floor(zipfs_desc: List[float],
+               size: int,
+               start_zipf: float,
+               min_zipf_floor: float,
+               step_zipf: float) -> float:
+    """
+    The floor the adaptive relaxation (start, start - step, ... down to
+    min_zipf_floor) stops at: the first that admits `size` words. Each step
+    is a bisect over the descending scores instead of a rescan.
+    """
+    neg = [-z for z in zipfs_desc]  # ascending, for bisect
+    floor = start_zipf
+    while True:
+        if bisect_right(neg, -floor) >= size or floor <= min_zipf_floor:
+            return floor
+        floor = max(min_zipf_floor, floor - step_zipf)
 
+@instrument.timed("collect_for_length")
 def collect_for_length(length: int,
                        size: int,
                        start_zipf: float,
                        min_zipf_floor: float,
                        step_zipf: float,
                        lang: str,
-                       n_top: int) -> List[str]:
-    base = top_n_list(lang, n_top)
-    floor = start_zipf
-
-    while True:
-        kept: List[str] = []
-        seen = set()
-
-        for w in base:
-            if w in seen:
-                continue
-            if is_clean_common(w, length, floor, lang):
-                seen.add(w)
-                kept.append(w)
+                       n_top: int,
+                       scored: Optional[Dict[int, List[Tuple[str, float]]]] = None,
+                       freq_snapshot: Optional[str] = None) -> List[str]:
+    if scored is None or length not in scored:
+        top_n_list, zipf_frequency = load_freq_source(freq_snapshot)
+        scored = score_candidates(top_n_list(lang, n_top), [length], lang, zipf_frequency)
+    table = scored[length]
+    floor = pick_floor(sorted((z for _, z in table), reverse=True),
+                       size, start_zipf, min_zipf_floor, step_zipf)
+
+    # Same cap as scanning the ranked list: stop after size + 1500 keepers
+    kept: List[Tuple[str, float]] = []
+    for w, z in table:
+        if z >= floor:
+            kept.append((w, z))
             if len(kept) > size + 1500:
                 break
 
-        # Sort by frequency desc then alpha (stable)
-        kept.sort(key=lambda x: (-zipf_frequency(x, lang), x))
-
-        if len(kept) >= size or floor <= min_zipf_floor:
-            top = max(size, min(len(kept), size + 1000))
-            return kept[:top]
-
-        # Not enough: relax the floor a bit
-        floor = max(min_zipf_floor, floor - step_zipf)
+    # Sort by frequency desc then alpha (stable)
+    kept.sort(key=lambda wz: (-wz[1], wz[0]))
+    top = max(size, min(len(kept), size + 1000))
+    return [w for w, _ in kept[:top]]
 
 def main():
     ap = argparse.ArgumentParser(description="Build common 6/7-letter word lists.")
@@ -78,7 +108,12 @@ def main():
     ap.add_argument("--step-zipf", type=float, default=0.1, help="ZIPF relaxation step (default 0.1)")
     ap.add_argument("--min-zipf-floor", type=float, default=2.8,
                     help="Do not relax below this ZIPF (default 2.8)")
+    ap.add_argument("--freq-snapshot", default=None,
+                    help="Read frequencies from a freq_snapshot.py file instead of wordfreq")
+    add_output_args(ap)
+    instrument.add_instrument_args(ap)
     args = ap.parse_args()
+    instrument.start(args, "build_common_wordlists")
 
     os.makedirs(args.outdir, exist_ok=True)
 
@@ -88,6 +123,13 @@ def main():
 
     built_any = False
 
+    # Score the ranked list once; both lengths select from the same table
+    lengths = [6, 7] if args.only is None else [int(args.only)]
+    with instrument.stage("load_freq"):
+        top_n_list, zipf_frequency = load_freq_source(args.freq_snapshot)
+        base = top_n_list(args.lang, args.top)
+    scored = score_candidates(base, lengths, args.lang, zipf_frequency)
+
     if args.only in (None, "6"):
         words6 = collect_for_length(
             length=6,
@@ -96,11 +138,12 @@ def main():
             min_zipf_floor=args.min_zipf_floor,
             step_zipf=args.step_zipf,
             lang=args.lang,
-            n_top=args.top
+            n_top=args.top,
+            scored=scored
         )
         out6 = os.path.join(args.outdir, "words6-common.json")
-        with open(out6, "w") as f:
-            json.dump(words6, f, indent=2)
+        with instrument.stage("write"):
+            write_json(out6, words6, ensure_ascii=True, **output_options(args))
         print(f"✅ 6-letter words: {len(words6)} -> {out6}")
         built_any = True
 
@@ -112,11 +155,12 @@ def main():
             min_zipf_floor=args.min_zipf_floor,
             step_zipf=args.step_zipf,
             lang=args.lang,
-            n_top=args.top
+            n_top=args.top,
+            scored=scored
         )
         out7 = os.path.join(args.outdir, "words7-common.json")
-        with open(out7, "w") as f:
-            json.dump(words7, f, indent=2)
+        with instrument.stage("write"):
+            write_json(out7, words7, ensure_ascii=True, **output_options(args))
         print(f"✅ 7-letter words: {len(words7)} -> {out7}")
         built_any = True
 
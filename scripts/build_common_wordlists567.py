@@ -1,10 +1,15 @@
 # build_common_words.py
 # Generates common-word JSON lists for specified lengths (default: 5,6,7).
 # Minimal version using wordfreq, same behavior as before—just adds 5-letter output.
+# --freq-snapshot FILE reads a freq_snapshot.py export instead, so wordfreq isn't needed.
 
-import argparse, json, re
+import argparse, re
 from pathlib import Path
-from wordfreq import top_n_list
+from typing import Callable, List, Optional
+
+import instrument
+from freq_snapshot import load_freq_source
+from json_output import add_output_args, output_options, write_json
 
 ALNUM_RE = re.compile(r"^[a-z]+$")
 
@@ -12,7 +17,11 @@ def is_clean_word(w: str, L: int) -> bool:
     # keep simple: letters only, exact length, all lowercase
     return len(w) == L and ALNUM_RE.match(w) is not None
 
-def build_words(length: int, target_count: int, lang: str = "en") -> list[str]:
+@instrument.timed("build_words")
+def build_words(length: int, target_count: int, lang: str = "en",
+                top_n_list: Optional[Callable[[str, int], List[str]]] = None) -> list[str]:
+    if top_n_list is None:
+        top_n_list, _ = load_freq_source(None)
     # pull a generous slice and filter down; bump N if you need bigger sets
     N = max(100000, target_count * 20)
     words = top_n_list(lang, N)
@@ -39,16 +48,24 @@ def main():
                    help="Output directory (default: current dir)")
     p.add_argument("--prefix", type=str, default="words",
                    help='Filename prefix (default: "words")')
+    p.add_argument("--freq-snapshot", type=str, default=None,
+                   help="Read the ranked word list from a freq_snapshot.py file instead of wordfreq")
+    add_output_args(p)
+    instrument.add_instrument_args(p)
     args = p.parse_args()
+    instrument.start(args, "build_common_wordlists567")
+
+    with instrument.stage("load_freq"):
+        top_n_list, _ = load_freq_source(args.freq_snapshot)
 
     outdir = Path(args.outdir)
     outdir.mkdir(parents=True, exist_ok=True)
 
     for L in args.lengths:
-        lst = build_words(L, args.count)
+        lst = build_words(L, args.count, top_n_list=top_n_list)
         fp = outdir / f"dictionary{L}.json"
-        with fp.open("w", encoding="utf-8") as f:
-            json.dump(lst, f, ensure_ascii=False, indent=2)
+        with instrument.stage("write"):
+            write_json(fp, lst, **output_options(args))
         print(f"Wrote {len(lst)} words -> {fp}")
 
 if __name__ == "__main__":
@@ -1,9 +1,17 @@
 #!/usr/bin/env python3
-import argparse, json, re
+import argparse, heapq, json, re
+from collections import Counter, defaultdict
 from pathlib import Path
 from datetime import date, timedelta
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import instrument
+from json_output import add_output_args, output_options, write_json
+from word_roots import roots
 
 ALPHA57 = re.compile(r"^[A-Z]{5,7}$")
+DEFAULT_WEEK_MIX = {5: 2, 6: 3, 7: 2}
+NEVER = -(10 ** 9)  # last-use ordinal for words not scheduled yet
 
 def load_pool(path: Path):
     words = json.loads(path.read_text(encoding="utf-8"))
@@ -17,89 +25,201 @@ def load_pool(path: Path):
             pool.append(s)
     return pool
 
-def cycle_5_6_7():
-    while True:
-        for n in (5, 6, 7):
-            yield n
-
-def assign_by_year(pool, start_2025: date):
-    end_2025 = date(2025, 12, 31)
-    start_2026 = date(2026, 1, 1)
-    end_2026 = date(2026, 12, 31)
-
-    want_2025 = (end_2025 - start_2025).days + 1
-    want_2026 = (end_2026 - start_2026).days + 1
-
-    # group pool by length, preserving order (treat earlier words as "better")
-    buckets = {5: [], 6: [], 7: []}
-    for w in pool:
-        buckets[len(w)].append(w)
-
-    # iterators over each length bucket
-    idx = {5: 0, 6: 0, 7: 0}
-    def draw(L):
-        if idx[L] >= len(buckets[L]): return None
-        w = buckets[L][idx[L]]
-        idx[L] += 1
-        return w
-
-    def make_year(start_day: date, slots: int):
-        out = {}
-        need = slots
-        length_cycle = cycle_5_6_7()
-        d = start_day
-        while need > 0:
-            target_len = next(length_cycle)
-            w = draw(target_len)
-            # if that bucket is empty, pull from any available bucket in order of closeness
-            if not w:
-                for alt in (5, 6, 7):
-                    if idx[alt] < len(buckets[alt]):
-                        w = draw(alt)
-                        break
-            if not w:
-                break  # totally out of words
-            out[str(d)] = {"word": w, "len": len(w)}
-            d += timedelta(days=1)
-            need -= 1
-        return out
-
-    y2025 = make_year(start_2025, want_2025)
-    y2026 = make_year(date(2026,1,1), want_2026)
-
-    return y2025, y2026
+def parse_week_mix(spec: str) -> Dict[int, int]:
+    """'5:2,6:3,7:2' -> {5: 2, 6: 3, 7: 2} (puzzles per week for each length)."""
+    mix = {}
+    for part in spec.split(","):
+        n, k = part.split(":")
+        mix[int(n)] = int(k)
+    if sum(mix.values()) != 7 or not set(mix) <= {5, 6, 7}:
+        raise ValueError(f"week mix must cover 7 days with lengths 5-7: {spec!r}")
+    return mix
+
+class LengthQueue:
+    """
+    Words of one length in a heap keyed by (last use, pool rank). The top is
+    always the least recently used word, so if it is still inside the repeat
+    window every word of this length is. next_used holds kept uses after the
+    scheduled range; a word is also held back while one of those is within
+    the window ahead.
+    """
+    def __init__(self, words: List[str], last_used: Optional[Dict[str, int]] = None,
+                 next_used: Optional[Dict[str, int]] = None):
+        last_used = last_used or {}
+        self.next_used = next_used or {}
+        self.heap = [(last_used.get(w, NEVER), rank, w) for rank, w in enumerate(words)]
+        heapq.heapify(self.heap)
+
+    def take(self, day: int, min_gap: int, avoid: FrozenSet[str]) -> Optional[str]:
+        held = []
+        word = None
+        while self.heap and day - self.heap[0][0] >= min_gap:
+            entry = heapq.heappop(self.heap)
+            if roots(entry[2]) & avoid or self.next_used.get(entry[2], day + min_gap) - day < min_gap:
+                held.append(entry)
+                continue
+            word = entry[2]
+            heapq.heappush(self.heap, (day, entry[1], word))
+            break
+        for entry in held:
+            heapq.heappush(self.heap, entry)
+        return word
+
+def _monday(d: date) -> date:
+    return d - timedelta(days=d.weekday())
+
+def schedule_range(pool: List[str], start: date, end: date, min_gap: int = 365,
+                   week_mix: Optional[Dict[int, int]] = None,
+                   history: Optional[Dict[str, dict]] = None) -> Dict[str, dict]:
+    """
+    {date: {"word", "len"}} for start..end inclusive. Each day takes the length
+    with the most weekly quota left (Monday-based weeks), falling back to the
+    other lengths, and the least recently used word of that length whose root
+    differs from yesterday's and that is outside the repeat window.
+    history is the already published {date: {"word", ...}} outside start..end:
+    its dates bound the repeat window on both sides, the days either side of
+    the range seed the root rule and its days in the first and last weeks
+    count against those weeks' quotas.
+    Stops early (with a warning) if no word satisfies the constraints.
+    """
+    week_mix = week_mix or dict(DEFAULT_WEEK_MIX)
+    history = {ds: rec for ds, rec in (history or {}).items() if not str(start) <= ds <= str(end)}
+    last_used: Dict[str, int] = {}
+    next_used: Dict[str, int] = {}
+    kept_weeks: Dict[date, Counter] = defaultdict(Counter)
+    for ds in sorted(history):
+        d, w = date.fromisoformat(ds), history[ds]["word"]
+        if ds < str(start):
+            last_used[w] = d.toordinal()
+        else:
+            next_used.setdefault(w, d.toordinal())
+        kept_weeks[_monday(d)][len(w)] += 1
+    queues = {n: LengthQueue([w for w in pool if len(w) == n], last_used, next_used) for n in (5, 6, 7)}
+    out = {}
+    quota = {}
+    prev = history.get(str(start - timedelta(days=1)))
+    after = history.get(str(end + timedelta(days=1)))
+    yesterday: FrozenSet[str] = roots(prev["word"]) if prev else frozenset()
+    d = start
+    while d <= end:
+        if d == start or d.weekday() == 0:
+            quota = dict(week_mix)
+            for n, k in kept_weeks.get(_monday(d), {}).items():
+                quota[n] = quota.get(n, 0) - k
+        day = d.toordinal()
+        avoid = yesterday | roots(after["word"]) if d == end and after else yesterday
+        word = None
+        for n in sorted(queues, key=lambda n: (-quota.get(n, 0), n)):
+            word = queues[n].take(day, min_gap, avoid)
+            if word:
+                quota[n] = quota.get(n, 0) - 1
+                break
+        if not word:
+            print(f"[WARN] no word satisfies the constraints on {d}; stopping there")
+            break
+        out[str(d)] = {"word": word, "len": len(word)}
+        yesterday = roots(word)
+        d += timedelta(days=1)
+    return out
+
+def check_schedule(puzzles: Dict[str, dict], min_gap: int, week_mix: Dict[int, int],
+                   since: Optional[date] = None, until: Optional[date] = None) -> Dict[str, int]:
+    """
+    Count constraint violations in a {date: {"word", "len"}} schedule. With
+    since/until, days outside that range are only context: a violation is
+    counted when one of the days (or the week) involved falls inside it.
+    """
+    def inside(d: date) -> bool:
+        return (since is None or d >= since) and (until is None or d <= until)
+
+    last_seen: Dict[str, date] = {}
+    weeks: Dict[Tuple[int, int], Counter] = defaultdict(Counter)
+    counted_weeks = set()
+    counts = {"repeat_window": 0, "shared_root": 0, "week_mix": 0}
+    prev, prev_day = frozenset(), None
+    for ds in sorted(puzzles):
+        d, w = date.fromisoformat(ds), puzzles[ds]["word"]
+        last = last_seen.get(w)
+        if last and (d - last).days < min_gap and (inside(d) or inside(last)):
+            counts["repeat_window"] += 1
+        if prev_day == d - timedelta(days=1) and roots(w) & prev and (inside(d) or inside(prev_day)):
+            counts["shared_root"] += 1
+        last_seen[w], prev, prev_day = d, roots(w), d
+        week = d.isocalendar()[:2]
+        weeks[week][len(w)] += 1
+        if inside(d):
+            counted_weeks.add(week)
+    for week in counted_weeks:
+        mix = weeks[week]
+        if sum(mix.values()) == 7 and dict(mix) != {n: k for n, k in week_mix.items() if k}:
+            counts["week_mix"] += 1
+    return counts
+
+def load_history(outdir: Path, start: date, end: date) -> Dict[str, dict]:
+    """Every day outside start..end already in outdir/puzzles-{YEAR}.json."""
+    history: Dict[str, dict] = {}
+    for path in sorted(outdir.glob("puzzles-[0-9][0-9][0-9][0-9].json")):
+        for ds, rec in json.loads(path.read_text(encoding="utf-8")).items():
+            if not str(start) <= ds <= str(end) and isinstance(rec, dict) and rec.get("word"):
+                history[ds] = rec
+    return history
+
+def split_by_year(puzzles: Dict[str, dict]) -> Dict[int, Dict[str, dict]]:
+    years: Dict[int, Dict[str, dict]] = defaultdict(dict)
+    for ds, rec in puzzles.items():
+        years[int(ds[:4])][ds] = rec
+    return years
 
 def main():
-    ap = argparse.ArgumentParser()
+    ap = argparse.ArgumentParser(description="Schedule daily puzzles over a date range with repeat, length-mix and root constraints.")
     ap.add_argument("--pool", default="lib/data/biblical_words_final.json")
-    ap.add_argument("--start-2025")  # YYYY-MM-DD; default = today if in 2025, else 2025-09-01
+    ap.add_argument("--start", "--start-2025", dest="start", help="YYYY-MM-DD (default today); days already in puzzles-{YEAR}.json outside --start..--end are kept")
+    ap.add_argument("--end", help="YYYY-MM-DD inclusive (default Dec 31 of the year after --start)")
+    ap.add_argument("--min-gap", type=int, default=365, help="days before a word may repeat (default 365)")
+    ap.add_argument("--week-mix", default="5:2,6:3,7:2", help="puzzles per week by length (default 5:2,6:3,7:2)")
+    ap.add_argument("--difficulty", help="puzzle-difficulty.json from puzzle_difficulty.py (with --all-words)")
+    ap.add_argument("--max-solver-guesses", type=int, help="drop pool words the solver needs more guesses for")
     ap.add_argument("--outdir", default="lib/data")
+    add_output_args(ap)
+    instrument.add_instrument_args(ap)
     args = ap.parse_args()
-
-    pool = load_pool(Path(args.pool))
-
-    if args.start_2025:
-        y, m, d = map(int, args.start_2025.split("-"))
-        start_2025 = date(y, m, d)
-    else:
-        today = date.today()
-        start_2025 = today if today.year == 2025 else date(2025, 9, 1)
-
-    puzzles_2025, puzzles_2026 = assign_by_year(pool, start_2025)
+    instrument.start(args, "build_daily_puzzles")
+
+    with instrument.stage("load_pool"):
+        pool = load_pool(Path(args.pool))
+    if args.difficulty and args.max_solver_guesses:
+        from puzzle_difficulty import load_word_difficulty
+        scores = load_word_difficulty(Path(args.difficulty))
+        before = len(pool)
+        pool = [w for w in pool if scores.get(w, 0) <= args.max_solver_guesses]
+        print(f"Difficulty filter: kept {len(pool)} of {before} words (solver guesses <= {args.max_solver_guesses})")
+    week_mix = parse_week_mix(args.week_mix)
+    start = date.fromisoformat(args.start) if args.start else date.today()
+    end = date.fromisoformat(args.end) if args.end else date(start.year + 1, 12, 31)
 
     outdir = Path(args.outdir); outdir.mkdir(parents=True, exist_ok=True)
-    p2025 = outdir / "puzzles-2025.json"
-    p2026 = outdir / "puzzles-2026.json"
-
-    p2025.write_text(json.dumps(puzzles_2025, ensure_ascii=False, indent=2), encoding="utf-8")
-    p2026.write_text(json.dumps(puzzles_2026, ensure_ascii=False, indent=2), encoding="utf-8")
-
-    c25 = len(puzzles_2025); c26 = len(puzzles_2026)
-    total_used = c25 + c26
-    print(f"2025 days: {c25} → {p2025}")
-    print(f"2026 days: {c26} → {p2026}")
-    print(f"Total words used: {total_used}")
-    print(f"Remaining in pool: {max(0, len(pool) - total_used)}")
+    with instrument.stage("load_history"):
+        history = load_history(outdir, start, end)
+    with instrument.stage("schedule"):
+        puzzles = schedule_range(pool, start, end, args.min_gap, week_mix, history)
+    instrument.count("days_scheduled", len(puzzles))
+
+    with instrument.stage("write"):
+        for year, days in sorted(split_by_year(puzzles).items()):
+            path = outdir / f"puzzles-{year}.json"
+            kept = {}
+            if path.exists():
+                kept = {ds: rec for ds, rec in json.loads(path.read_text(encoding="utf-8")).items()
+                        if not str(start) <= ds <= str(end)}
+            write_json(path, dict(sorted({**kept, **days}.items())), **output_options(args))
+            print(f"{year} days: {len(days)} → {path}" +
+                  (f" ({len(kept)} days outside {start}..{end} kept)" if kept else ""))
+
+    used = len({rec["word"] for rec in puzzles.values()})
+    with instrument.stage("check"):
+        violations = check_schedule({**history, **puzzles}, args.min_gap, week_mix, since=start, until=end)
+    print(f"Distinct words used: {used} of {len(pool)}")
+    print("Constraint violations: " + ", ".join(f"{k}={v}" for k, v in violations.items()))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Compile dictionary word lists into a minimal acyclic word automaton (DAWG)
+for hint / autocomplete lookups: membership, prefix enumeration and
+wildcard patterns, all walking the automaton instead of a word list.
+
+Construction is the incremental algorithm for sorted input (Daciuk et al.):
+each word only touches the path that differs from the previous word, and
+finished suffixes are merged into a register of equivalent states right
+away. Memory is the minimized automaton plus one word's path, so sorted
+lists far larger than the ~2500-word dictionaries stream through.
+
+Output file (little-endian): header (magic "DAWG", version, index width,
+node count, edge count, word count, root), then per node one uint8 holding
+the edge count with the final flag in the top bit; then per edge a uint8
+label and the target node index, uint16 when there are fewer than 65,536
+nodes (width 2) and uint32 otherwise (width 4). Edges are stored node by
+node, so a node's first-edge index is the running sum of the counts before
+it and is rebuilt at load instead of stored. Edges of a node are sorted by
+label, so enumeration is alphabetical.
+
+Usage:
+  python3 scripts/build_dawg.py                                   (lib/data/dictionary{5,6,7}.json)
+  python3 scripts/build_dawg.py --sorted-text big-wordlist.txt --out /tmp/big.dawg
+  python3 scripts/build_dawg.py --query 7 "PRO*" "?RAISE?" ABANDON
+"""
+
+import argparse, json, os, re, struct, sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import instrument
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "lib" / "data"
+
+MAGIC = b"DAWG"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sHHIIII")  # magic, version, index width, nodes, edges, words, root
+FINAL = 0x80  # top bit of a node's edge-count byte
+WORD_RE = re.compile(r"^[A-Z]+$")
+WILDCARDS = "?."
+
+# ---------- compiler ----------
+
+class _State:
+    __slots__ = ("edges", "final")
+
+    def __init__(self):
+        self.edges: Dict[str, "_State"] = {}
+        self.final = False
+
+    def signature(self):
+        return self.final, tuple((c, id(t)) for c, t in sorted(self.edges.items()))
+
+class DawgBuilder:
+    """Feed words in strictly increasing order with add(); finish() returns the minimized root."""
+
+    def __init__(self):
+        self.root = _State()
+        self.register: Dict[tuple, _State] = {}
+        self.unchecked: List[Tuple[_State, str, _State]] = []
+        self.previous = ""
+        self.words = 0
+        self.trie_nodes = 1  # what an unminimized trie would need, for the report
+
+    def add(self, word: str):
+        if word <= self.previous:
+            raise ValueError(f"words must be unique and sorted: {word!r} after {self.previous!r}")
+        common = 0
+        for a, b in zip(word, self.previous):
+            if a != b:
+                break
+            common += 1
+        self._minimize(common)
+        node = self.unchecked[-1][2] if self.unchecked else self.root
+        for c in word[common:]:
+            nxt = _State()
+            node.edges[c] = nxt
+            self.unchecked.append((node, c, nxt))
+            node = nxt
+        node.final = True
+        self.trie_nodes += len(word) - common
+        self.previous = word
+        self.words += 1
+
+    def _minimize(self, down_to: int):
+        while len(self.unchecked) > down_to:
+            parent, c, child = self.unchecked.pop()
+            sig = child.signature()
+            same = self.register.get(sig)
+            if same is not None:
+                parent.edges[c] = same
+            else:
+                self.register[sig] = child
+
+    def finish(self) -> _State:
+        self._minimize(0)
+        return self.root
+
+def serialize(root: _State, words: int) -> bytes:
+    """Number states depth-first from the root and flatten them into the node/edge tables."""
+    ids: Dict[int, int] = {}
+    order: List[_State] = []
+    stack = [root]
+    while stack:
+        s = stack.pop()
+        if id(s) in ids:
+            continue
+        ids[id(s)] = len(order)
+        order.append(s)
+        stack.extend(t for _, t in sorted(s.edges.items(), reverse=True))
+
+    width = 2 if len(order) < 1 << 16 else 4
+    flags, labels, targets = array("B"), array("B"), array("H" if width == 2 else "I")
+    for s in order:
+        flags.append(len(s.edges) | (FINAL if s.final else 0))
+        for c, t in sorted(s.edges.items()):
+            labels.append(ord(c))
+            targets.append(ids[id(t)])
+
+    out = bytearray(HEADER.pack(MAGIC, FORMAT_VERSION, width, len(order), len(labels), words, 0))
+    for arr in (flags, labels, targets):
+        if arr.itemsize > 1 and sys.byteorder == "big":
+            arr.byteswap()
+        out += arr.tobytes()
+    return bytes(out)
+
+# ---------- reader ----------
+
+class Dawg:
+    """Array-backed automaton loaded from a compiled file."""
+
+    def __init__(self, path: Path):
+        data = path.read_bytes()
+        magic, version, width, nodes, edges, words, root = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or width not in (2, 4):
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} DAWG file")
+        self.node_count, self.edge_count, self.word_count, self.root = nodes, edges, words, root
+        pos = HEADER.size
+
+        def take(typecode: str, n: int) -> array:
+            nonlocal pos
+            arr = array(typecode)
+            arr.frombytes(data[pos:pos + n * arr.itemsize])
+            if arr.itemsize > 1 and sys.byteorder == "big":
+                arr.byteswap()
+            pos += n * arr.itemsize
+            return arr
+
+        flags = take("B", nodes)
+        self.count = array("B", (f & ~FINAL for f in flags))
+        self.final = array("B", (f >> 7 for f in flags))
+        self.first = array("I", [0] * nodes)
+        total = 0
+        for i, n in enumerate(self.count):
+            self.first[i] = total
+            total += n
+        self.labels = take("B", edges)
+        self.targets = take("H" if width == 2 else "I", edges)
+
+    def _step(self, node: int, c: str) -> int:
+        lo, hi = self.first[node], self.first[node] + self.count[node]
+        want = ord(c)
+        while lo < hi:  # labels are sorted within a node
+            mid = (lo + hi) // 2
+            if self.labels[mid] < want:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.first[node] + self.count[node] and self.labels[lo] == want:
+            return self.targets[lo]
+        return -1
+
+    def _walk(self, prefix: str) -> int:
+        node = self.root
+        for c in prefix:
+            node = self._step(node, c)
+            if node < 0:
+                return -1
+        return node
+
+    def __contains__(self, word: str) -> bool:
+        node = self._walk(word.strip().upper())
+        return node >= 0 and bool(self.final[node])
+
+    def _complete(self, node: int, prefix: str) -> Iterator[str]:
+        stack = [(node, prefix)]
+        while stack:
+            n, p = stack.pop()
+            if self.final[n]:
+                yield p
+            start = self.first[n]
+            for e in range(start + self.count[n] - 1, start - 1, -1):
+                stack.append((self.targets[e], p + chr(self.labels[e])))
+
+    def with_prefix(self, prefix: str) -> Iterator[str]:
+        """All words starting with `prefix`, alphabetically."""
+        prefix = prefix.strip().upper()
+        node = self._walk(prefix)
+        return self._complete(node, prefix) if node >= 0 else iter(())
+
+    def match(self, pattern: str) -> Iterator[str]:
+        """Words matching `pattern` exactly: '?' or '.' is any one letter, a trailing '*' any suffix."""
+        pattern = pattern.strip().upper()
+        open_end = pattern.endswith("*")
+        fixed = pattern.rstrip("*")
+        stack = [(self.root, 0, "")]
+        while stack:
+            n, i, p = stack.pop()
+            if i == len(fixed):
+                if open_end:
+                    yield from self._complete(n, p)
+                elif self.final[n]:
+                    yield p
+                continue
+            c = fixed[i]
+            if c in WILDCARDS:
+                start = self.first[n]
+                for e in range(start + self.count[n] - 1, start - 1, -1):
+                    stack.append((self.targets[e], i + 1, p + chr(self.labels[e])))
+            else:
+                t = self._step(n, c)
+                if t >= 0:
+                    stack.append((t, i + 1, p + c))
+
+# ---------- CLI ----------
+
+def normalized_sorted(words: Iterable, length: int) -> List[str]:
+    """Uppercased, de-duplicated, sorted `length`-letter A-Z words, as pack_dictionaries.normalize."""
+    return sorted({s for s in (str(w).strip().upper() for w in words) if len(s) == length and WORD_RE.match(s)})
+
+def stream_sorted_text(path: Path) -> Iterator[str]:
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            s = line.strip().upper()
+            if s and WORD_RE.match(s):
+                yield s
+
+def compile_words(words: Iterable[str], out: Path) -> dict:
+    builder = DawgBuilder()
+    with instrument.stage("insert"):
+        for w in words:
+            builder.add(w)
+        root = builder.finish()
+    with instrument.stage("serialize"):
+        blob = serialize(root, builder.words)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(f".{out.name}.tmp")  # renamed into place so readers never see a partial file
+    tmp.write_bytes(blob)
+    os.replace(tmp, out)
+    instrument.count("words", builder.words)
+    nodes, edges = HEADER.unpack_from(blob, 0)[3:5]
+    return {"words": builder.words, "trie_nodes": builder.trie_nodes, "nodes": nodes, "edges": edges, "bytes": len(blob)}
+
+def report(name: str, stats: dict, raw_bytes: int):
+    print(f"{name}: {stats['words']} words | trie {stats['trie_nodes']:,} nodes -> DAWG {stats['nodes']:,} nodes "
+          f"({stats['nodes'] / max(stats['trie_nodes'], 1):.1%}), {stats['edges']:,} edges | "
+          f"{raw_bytes:,} B raw -> {stats['bytes']:,} B ({stats['bytes'] / max(raw_bytes, 1):.1%})")
+
+def main():
+    ap = argparse.ArgumentParser(description="Compile dictionaries into minimal DAWG files.")
+    ap.add_argument("--lengths", nargs="+", type=int, default=[5, 6, 7], help="dictionary lengths to compile (default 5 6 7)")
+    ap.add_argument("--data-dir", default=str(DATA_DIR), help="where dictionary{N}.json live (default lib/data)")
+    ap.add_argument("--outdir", default=None, help="output directory for dictionary{N}.dawg (default: --data-dir)")
+    ap.add_argument("--sorted-text", help="stream a pre-sorted, one-word-per-line list instead of the JSON dictionaries")
+    ap.add_argument("--out", help="output file for --sorted-text")
+    ap.add_argument("--query", nargs="+", metavar=("LENGTH", "PATTERN"),
+                    help="query dictionary{LENGTH}.dawg: a word, a prefix ending in '*', or a '?' pattern")
+    instrument.add_instrument_args(ap)
+    args = ap.parse_args()
+    instrument.start(args, "build_dawg")
+
+    data_dir = Path(args.data_dir)
+    outdir = Path(args.outdir or args.data_dir)
+
+    if args.query:
+        dawg = Dawg(outdir / f"dictionary{args.query[0]}.dawg")
+        for q in args.query[1:]:
+            if any(c in q for c in WILDCARDS + "*"):
+                hits = list(dawg.match(q))
+                print(f"{q}: {len(hits)} -> {' '.join(hits[:40])}{' ...' if len(hits) > 40 else ''}")
+            else:
+                print(f"{q}: {'yes' if q in dawg else 'no'}")
+        return
+
+    if args.sorted_text:
+        src = Path(args.sorted_text)
+        out = Path(args.out or src.with_suffix(".dawg"))
+        report(out.name, compile_words(stream_sorted_text(src), out), src.stat().st_size)
+        return
+
+    for n in args.lengths:
+        src = data_dir / f"dictionary{n}.json"
+        with instrument.stage("load"):
+            words = normalized_sorted(json.loads(src.read_text(encoding="utf-8")), n)
+        out = outdir / f"dictionary{n}.dawg"
+        report(out.name, compile_words(words, out), src.stat().st_size)
+        with instrument.stage("verify"):
+            back = list(Dawg(out).with_prefix(""))
+        if back != words or any(len(w) != n for w in back):
+            sys.exit(f"{out}: enumerates {len(back)} words, expected the {len(words)} {n}-letter input words")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Run the data pipeline as one DAG of script stages with explicit inputs and
+outputs, skipping stages whose inputs haven't changed since their last
+successful run and running independent stages side by side.
+
+Stages (each is one of the existing scripts, run as a subprocess):
+  merge              merge_wordlists.py           --base + --extra -> biblical_words_final.json
+  schedule           build_daily_puzzles.py       --pool -> puzzles-{YEAR}.json from --start on
+                                                  (--scheduler daily; both flags are required)
+  clues-{N}          build_puzzles_from_clues.py  clues-*.json -> puzzles{N}-{YEAR}.json, per length
+                                                  (--scheduler clues)
+  join-clues         join_clues.py                clues-*.json -> clue text embedded in the puzzle files (in place)
+  definitions-{YEAR} build_word_definitions_full.py  puzzles-{YEAR}.json -> word-definitions-{YEAR}.json
+                     (puzzles{N}-{YEAR}.json with --scheduler clues)
+  easton-{YEAR}      apply_easton_definitions.py  API definitions + --easton -> word-definitions-{YEAR}.json
+                     (with --easton, the API stage writes to .cache/pipeline/ instead)
+  shard-definitions  shard_definitions.py         every word-definitions-{YEAR}.json -> definitions/manifest.json
+                     (only with --shards word|month)
+  compact-definitions compact_definitions.py      every word-definitions-{YEAR}.json -> word-definitions.compact.json
+                     (only with --compact; --compact-top-k trims definitions per word)
+
+A stage depends on whichever earlier-declared stage last produced each of
+its inputs, so a stage that rewrites a file in place sits between that
+file's producer and its readers. Its script, and the scripts/ modules that
+script imports (directly or through each other), count as inputs too. After a stage succeeds, the pipeline records the SHA-256 of
+every input and output and the command line in .cache/pipeline/state.json.
+On later runs the stage is skipped when all of those still match. Stages
+whose inputs are missing are reported, and so are stages downstream of a
+failure. Per-stage output goes to .cache/pipeline/logs/<stage>.log.
+
+The definitions-{YEAR} stages share dictionaryapi.dev and each runs its own
+rate limiter, so they run one at a time whatever --jobs says (unless
+--defs-args selects --source local).
+
+No scheduler runs by default (--scheduler none): the published
+puzzles-{YEAR}.json files and their clues are curated, so only what derives
+from them is rebuilt unless a scheduler is asked for.
+
+Usage:
+  python3 scripts/build_pipeline.py --dry-run
+  python3 scripts/build_pipeline.py --years 2026 2027 --jobs 4
+  python3 scripts/build_pipeline.py --scheduler daily --pool data/pool.json --start 2027-01-01 --years 2027
+  python3 scripts/build_pipeline.py --base data/STRICT_top1000.json --extra data/STRICT.json --easton data/easton.jsonl
+  python3 scripts/build_pipeline.py --scheduler clues --only clues-7
+"""
+
+import argparse, ast, hashlib, json, os, shlex, subprocess, sys, time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import instrument
+from json_output import write_json
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS = REPO_ROOT / "scripts"
+DATA_DIR = REPO_ROOT / "lib" / "data"
+STATE_DIR = REPO_ROOT / ".cache" / "pipeline"
+
+def local_imports(script: Path) -> List[Path]:
+    """scripts/ modules that script imports, directly or through each other."""
+    found: Dict[Path, None] = {}
+    stack = [script]
+    while stack:
+        tree = ast.parse(stack.pop().read_text(encoding="utf-8"))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [a.name for a in node.names]
+            elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                path = SCRIPTS / f"{name.split('.')[0]}.py"
+                if path.exists() and path != script and path not in found:
+                    found[path] = None
+                    stack.append(path)
+    return sorted(found)
+
+class Stage:
+    def __init__(self, name: str, script: str, args: List[str], inputs: List[Path], outputs: List[Path],
+                 lock: Optional[str] = None):
+        self.name = name
+        self.script = SCRIPTS / script
+        self.cmd = [sys.executable, str(self.script), *args]
+        self.inputs = [self.script, *local_imports(self.script), *inputs]
+        self.outputs = outputs
+        self.lock = lock  # stages sharing a lock never run at the same time
+        self.deps: List[str] = []
+
+def file_hash(path: Path) -> Optional[str]:
+    if not path.exists():
+        return None
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def rel(path: Path) -> str:
+    try:
+        return str(path.resolve().relative_to(REPO_ROOT))
+    except ValueError:
+        return str(path)
+
+def declare_stages(args) -> List[Stage]:
+    data = Path(args.data_dir)
+    pool = Path(args.pool or data / "biblical_words_final.json")
+    stages: List[Stage] = []
+
+    if args.base and args.extra:
+        stages.append(Stage("merge", "merge_wordlists.py",
+                            ["--base", args.base, "--extra", args.extra, "--out", str(pool)],
+                            [Path(args.base), Path(args.extra)], [pool]))
+
+    years = sorted(set(args.years))
+    if args.scheduler == "daily":
+        stages.append(Stage("schedule", "build_daily_puzzles.py",
+                            ["--pool", str(pool), "--start", args.start, "--end", f"{years[-1]}-12-31",
+                             "--outdir", str(data)],
+                            [pool], [data / f"puzzles-{y}.json" for y in range(int(args.start[:4]), years[-1] + 1)]))
+    elif args.scheduler == "clues":
+        clue_files = sorted(data.glob("clues-*.json"))
+        for n in (5, 6, 7):
+            stages.append(Stage(f"clues-{n}", "build_puzzles_from_clues.py",
+                                ["--only-lengths", str(n), "--years", *map(str, years), "--seed", str(args.seed)],
+                                clue_files, [data / f"puzzles{n}-{y}.json" for y in years]))
+
+    clue_files = sorted(data.glob("clues-*.json"))
+    if clue_files:
+        puzzle_files = sorted({o for s in stages for o in s.outputs if o.name.startswith("puzzles")} |
+                              {data / f"puzzles-{y}.json" for y in years})
+        stages.append(Stage("join-clues", "join_clues.py", ["--data-dir", str(data)],
+                            [*clue_files, *puzzle_files], puzzle_files))
+
+    defs_extra = shlex.split(args.defs_args or "")
+    local_source = "--source=local" in defs_extra or any(
+        a == "--source" and b == "local" for a, b in zip(defs_extra, defs_extra[1:]))
+    for y in years:
+        if args.scheduler == "clues":
+            puzzles = [data / f"puzzles{n}-{y}.json" for n in (5, 6, 7)]
+        else:
+            puzzles = [data / f"puzzles-{y}.json"]
+        final = data / f"word-definitions-{y}.json"
+        api_out = STATE_DIR / f"word-definitions-{y}.api.json" if args.easton else final
+        stages.append(Stage(f"definitions-{y}", "build_word_definitions_full.py",
+                            ["--puzzles", *map(str, puzzles), "--out", str(api_out), *defs_extra],
+                            puzzles, [api_out], lock=None if local_source else "dictionaryapi"))
+        if args.easton:
+            stages.append(Stage(f"easton-{y}", "apply_easton_definitions.py",
+                                ["--defs", str(api_out), "--easton", args.easton, "--out", str(final)],
+                                [api_out, Path(args.easton)], [final]))
+
+    finals = sorted({p.resolve() for p in data.glob("word-definitions-*.json") if p.stem[-4:].isdigit()} |
+                    {(data / f"word-definitions-{y}.json").resolve() for y in years})
+    if args.shards:
+        inputs = list(finals)
+        if args.shards == "month":
+            inputs += sorted(data.glob("puzzles-*.json"))
+        stages.append(Stage("shard-definitions", "shard_definitions.py",
+                            ["--data-dir", str(data), "--by", args.shards],
+                            inputs, [data / "definitions" / "manifest.json"]))
+    if args.compact:
+        stages.append(Stage("compact-definitions", "compact_definitions.py",
+                            ["--data-dir", str(data), "--top-k", str(args.compact_top_k)],
+                            finals, [data / "word-definitions.compact.json"]))
+    return stages
+
+def link(stages: List[Stage]) -> Dict[str, Stage]:
+    by_name = {s.name: s for s in stages}
+    producer: Dict[Path, str] = {}
+    for s in stages:
+        s.deps = sorted({producer[i.resolve()] for i in s.inputs if i.resolve() in producer})
+        for o in s.outputs:
+            producer[o.resolve()] = s.name
+    return by_name
+
+def select(by_name: Dict[str, Stage], only: Optional[List[str]]) -> List[str]:
+    """Requested stages plus everything upstream of them, in declaration order."""
+    if not only:
+        return list(by_name)
+    unknown = [n for n in only if n not in by_name]
+    if unknown:
+        sys.exit(f"unknown stage(s): {', '.join(unknown)} (have: {', '.join(by_name)})")
+    wanted, stack = set(), list(only)
+    while stack:
+        n = stack.pop()
+        if n not in wanted:
+            wanted.add(n)
+            stack.extend(by_name[n].deps)
+    return [n for n in by_name if n in wanted]
+
+@instrument.timed("fingerprint")
+def fingerprint(stage: Stage) -> dict:
+    return {
+        "cmd": stage.cmd[1:],
+        "inputs": {rel(p): file_hash(p) for p in stage.inputs},
+        "outputs": {rel(p): file_hash(p) for p in stage.outputs},
+    }
+
+def run_stage(stage: Stage, log_dir: Path) -> int:
+    log_dir.mkdir(parents=True, exist_ok=True)
+    with (log_dir / f"{stage.name}.log").open("w", encoding="utf-8") as log:
+        log.write(" ".join(shlex.quote(c) for c in stage.cmd) + "\n\n")
+        log.flush()
+        return subprocess.run(stage.cmd, cwd=REPO_ROOT, stdout=log, stderr=subprocess.STDOUT).returncode
+
+def run_pipeline(by_name: Dict[str, Stage], names: List[str], jobs: int, force: bool, dry_run: bool) -> Dict[str, dict]:
+    state_path = STATE_DIR / "state.json"
+    state = json.loads(state_path.read_text(encoding="utf-8")) if state_path.exists() else {}
+    results: Dict[str, dict] = {}
+    pending = list(names)
+    running = {}
+
+    def ready(name: str) -> bool:
+        return all(d in results or d not in names for d in by_name[name].deps)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while pending or running:
+            for name in [n for n in pending if ready(n)]:
+                stage = by_name[name]
+                if stage.lock and stage.lock in {by_name[n].lock for n, _ in running.values()}:
+                    continue
+                pending.remove(name)
+                if any(results.get(d, {}).get("status") in ("failed", "blocked", "missing-input") for d in stage.deps):
+                    results[name] = {"status": "blocked", "seconds": 0.0}
+                    continue
+                missing = [rel(p) for p in stage.inputs if not p.exists()]
+                if missing and not dry_run:
+                    results[name] = {"status": "missing-input", "seconds": 0.0, "missing": missing}
+                    continue
+                if not force and state.get(name) == fingerprint(stage):
+                    results[name] = {"status": "up-to-date", "seconds": 0.0}
+                    continue
+                if dry_run:
+                    results[name] = {"status": "would-run", "seconds": 0.0, "missing": missing}
+                    continue
+                print(f"[run] {name}", flush=True)
+                running[pool.submit(run_stage, stage, STATE_DIR / "logs")] = (name, time.perf_counter())
+            if not running:
+                if pending and not any(ready(n) for n in pending):
+                    raise RuntimeError(f"dependency cycle among: {', '.join(pending)}")
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name, t0 = running.pop(fut)
+                code = fut.result()
+                seconds = time.perf_counter() - t0
+                if code == 0:
+                    state[name] = fingerprint(by_name[name])
+                    # a stage that rewrites files in place changes an earlier stage's outputs too
+                    for other, rec in state.items():
+                        for key in rec.get("outputs", {}).keys() & state[name]["outputs"].keys():
+                            rec["outputs"][key] = state[name]["outputs"][key]
+                    write_json(state_path, state, compress=False, quiet=True)
+                    results[name] = {"status": "ran", "seconds": seconds}
+                else:
+                    results[name] = {"status": "failed", "seconds": seconds, "exit": code}
+                print(f"[{results[name]['status']}] {name} ({seconds:.2f}s)", flush=True)
+    return results
+
+def print_summary(by_name: Dict[str, Stage], names: List[str], results: Dict[str, dict], wall: float):
+    width = max(len(n) for n in names)
+    print(f"\n{'Stage'.ljust(width)}  {'status':<13} {'seconds':>8}  depends on")
+    for n in names:
+        r = results[n]
+        print(f"{n.ljust(width)}  {r['status']:<13} {r['seconds']:8.2f}  {', '.join(by_name[n].deps) or '-'}")
+        if r.get("missing"):
+            print(f"{'':{width}}    missing: {', '.join(r['missing'])}")
+        if r["status"] == "failed":
+            print(f"{'':{width}}    exit {r['exit']}, see {rel(STATE_DIR / 'logs' / (n + '.log'))}")
+    busy = sum(r["seconds"] for r in results.values())
+    print(f"Total: {wall:.2f}s wall, {busy:.2f}s in stages")
+
+def main():
+    this_year = date.today().year
+    ap = argparse.ArgumentParser(description="Incremental, parallel runner for the lib/data build scripts.")
+    ap.add_argument("--data-dir", default=str(DATA_DIR), help="data directory (default lib/data)")
+    ap.add_argument("--years", nargs="+", type=int, default=[this_year, this_year + 1],
+                    help="puzzle / definition years (default this year and next)")
+    ap.add_argument("--scheduler", choices=["daily", "clues", "none"], default="none",
+                    help="which puzzle builder runs (default none: use the existing puzzles-{YEAR}.json)")
+    ap.add_argument("--start", help="first day the daily scheduler (re)writes, YYYY-MM-DD; required with "
+                                    "--scheduler daily, earlier days in puzzles-{YEAR}.json are kept")
+    ap.add_argument("--base", help="merge stage: base word list (stage is skipped without --base and --extra)")
+    ap.add_argument("--extra", help="merge stage: extra word list")
+    ap.add_argument("--pool", help="word pool for the daily scheduler (required with it; also the merge stage's output, "
+                                   "default <data-dir>/biblical_words_final.json)")
+    ap.add_argument("--seed", type=int, default=42, help="seed for the clue scheduler (kept fixed so reruns are stable)")
+    ap.add_argument("--easton", help="Easton JSONL; adds the easton-{YEAR} stages")
+    ap.add_argument("--shards", choices=["word", "month"], help="add the shard-definitions stage with this layout")
+    ap.add_argument("--compact", action="store_true", help="add the compact-definitions stage")
+    ap.add_argument("--compact-top-k", type=int, default=0, help="definitions kept per word by that stage (0 = all)")
+    ap.add_argument("--defs-args", help='extra arguments for build_word_definitions_full.py, e.g. "--concurrency 4"')
+    ap.add_argument("--only", nargs="+", metavar="STAGE", help="run these stages and what they depend on")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="stages to run at once")
+    ap.add_argument("--force", action="store_true", help="run stages even if their hashes match")
+    ap.add_argument("--dry-run", action="store_true", help="show what would run without running it")
+    instrument.add_instrument_args(ap)
+    args = ap.parse_args()
+    if args.scheduler == "daily":
+        if not args.pool or not args.start:
+            ap.error("--scheduler daily needs --pool and --start (it rewrites puzzles-{YEAR}.json from --start on)")
+        try:
+            start = date.fromisoformat(args.start)
+        except ValueError:
+            ap.error(f"--start must be YYYY-MM-DD, got {args.start!r}")
+        if start.year > max(args.years):
+            ap.error(f"--start {args.start} is after the last of --years")
+
+    instrument.start(args, "build_pipeline")
+
+    with instrument.stage("declare"):
+        by_name = link(declare_stages(args))
+        names = select(by_name, args.only)
+    t0 = time.perf_counter()
+    with instrument.stage("run"):
+        results = run_pipeline(by_name, names, args.jobs, args.force, args.dry_run)
+    for r in results.values():
+        instrument.count(f"stages_{r['status'].replace('-', '_')}")
+    print_summary(by_name, names, results, time.perf_counter() - t0)
+    sys.exit(1 if any(r["status"] in ("failed", "blocked", "missing-input") for r in results.values()) else 0)
+
+if __name__ == "__main__":
+    main()
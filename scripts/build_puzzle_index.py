@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Build a date-addressable binary index of every lib/data/puzzles-{YEAR}.json,
+so one day's puzzle is a single seek + read instead of parsing a year of JSON.
+
+File layout (little-endian):
+  header   magic "PIDX", version, epoch (date ordinal of day 0), day count,
+           word count, clue table offset, clue table size
+  days     day count x (uint32 word id, uint32 clue offset); NONE = no puzzle / no clue
+  words    word count x 8 bytes, ASCII, NUL-padded (words are 5-7 letters)
+  clues    de-duplicated clues, each uint16 byte length + UTF-8
+
+Usage:
+  python3 scripts/build_puzzle_index.py
+  python3 scripts/build_puzzle_index.py --out /tmp/puzzles.idx --bench
+"""
+
+import argparse, json, random, re, struct, time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+import instrument
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "lib" / "data"
+
+MAGIC = b"PIDX"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIIIII")  # magic, version, reserved, epoch, days, words, clue offset, clue size
+RECORD = struct.Struct("<II")
+CLUE_LEN = struct.Struct("<H")
+MAX_CLUE_BYTES = 0xFFFF
+WORD_WIDTH = 8
+NONE = 0xFFFFFFFF
+PUZZLE_FILE_RE = re.compile(r"^puzzles-(\d{4})\.json$")
+
+def load_puzzles(data_dir: Path) -> Dict[date, dict]:
+    """Every dated puzzle across the year files, keyed by date."""
+    puzzles: Dict[date, dict] = {}
+    for p in sorted(data_dir.glob("puzzles-*.json")):
+        if not PUZZLE_FILE_RE.match(p.name):
+            continue
+        for ds, rec in json.loads(p.read_text(encoding="utf-8")).items():
+            rec = rec if isinstance(rec, dict) else {"word": rec}
+            word = str(rec.get("word") or "").strip().upper()
+            if word:
+                puzzles[date.fromisoformat(ds)] = {"word": word, "clue": (rec.get("clue") or "").strip()}
+    return puzzles
+
+def build_index(puzzles: Dict[date, dict]) -> bytes:
+    """The index file's bytes. Raises ValueError on a word or clue the format can't hold."""
+    if not puzzles:
+        raise ValueError("no puzzles to index")
+    first, last = min(puzzles), max(puzzles)
+    word_ids: Dict[str, int] = {}
+    clue_offsets: Dict[str, int] = {}
+    clue_blob = bytearray()
+    days = bytearray()
+    for i in range((last - first).days + 1):
+        day = first + timedelta(days=i)
+        rec = puzzles.get(day)
+        if rec is None:
+            days += RECORD.pack(NONE, NONE)
+            continue
+        if len(rec["word"]) > WORD_WIDTH or not rec["word"].isascii():
+            raise ValueError(f"{day}: word {rec['word']!r} doesn't fit a {WORD_WIDTH}-byte ASCII word slot")
+        word_id = word_ids.setdefault(rec["word"], len(word_ids))
+        clue = rec["clue"]
+        if clue and clue not in clue_offsets:
+            raw = clue.encode("utf-8")
+            if len(raw) > MAX_CLUE_BYTES:
+                raise ValueError(f"{day}: clue is {len(raw):,} bytes; the index holds at most {MAX_CLUE_BYTES:,}")
+            clue_offsets[clue] = len(clue_blob)
+            clue_blob += CLUE_LEN.pack(len(raw)) + raw
+        days += RECORD.pack(word_id, clue_offsets[clue] if clue else NONE)
+
+    words = b"".join(w.encode("ascii").ljust(WORD_WIDTH, b"\0") for w in word_ids)
+    n_days = len(days) // RECORD.size
+    clue_at = HEADER.size + len(days) + len(words)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, first.toordinal(), n_days, len(word_ids), clue_at, len(clue_blob))
+    return header + bytes(days) + words + bytes(clue_blob)
+
+class PuzzleIndex:
+    """Reads one day at a time from an index file with seeks; nothing else is loaded."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._f = path.open("rb")
+        magic, version, _, epoch, days, words, clue_at, _ = HEADER.unpack(self._f.read(HEADER.size))
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} puzzle index")
+        self.epoch = date.fromordinal(epoch)
+        self.days, self.word_count = days, words
+        self._words_at = HEADER.size + days * RECORD.size
+        self._clue_at = clue_at
+
+    def __len__(self) -> int:
+        return self.days
+
+    def _read(self, offset: int, size: int) -> bytes:
+        self._f.seek(offset)
+        return self._f.read(size)
+
+    def get(self, day: date) -> Optional[dict]:
+        i = (day - self.epoch).days
+        if not 0 <= i < self.days:
+            return None
+        word_id, clue_off = RECORD.unpack(self._read(HEADER.size + i * RECORD.size, RECORD.size))
+        if word_id == NONE:
+            return None
+        word = self._read(self._words_at + word_id * WORD_WIDTH, WORD_WIDTH).rstrip(b"\0").decode("ascii")
+        clue = ""
+        if clue_off != NONE:
+            (n,) = CLUE_LEN.unpack(self._read(self._clue_at + clue_off, CLUE_LEN.size))
+            clue = self._f.read(n).decode("utf-8")
+        return {"date": day.isoformat(), "word": word, "clue": clue, "len": len(word)}
+
+    def random(self, rng: random.Random = random) -> Optional[dict]:
+        for _ in range(self.days):
+            rec = self.get(self.epoch + timedelta(days=rng.randrange(self.days)))
+            if rec:
+                return rec
+        return None
+
+    def close(self):
+        self._f.close()
+
+def bench(data_dir: Path, index_path: Path, puzzles: Dict[date, dict], queries: int, seed: int):
+    """Single-day lookups done per request: parse the year's JSON vs open + seek the index."""
+    rng = random.Random(seed)
+    sample = [rng.choice(list(puzzles)) for _ in range(queries)]
+
+    t0 = time.perf_counter()
+    for d in sample:
+        data = json.loads((data_dir / f"puzzles-{d.year}.json").read_text(encoding="utf-8"))
+        via_json = data[d.isoformat()]
+    t_json = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for d in sample:
+        idx = PuzzleIndex(index_path)
+        via_idx = idx.get(d)
+        idx.close()
+    t_cold = time.perf_counter() - t0
+
+    idx = PuzzleIndex(index_path)
+    t0 = time.perf_counter()
+    for d in sample:
+        via_idx = idx.get(d)
+    t_warm = time.perf_counter() - t0
+    assert via_idx["word"] == via_json["word"].upper(), f"mismatch on {sample[-1]}"
+    idx.close()
+
+    per = lambda t: t / len(sample) * 1e6
+    print(f"  {len(sample)} single-day lookups:")
+    print(f"    json parse per lookup   {per(t_json):9.1f} us")
+    print(f"    index open + seek       {per(t_cold):9.1f} us")
+    print(f"    index seek (kept open)  {per(t_warm):9.1f} us")
+
+def main():
+    ap = argparse.ArgumentParser(description="Build a binary date -> puzzle index from puzzles-{YEAR}.json.")
+    ap.add_argument("--data-dir", default=str(DATA_DIR), help="where puzzles-{YEAR}.json live (default lib/data)")
+    ap.add_argument("--out", default=None, help="index file (default: <data-dir>/puzzles.idx)")
+    ap.add_argument("--bench", action="store_true", help="time single-day lookups against the JSON path")
+    ap.add_argument("--queries", type=int, default=2000, help="lookups for --bench")
+    ap.add_argument("--seed", type=int, default=1)
+    instrument.add_instrument_args(ap)
+    args = ap.parse_args()
+    instrument.start(args, "build_puzzle_index")
+
+    data_dir = Path(args.data_dir)
+    out = Path(args.out or data_dir / "puzzles.idx")
+    with instrument.stage("load"):
+        puzzles = load_puzzles(data_dir)
+    with instrument.stage("build"):
+        try:
+            blob = build_index(puzzles)
+        except ValueError as e:
+            raise SystemExit(f"{data_dir}: {e}")
+        out.write_bytes(blob)
+
+    idx = PuzzleIndex(out)
+    with instrument.stage("verify"):
+        for d, rec in puzzles.items():
+            got = idx.get(d)
+            assert got and got["word"] == rec["word"] and got["clue"] == rec["clue"], f"round-trip failed on {d}"
+    print(f"Wrote {len(puzzles)} puzzles ({idx.epoch} + {idx.days} days, {idx.word_count} words, "
+          f"{len(blob):,} bytes) -> {out}")
+    idx.close()
+    if args.bench:
+        with instrument.stage("bench"):
+            bench(data_dir, out, puzzles, args.queries, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -12,23 +12,27 @@ Input files (in lib/data/):
       }
 
 Output files (also in lib/data/):
-  - puzzles-{YEAR}.json
+  - puzzles{LEN}-{YEAR}.json
     Format:
-      {
-        "2025-08-25": { "word": "HAPPY", "len": 5 },
-        "2025-08-26": { "word": "DREAM", "len": 5 }
-      }
+      [
+        {"date": "2025-08-25", "word": "HAPPY"},
+        {"date": "2025-08-26", "word": "DREAM"}
+      ]
 
 Usage:
   python scripts/build_puzzles_from_clues.py
   python scripts/build_puzzles_from_clues.py --years 2025 2026 2027 2029 2030 --seed 42
   python scripts/build_puzzles_from_clues.py --only-lengths 6 7
+  python scripts/build_puzzles_from_clues.py --years 2026 --through 2060 --seed 7
 
 Notes:
+- The vocabulary for length N is every N-letter key across all clues-*.json files.
 - For the current year, the schedule starts at *today*.
 - For other years, schedule runs Jan 1 → Dec 31 of that year.
-- If there are fewer words than days, the list cycles to cover all days.
-- If there are more words than days, extra words are ignored for that year.
+- Words are drawn from a lazy stream of shuffled passes over the vocabulary,
+  carried across years, so no word repeats until the whole vocabulary is used.
+- Each year's file is written record by record as the schedule is generated;
+  time is O(days) and memory O(vocabulary) for any span of years.
 """
 
 from __future__ import annotations
@@ -37,13 +41,19 @@ import argparse
 import json
 import random
 from datetime import date, timedelta
+from itertools import groupby
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import instrument
+from json_output import add_output_args, output_options, write_json_array
 
 # Paths
 REPO_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = REPO_ROOT / "lib" / "data"
 
+CLUE_FILES = "clues-*.json"
+LENGTHS = (5, 6, 7)
 DEFAULT_YEARS = [2025, 2026, 2027, 2029, 2030]
 
 
@@ -73,85 +83,71 @@ def dates_for_year(y: int, today: date) -> Iterable[date]:
 
 # ---------- data helpers ----------
 
-def load_clue_words(path: Path) -> List[str]:
-    with path.open("r", encoding="utf-8") as f:
-        data: Dict[str, str] = json.load(f)
-    # keys are the words; normalize to UPPER and de-dupe (stable)
+def load_clue_words(paths: Iterable[Path], n: int) -> List[str]:
+    # keys are the words; keep the n-letter ones, normalize to UPPER and de-dupe (stable)
     seen = set()
     words: List[str] = []
-    for k in data.keys():
-        if not isinstance(k, str):
-            continue
-        w = k.strip().upper()
-        if w and w not in seen:
-            seen.add(w)
-            words.append(w)
+    for path in paths:
+        with path.open("r", encoding="utf-8") as f:
+            data: Dict[str, str] = json.load(f)
+        for k in data.keys():
+            if not isinstance(k, str):
+                continue
+            w = k.strip().upper()
+            if len(w) == n and w.isalpha() and w not in seen:
+                seen.add(w)
+                words.append(w)
     return words
 
 
-def ensure_pool_has(pool: List[str], needed: int, base_words: List[str]) -> List[str]:
-    """
-    Ensure 'pool' has at least 'needed' items; if not, extend by cycling/shuffling
-    more copies of base_words until the pool is long enough.
-    """
-    if len(pool) >= needed:
-        return pool
-    # How many more words do we need?
-    missing = needed - len(pool)
-    # Keep adding randomized chunks of base_words until we have enough
-    while missing > 0:
-        extra = base_words[:]  # copy
-        random.shuffle(extra)
-        pool.extend(extra)
-        missing = needed - len(pool)
-    return pool
+# ---------- scheduling ----------
+
+def word_stream(words: List[str]) -> Iterator[str]:
+    """Endless shuffled passes over the vocabulary; only one pass is held at a time."""
+    pool = words[:]
+    while True:
+        random.shuffle(pool)
+        yield from pool
+
+
+def schedule(words: List[str], years: Iterable[int], today: date) -> Iterator[Tuple[int, date, str]]:
+    """(year, date, word) for every scheduled day, years ascending, one shared word stream."""
+    stream = word_stream(words)
+    for y in sorted(set(years)):
+        for d in dates_for_year(y, today):
+            yield y, d, next(stream)
+
+
+def write_year(path: Path, days: Iterable[Tuple[int, date, str]], **output) -> int:
+    """Stream one year's (year, date, word) triples into a JSON list; returns the day count."""
+    count = 0
+    def records():
+        nonlocal count
+        for _, d, w in days:
+            count += 1
+            yield {"date": d.isoformat(), "word": w}
+    write_json_array(path, records(), **output)
+    return count
 
 
 # ---------- main logic ----------
 
-def build_for_length(n: int, years: List[int], today: date) -> None:
-    clues_file = DATA_DIR / CLUE_FILES[n]
-    words = load_clue_words(clues_file)
+def build_for_length(n: int, years: List[int], today: date, **output) -> None:
+    clue_files = sorted(DATA_DIR.glob(CLUE_FILES))
+    with instrument.stage("load_clues"):
+        words = load_clue_words(clue_files, n)
     if not words:
-        print(f"[WARN] No words found in {clues_file}")
+        print(f"[WARN] No {n}-letter words found in {DATA_DIR / CLUE_FILES}")
         return
 
-    # One global randomized sequence for this length.
-    # We'll walk it with a moving cursor so we don't repeat yearly order.
-    sequence = words[:]
-    random.shuffle(sequence)
-    cursor = 0
-
-    # Pre-calc total days needed in ascending year order (the sequence rolls forward)
-    years_sorted = sorted(years)
-    for y in years_sorted:
-        # Count how many days we need this year (today→Dec31 if current, else full year)
-        num_days = sum(1 for _ in dates_for_year(y, today))
-
-        # Make sure sequence has enough remaining items; extend by cycling if needed
-        remaining = len(sequence) - cursor
-        if remaining < num_days:
-            # Extend the sequence by shuffling more copies of the base words
-            extension = sequence[cursor:]  # keep any remainder to preserve order
-            base_words = words[:]         # use the original vocabulary for cycling
-            random.shuffle(base_words)
-            extension += base_words
-            sequence = sequence[:cursor] + ensure_pool_has(extension, num_days, words)
-
-        # Slice for this year and advance the cursor
-        slot = sequence[cursor: cursor + num_days]
-        cursor += num_days
-
-        # Pair with dates and write
-        dated: List[Tuple[date, str]] = list(zip(dates_for_year(y, today), slot))
+    start = 0
+    for y, days in groupby(schedule(words, years, today), key=lambda t: t[0]):
         out_path = DATA_DIR / f"puzzles{n}-{y}.json"
-        with out_path.open("w", encoding="utf-8") as f:
-            json.dump(
-                [{"date": d.isoformat(), "word": w} for d, w in dated],
-                f,
-                indent=2,
-            )
-        print(f"Wrote {out_path} ({len(dated)} days) from index start={cursor - num_days}")
+        with instrument.stage("schedule_and_write"):
+            count = write_year(out_path, days, **output)
+        instrument.count("days_written", count)
+        print(f"Wrote {out_path} ({count} days) from index start={start}")
+        start += count
 
 
 def parse_args() -> argparse.Namespace:
@@ -179,11 +175,20 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Random seed for reproducible ordering (optional).",
     )
+    p.add_argument(
+        "--through",
+        type=int,
+        default=None,
+        help="Also generate every year after the last --years value up to and including this one.",
+    )
+    add_output_args(p)
+    instrument.add_instrument_args(p)
     return p.parse_args()
 
 
 def main():
     args = parse_args()
+    instrument.start(args, "build_puzzles_from_clues")
     if args.seed is not None:
         random.seed(args.seed)
     else:
@@ -191,15 +196,16 @@ def main():
 
     today = date.today()
 
-    # validate years exist
     years = [int(y) for y in args.years]
+    if args.through is not None:
+        years += list(range(max(years) + 1, args.through + 1))
 
     # Run per length
     for n in args.only_lengths:
-        if n not in CLUE_FILES:
+        if n not in LENGTHS:
             print(f"[WARN] Unsupported length '{n}', skipping.")
             continue
-        build_for_length(n, years, today)
+        build_for_length(n, years, today, **output_options(args))
 
 
 if __name__ == "__main__":
@@ -5,15 +5,34 @@
 # python3 build_word_definitions_full.py --puzzles lib/data/puzzles-2025.json --out lib/data/wordDefinitions.json
 # python3 build_word_definitions_full.py --puzzles lib/data/puzzles-2025.json --out lib/data/wordDefinitions.json --force
 # python3 build_word_definitions_full.py --puzzles lib/data/puzzles-2025.json --out lib/data/wordDefinitions.json --flat
+# python3 build_word_definitions_full.py --puzzles lib/data/puzzles-2025.json --out lib/data/wordDefinitions.json --concurrency 8 --rate 5
+# python3 build_word_definitions_full.py --puzzles lib/data/puzzles-2025.json --out lib/data/wordDefinitions.json --force --no-cache
+# Progress is journaled to <out>.journal.jsonl as each word resolves; after a crash or Ctrl-C,
+# re-running the same command replays the journal and only looks up the remaining words.
+# python3 build_word_definitions_full.py --puzzles lib/data/puzzles-2025.json --out /tmp/defs.json --api http://127.0.0.1:8000/   (local stub server)
+# python3 build_word_definitions_full.py --puzzles lib/data/puzzles-2025.json --out lib/data/wordDefinitions.json --source local
+#   (no network: every word is resolved in one query against the database built by local_definitions.py --import)
 
-import argparse, json, time
+import argparse, json, socket, sqlite3, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import IncompleteRead
 from pathlib import Path
 from urllib.request import urlopen, Request
 from urllib.error import HTTPError, URLError
 
+import instrument
+from json_output import add_output_args, output_options, write_json
+
 API = "https://api.dictionaryapi.dev/api/v2/entries/en/"
 UA  = "VerseWord/1.0 (+dictionaryapi.dev client)"
 
+# HTTP statuses worth retrying (rate limited / transient server errors)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Transport failures worth retrying: refused/reset connections, read timeouts, truncated bodies
+RETRY_ERRORS = (URLError, ConnectionError, TimeoutError, socket.timeout, IncompleteRead)
+# HTTP statuses that are a definitive answer for a word and safe to cache
+CACHEABLE_STATUSES = {200, 404}
+
 def load_puzzles(path: Path) -> list[str]:
     data = json.loads(path.read_text(encoding="utf-8"))
     words = []
@@ -51,21 +70,173 @@ def load_existing(out_path: Path) -> dict:
     except Exception:
         return {"metadata": {"apiEndpoint": API}, "definitions": {}}
 
-def fetch_entry(word: str, timeout: float = 15.0):
-    url = API + word.lower()
-    req = Request(url, headers={"User-Agent": UA})
+def journal_path(out_path: Path) -> Path:
+    return out_path.with_name(out_path.name + ".journal.jsonl")
+
+def replay_journal(path: Path, header: dict) -> dict:
+    """
+    Returns {WORD: (value, ok)} recorded by an interrupted run with the same header
+    (puzzles file, output mode and definition source). A missing or mismatched
+    journal yields {}; a mismatch is reported, and the run starts over.
+    A torn last line from a crash mid-write is skipped.
+    """
+    done = {}
+    if not path.exists():
+        return done
+    with path.open(encoding="utf-8") as f:
+        first = f.readline()
+        try:
+            recorded = json.loads(first)
+        except ValueError:
+            return done
+        if recorded != header:
+            print(f"Not resuming from {path}: it was written by a different build "
+                  f"({recorded}, this run is {header})", file=sys.stderr)
+            return done
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            done[rec["word"]] = (rec["value"], bool(rec["ok"]))
+    return done
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, holding at most `burst`.
+    acquire() blocks until a token is available. rate <= 0 disables limiting.
+    """
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+                self.stamp = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+def _retry_after(e: HTTPError) -> float:
     try:
-        with urlopen(req, timeout=timeout) as resp:
-            return json.loads(resp.read().decode("utf-8", errors="replace"))
-    except HTTPError as e:
-        if e.code == 404:
+        return max(0.0, float(e.headers.get("Retry-After") or 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+class ResponseCache:
+    """
+    SQLite cache of raw API responses keyed by lowercased word.
+    Stores the HTTP status alongside the body so 404s are cached too;
+    rows older than `ttl` seconds are treated as misses (ttl <= 0 = never expire).
+    Safe to share across fetch worker threads.
+    """
+    def __init__(self, path: Path, ttl: float):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(path), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " word TEXT PRIMARY KEY, status INTEGER NOT NULL,"
+            " body TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self.db.commit()
+
+    def get(self, word: str):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT status, body, fetched_at FROM responses WHERE word = ?", (word,)
+            ).fetchone()
+        if not row:
             return None
+        status, body, fetched_at = row
+        if self.ttl > 0 and time.time() - fetched_at > self.ttl:
+            return None
+        return status, body
+
+    def put(self, word: str, status: int, body: str):
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses (word, status, body, fetched_at) VALUES (?, ?, ?, ?)",
+                (word, status, body, time.time()),
+            )
+            self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+def _http_get(url: str, timeout: float, limiter: TokenBucket, retries: int, backoff: float):
+    """
+    Returns (status, body_text). status is 0 when no HTTP response was obtained.
+    429 and 5xx responses (and RETRY_ERRORS) are retried with exponential
+    backoff: backoff * 2**attempt seconds, or the server's Retry-After if longer.
+    """
+    req = Request(url, headers={"User-Agent": UA})
+    status, body = 0, ""
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            with instrument.stage("rate_limit_wait"):
+                limiter.acquire()
+        delay = backoff * (2 ** attempt)
+        instrument.count("http_requests")
+        if attempt:
+            instrument.count("http_retries")
+        try:
+            with urlopen(req, timeout=timeout) as resp:
+                return resp.status, resp.read().decode("utf-8", errors="replace")
+        except HTTPError as e:
+            status, body = e.code, ""
+            if e.code not in RETRY_STATUSES:
+                return status, body
+            delay = max(delay, _retry_after(e))
+        except RETRY_ERRORS:
+            status, body = 0, ""
+        except Exception:
+            return 0, ""
+        if attempt < retries:
+            time.sleep(delay)
+    return status, body
+
+def _decode(status: int, body: str):
+    if status != 200:
         return None
-    except URLError:
-        return None
-    except Exception:
+    try:
+        return json.loads(body)
+    except ValueError:
         return None
 
+@instrument.timed("fetch_entry")
+def fetch_entry(word: str, timeout: float = 15.0, api: str = API,
+                limiter: TokenBucket = None, retries: int = 3, backoff: float = 1.0,
+                cache: ResponseCache = None):
+    """
+    GET one word. Returns the decoded JSON payload, or None on 404 / failure.
+    With a cache, fresh cached responses skip the network (and the rate limiter);
+    definitive answers (200 and 404) are written back, transient failures are not.
+    """
+    key = word.lower()
+    if cache is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            instrument.count("cache_hits")
+            return _decode(*hit)
+    status, body = _http_get(api + key, timeout, limiter, retries, backoff)
+    if cache is not None and status in CACHEABLE_STATUSES:
+        cache.put(key, status, body)
+    return _decode(status, body)
+
 def to_structured(payload) -> list[dict]:
     """
     Returns a list like:
@@ -110,71 +281,146 @@ def best_single_definition(structured: List[Dict]) -> Optional[str]:
 
 def main():
     ap = argparse.ArgumentParser(description="Build complete word definitions from dictionaryapi.dev (no pronunciation).")
-    ap.add_argument("--puzzles", required=True, help="path to puzzles-2025.json")
+    ap.add_argument("--puzzles", required=True, nargs="+",
+                    help="path to puzzles-2025.json (several files, e.g. puzzles5/6/7-2025.json, are merged)")
     ap.add_argument("--out", default="lib/data/wordDefinitions.json", help="output JSON path")
-    ap.add_argument("--sleep", type=float, default=0.6, help="seconds between API calls")
+    ap.add_argument("--sleep", type=float, default=0.6, help="seconds between API calls (used as the rate limit when --rate is not given)")
+    ap.add_argument("--rate", type=float, default=None, help="max API requests per second across all workers (0=unlimited)")
+    ap.add_argument("--burst", type=int, default=1, help="requests allowed back-to-back before --rate applies")
+    ap.add_argument("--concurrency", type=int, default=1, help="number of parallel fetch workers")
+    ap.add_argument("--retries", type=int, default=3, help="retries per word on 429/5xx/connection errors")
+    ap.add_argument("--backoff", type=float, default=1.0, help="base seconds for exponential retry backoff")
+    ap.add_argument("--api", default=API, help="API base URL (point at a local stub server for testing)")
+    ap.add_argument("--cache-dir", default=".cache", help="directory for the SQLite response cache")
+    ap.add_argument("--cache-ttl", type=float, default=30, help="days before a cached response is re-fetched (0=never)")
+    ap.add_argument("--no-cache", action="store_true", help="always hit the API; don't read or write the response cache")
     ap.add_argument("--max", type=int, default=0, help="limit number of words to fetch (0=all)")
     ap.add_argument("--force", action="store_true", help="re-fetch even if word already present")
     ap.add_argument("--flat", action="store_true", help='output as {"WORD":"first full definition"} instead of structured blocks')
+    ap.add_argument("--source", choices=["api", "local"], default="api",
+                    help="where definitions come from: dictionaryapi.dev, or the local_definitions.py database")
+    ap.add_argument("--local-db", default=None, help="database for --source local (default .cache/definitions.sqlite3)")
+    add_output_args(ap)
+    instrument.add_instrument_args(ap)
     args = ap.parse_args()
+    instrument.start(args, "build_word_definitions_full")
 
-    puzzles_path = Path(args.puzzles)
+    puzzles_file = ", ".join(args.puzzles)
     out_path = Path(args.out)
 
-    words = load_puzzles(puzzles_path)
-    store = load_existing(out_path)
-    defs = store["definitions"]
+    with instrument.stage("load"):
+        words = list(dict.fromkeys(w for p in args.puzzles for w in load_puzzles(Path(p))))
+        store = load_existing(out_path)
+        defs = store["definitions"]
+
+        # Replay words resolved by an interrupted run of the same build
+        jpath = journal_path(out_path)
+        header = {"journal": 1, "puzzlesFile": puzzles_file, "flat": args.flat, "source": args.source}
+        resumed = replay_journal(jpath, header)
+        for w, (value, _) in resumed.items():
+            defs[w] = value
 
     # Determine todo list
-    todo = [w for w in words if args.force or w not in defs or not defs[w]]
+    todo = [w for w in words if w not in resumed and (args.force or w not in defs or not defs[w])]
     if args.max and args.max > 0:
         todo = todo[:args.max]
 
-    fetched = 0
-    missing = []
-
-    for i, w in enumerate(todo, 1):
-        payload = fetch_entry(w)
-        structured = to_structured(payload) if payload else []
-        if args.flat:
-            chosen = best_single_definition(structured)
-            if chosen:
-                defs[w] = chosen
-                fetched += 1
-            else:
-                # leave empty to fill later from a biblical source
-                defs[w] = defs.get(w, "")
-                missing.append(w)
-        else:
-            if structured:
-                defs[w] = structured
-                fetched += 1
-            else:
-                defs[w] = defs.get(w, [])
-                missing.append(w)
+    cache = limiter = local = None
+    if args.source == "local":
+        from local_definitions import DEFAULT_DB, LocalDefinitions
+        local = LocalDefinitions(Path(args.local_db or DEFAULT_DB))
+    else:
+        rate = args.rate if args.rate is not None else (1.0 / args.sleep if args.sleep > 0 else 0)
+        limiter = TokenBucket(rate, args.burst)
+        cache = None if args.no_cache else ResponseCache(Path(args.cache_dir) / "dictionaryapi.sqlite3",
+                                                         args.cache_ttl * 86400)
+
+    def fetch(w: str):
+        return fetch_entry(w, api=args.api, limiter=limiter,
+                           retries=args.retries, backoff=args.backoff, cache=cache)
+
+    def resolved():
+        """(word, structured blocks) in todo order."""
+        if local is not None:
+            with instrument.stage("local_lookup"):
+                found = local.lookup_many(todo)
+            return ((w, found.get(w, [])) for w in todo)
+        # map() yields results in todo order, so the output matches a serial run
+        return ((w, to_structured(payload) if payload else []) for w, payload in zip(todo, pool.map(fetch, todo)))
+
+    fetched = sum(1 for _, ok in resumed.values() if ok)
+    missing = [w for w, (_, ok) in resumed.items() if not ok]
+    if resumed:
+        print(f"Resuming from {jpath}: {len(resumed)} words already resolved")
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    journal = jpath.open("a" if resumed else "w", encoding="utf-8")
+    if not resumed:
+        journal.write(json.dumps(header) + "\n")
+    started = time.monotonic()
+
+    pool = ThreadPoolExecutor(max_workers=max(1, args.concurrency) if local is None else 1)
+    done = 0
+    try:
+        with instrument.stage("fetch"):
+            for w, structured in resolved():
+                if args.flat:
+                    chosen = best_single_definition(structured)
+                    ok = bool(chosen)
+                    # leave empty to fill later from a biblical source
+                    defs[w] = chosen if ok else defs.get(w, "")
+                else:
+                    ok = bool(structured)
+                    defs[w] = structured if ok else defs.get(w, [])
+                if ok:
+                    fetched += 1
+                else:
+                    missing.append(w)
 
-        if i < len(todo) and args.sleep > 0:
-            time.sleep(args.sleep)
+                journal.write(json.dumps({"word": w, "value": defs[w], "ok": ok}, ensure_ascii=False) + "\n")
+                journal.flush()
+                done += 1
+    except KeyboardInterrupt:
+        pool.shutdown(wait=False, cancel_futures=True)
+        journal.close()
+        print(f"\nInterrupted: {len(resumed) + done} words saved to {jpath}; re-run the same command to resume.")
+        sys.exit(130)
+    pool.shutdown()
+    journal.close()
+
+    elapsed = time.monotonic() - started
+    if cache is not None:
+        cache.close()
+    if local is not None:
+        source = {"source": "local", "localDump": local.meta.get("dump", "")}
+        local.close()
+    else:
+        source = {"apiEndpoint": API, "source": "dictionaryapi.dev"}
 
     # Write output
     out = {
         "metadata": {
-            "apiEndpoint": API,
-            "source": "dictionaryapi.dev",
-            "puzzlesFile": str(puzzles_path),
+            **source,
+            "puzzlesFile": puzzles_file,
             "totalWords": len(words),
-            "lookedUp": len(todo),
+            "lookedUp": len(resumed) + len(todo),
             "successfulFetches": fetched,
             "missing": len(missing)
         },
         "definitions": defs
     }
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(out, ensure_ascii=False, indent=2), encoding="utf-8")
+    with instrument.stage("write"):
+        write_json(out_path, out, **output_options(args))
+    instrument.count("words_fetched", fetched)
+    instrument.count("words_missing", len(missing))
+    jpath.unlink(missing_ok=True)
 
     # Summary to stdout
     print(f"Wrote {out_path}")
-    print(f"Total words: {len(words)} | Looked up: {len(todo)} | Success: {fetched} | Missing: {len(missing)}")
+    print(f"Total words: {len(words)} | Looked up: {len(resumed) + len(todo)} | Success: {fetched} | Missing: {len(missing)}")
+    if todo:
+        how = "from the local database" if local is not None else f"concurrency {args.concurrency}"
+        print(f"Fetched {len(todo)} words in {elapsed:.1f}s ({len(todo) / max(elapsed, 1e-9):.1f} words/sec, {how})")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
+import argparse
 import json
-import sys
 
-def check_dictionary(filename):
+import instrument
+from validate_data import dictionary_issues, length_for
+
+def check_dictionary(filename, length=None):
     """Check dictionary for repeats and incorrect word lengths."""
     try:
         with open(filename, 'r') as f:
@@ -10,41 +13,49 @@ def check_dictionary(filename):
     except Exception as e:
         print(f"Error reading file: {e}")
         return
-    
+    length = length or length_for(filename)
+
     print(f"Total words: {len(words)}")
-    
-    # Check for duplicates
-    seen = set()
-    duplicates = []
-    for word in words:
-        if word in seen:
-            duplicates.append(word)
-        else:
-            seen.add(word)
-    
+    with instrument.stage("check"):
+        issues = dictionary_issues(words, length)
+    instrument.count("words", len(words))
+
+    non_strings = issues["non_strings"]
+    if non_strings:
+        print(f"\nFound {len(non_strings)} entries that aren't strings:")
+        for entry in non_strings:
+            print(f"  {entry!r}")
+
+    duplicates = issues["duplicates"]
     if duplicates:
         print(f"\nFound {len(duplicates)} duplicate words:")
         for word in duplicates:
             print(f"  {word}")
     else:
         print("\nNo duplicate words found.")
-    
-    # Check word lengths
-    incorrect_length = []
-    for word in words:
-        if len(word) != 7:
-            incorrect_length.append((word, len(word)))
-    
-    if incorrect_length:
-        print(f"\nFound {len(incorrect_length)} words with incorrect length:")
-        for word, length in incorrect_length:
-            print(f"  '{word}' has {length} letters")
+
+    incorrect = issues["bad_words"]
+    if incorrect:
+        print(f"\nFound {len(incorrect)} words that aren't {length} letters a-z:")
+        for word in incorrect:
+            print(f"  '{word}' has {len(word)} letters")
     else:
-        print("\nAll words are exactly 7 letters long.")
-    
+        print(f"\nAll words are exactly {length} letters long.")
+
     # Show some examples of the data
     print(f"\nFirst 10 words: {words[:10]}")
     print(f"Last 10 words: {words[-10:]}")
 
+def main(prog="check_dictionary"):
+    # Defaults to dictionary7.json; pass other dictionary paths to check those instead.
+    # For cross-file checks (puzzles, clues, definitions) use validate_data.py.
+    ap = argparse.ArgumentParser(description="Check dictionary files for duplicates and wrong-length words.")
+    ap.add_argument("paths", nargs="*", default=["lib/data/dictionary7.json"], help="dictionary files (default lib/data/dictionary7.json)")
+    instrument.add_instrument_args(ap)
+    args = ap.parse_args()
+    instrument.start(args, prog)
+    for path in args.paths:
+        check_dictionary(path)
+
 if __name__ == "__main__":
-    check_dictionary("lib/data/dictionary7.json")
+    main()
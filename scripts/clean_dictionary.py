@@ -1,44 +1,54 @@
 #!/usr/bin/env python3
+import argparse
 import json
-import sys
 
-def clean_dictionary(input_filename, output_filename):
-    """Clean dictionary by removing duplicates and incorrect word lengths."""
+import instrument
+from json_output import write_json
+from validate_data import dictionary_issues, length_for
+
+def clean_dictionary(input_filename, output_filename, length=None):
+    """Clean dictionary: strip words, then remove duplicates and anything dictionary_issues rejects."""
     try:
         with open(input_filename, 'r') as f:
             words = json.load(f)
     except Exception as e:
         print(f"Error reading file: {e}")
         return
+    length = length or length_for(input_filename)
     
     print(f"Original words: {len(words)}")
     
-    # Remove duplicates while preserving order
+    # Strip surrounding whitespace, then remove duplicates (case-insensitive,
+    # e.g. "radio" / "RADIO ") while preserving order
     seen = set()
     cleaned_words = []
     duplicates_removed = 0
+    stripped = 0
     
     for word in words:
-        if word not in seen:
-            seen.add(word)
-            cleaned_words.append(word)
+        text = str(word).strip()
+        stripped += text != str(word)
+        if text.upper() not in seen:
+            seen.add(text.upper())
+            cleaned_words.append(text)
         else:
             duplicates_removed += 1
     
+    print(f"Whitespace stripped: {stripped}")
     print(f"Duplicates removed: {duplicates_removed}")
     
-    # Remove words that aren't exactly 7 letters
-    length_issues_removed = 0
+    # Remove everything dictionary_issues flags: not exactly `length` letters a-z
+    invalid_removed = 0
     final_words = []
     
     for word in cleaned_words:
-        if len(word) == 7:
-            final_words.append(word)
+        if dictionary_issues([word], length)["bad_words"]:
+            invalid_removed += 1
+            print(f"Removed '{word}' (not {length} letters a-z)")
         else:
-            length_issues_removed += 1
-            print(f"Removed '{word}' (has {len(word)} letters)")
+            final_words.append(word)
     
-    print(f"Length issues removed: {length_issues_removed}")
+    print(f"Invalid words removed: {invalid_removed}")
     print(f"Final words: {len(final_words)}")
     
     # Sort the words alphabetically
@@ -46,8 +56,9 @@ def clean_dictionary(input_filename, output_filename):
     
     # Write cleaned dictionary
     try:
-        with open(output_filename, 'w') as f:
-            json.dump(final_words, f, indent=2)
+        # no sidecars: this file is meant to be moved over the original
+        with instrument.stage("write"):
+            write_json(output_filename, final_words, ensure_ascii=True, compress=False, quiet=True)
         print(f"\nCleaned dictionary saved to: {output_filename}")
     except Exception as e:
         print(f"Error writing file: {e}")
@@ -59,22 +70,12 @@ def clean_dictionary(input_filename, output_filename):
         with open(output_filename, 'r') as f:
             verify_words = json.load(f)
         
-        # Check for duplicates
-        seen = set()
-        duplicates = []
-        for word in verify_words:
-            if word in seen:
-                duplicates.append(word)
-            else:
-                seen.add(word)
-        
-        # Check word lengths
-        incorrect_length = []
-        for word in verify_words:
-            if len(word) != 7:
-                incorrect_length.append((word, len(word)))
-        
-        if not duplicates and not incorrect_length:
+        issues = dictionary_issues(verify_words, length)
+        duplicates = issues["duplicates"]
+        incorrect_length = issues["bad_words"]
+        non_strings = issues["non_strings"]
+
+        if not duplicates and not incorrect_length and not non_strings:
             print("✓ Verification passed: No duplicates or length issues found")
         else:
             print("✗ Verification failed:")
@@ -82,16 +83,24 @@ def clean_dictionary(input_filename, output_filename):
                 print(f"  Found {len(duplicates)} duplicates")
             if incorrect_length:
                 print(f"  Found {len(incorrect_length)} length issues")
+            if non_strings:
+                print(f"  Found {len(non_strings)} non-string entries")
                 
     except Exception as e:
         print(f"Error verifying file: {e}")
 
 if __name__ == "__main__":
-    input_file = "lib/data/dictionary7.json"
-    output_file = "lib/data/dictionary7_cleaned.json"
-    
-    print("Cleaning dictionary7.json...")
-    clean_dictionary(input_file, output_file)
+    ap = argparse.ArgumentParser(description="Write a de-duplicated, length-checked copy of a dictionary file.")
+    ap.add_argument("input", nargs="?", default="lib/data/dictionary7.json", help="dictionary file (default lib/data/dictionary7.json)")
+    instrument.add_instrument_args(ap)
+    args = ap.parse_args()
+    instrument.start(args, "clean_dictionary")
+    input_file = args.input
+    output_file = input_file.replace(".json", "_cleaned.json")
+
+    print(f"Cleaning {input_file}...")
+    with instrument.stage("clean"):
+        clean_dictionary(input_file, output_file)
     
-    print(f"\nTo replace the original file, run:")
+    print("\nTo replace the original file, run:")
     print(f"mv {output_file} {input_file}")
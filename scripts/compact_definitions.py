@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Compact word-definitions-{YEAR}.json (apply_easton_definitions.py output)
+into one store where every distinct string is kept once.
+
+Easton bodies are shared by variant headwords, and Scripture refs like
+"Genesis 1:1" repeat across hundreds of entries. Here each string goes into
+a table once, and entries refer to it by integer id. Ids are assigned by
+descending frequency, so the most common strings get the shortest ids.
+
+Output (--out, default lib/data/word-definitions.compact.json, always minified):
+  {
+    "version": 1,
+    "strings": ["Genesis 1:1", "noun", ...],
+    "words": {
+      "ABRAHAM": [[pos id, [definition ids], [example ids]], ...],   structured blocks
+      "JESUS": 17                                                     flat (--flat builds)
+    },
+    "metadata": {...}
+  }
+
+--top-k K keeps each word's first K definitions (dictionaryapi.dev and Easton list
+the primary sense first). Blocks left with no definitions are dropped.
+
+CompactDefinitions(path) parses the whole file, string table and every word's
+id lists, when it is created; get(WORD) then rebuilds one word's blocks on
+demand, in the same shape as the input files. Only that expansion is lazy.
+
+Usage:
+  python3 scripts/compact_definitions.py
+  python3 scripts/compact_definitions.py --top-k 3 --report
+  python3 scripts/compact_definitions.py --inputs lib/data/word-definitions-2025.json --out /tmp/defs.compact.json
+"""
+
+import argparse, gzip, json, time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import instrument
+from json_output import write_json
+from shard_definitions import DATA_DIR, definition_files, merge_definitions
+
+FORMAT_VERSION = 1
+
+def trim(blocks: List[dict], top_k: int) -> List[dict]:
+    """The first `top_k` definitions across blocks, keeping block order."""
+    out, left = [], top_k
+    for b in blocks:
+        if left <= 0:
+            break
+        defs = (b.get("definitions") or [])[:left]
+        if defs:
+            out.append({**b, "definitions": defs})
+            left -= len(defs)
+    return out
+
+def compact(defs: Dict[str, object], top_k: int = 0) -> dict:
+    if top_k > 0:
+        defs = {w: trim(v, top_k) if isinstance(v, list) else v for w, v in defs.items()}
+    counts: Counter = Counter()
+    for v in defs.values():
+        if isinstance(v, list):
+            for b in v:
+                counts[b.get("partOfSpeech") or ""] += 1
+                counts.update(b.get("definitions") or [])
+                counts.update(b.get("examples") or [])
+        else:
+            counts[v] += 1
+    strings = [s for s, _ in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))]
+    sid = {s: i for i, s in enumerate(strings)}
+    words = {}
+    for w in sorted(defs):
+        v = defs[w]
+        if isinstance(v, list):
+            words[w] = [[sid[b.get("partOfSpeech") or ""],
+                         [sid[d] for d in b.get("definitions") or []],
+                         [sid[e] for e in b.get("examples") or []]] for b in v]
+        else:
+            words[w] = sid[v]
+    return {"version": FORMAT_VERSION, "strings": strings, "words": words,
+            "references": sum(counts.values())}
+
+class CompactDefinitions:
+    """Reader: parses the whole store up front and expands one word per get()."""
+
+    def __init__(self, path: Path):
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported compact definitions version {data.get('version')}")
+        self.strings: List[str] = data["strings"]
+        self._words: Dict[str, object] = data["words"]
+        self.metadata = data.get("metadata", {})
+
+    def __contains__(self, word: str) -> bool:
+        return word.upper() in self._words
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def words(self) -> List[str]:
+        return list(self._words)
+
+    def get(self, word: str) -> Optional[object]:
+        v = self._words.get(word.upper())
+        if v is None:
+            return None
+        s = self.strings
+        if isinstance(v, int):
+            return s[v]
+        return [{"partOfSpeech": s[p], "definitions": [s[i] for i in d], "examples": [s[i] for i in e]}
+                for p, d, e in v]
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def report(inputs: List[Path], merged: Dict[str, object], out: Path, repeat: int = 5):
+    raw = sum(p.stat().st_size for p in inputs)
+    raw_gz = sum(len(gzip.compress(p.read_bytes(), 9)) for p in inputs)
+    size = out.stat().st_size
+    size_gz = len(gzip.compress(out.read_bytes(), 9))
+    print(f"[size] {len(inputs)} input file(s): {raw:,} B (gzip {raw_gz:,}) -> {size:,} B (gzip {size_gz:,}), "
+          f"{1 - size / max(raw, 1):.0%} smaller ({1 - size_gz / max(raw_gz, 1):.0%} gzipped)")
+
+    def load_full():
+        for p in inputs:
+            json.loads(p.read_text(encoding="utf-8"))
+    t_full = _best(load_full, repeat)
+    t_compact = _best(lambda: CompactDefinitions(out), repeat)
+    store = CompactDefinitions(out)
+    t_all = _best(lambda: [store.get(w) for w in store.words()], repeat)
+    print(f"[load] parse inputs {t_full * 1000:.2f} ms | load compact {t_compact * 1000:.2f} ms "
+          f"({t_full / max(t_compact, 1e-9):.1f}x) | expand all {len(store)} words {t_all * 1000:.2f} ms")
+    bad = [w for w in store.words() if store.get(w) != merged[w]]
+    print(f"[check] {len(store) - len(bad)}/{len(store)} words rehydrate to the input exactly"
+          + (f"; differ: {', '.join(bad[:10])}" if bad else ""))
+
+def main():
+    ap = argparse.ArgumentParser(description="Intern repeated strings in word definitions into a compact store.")
+    ap.add_argument("--data-dir", default=str(DATA_DIR), help="where word-definitions-{YEAR}.json live (default lib/data)")
+    ap.add_argument("--inputs", nargs="+", help="definition files (default: every <data-dir>/word-definitions-{YEAR}.json)")
+    ap.add_argument("--out", default=None, help="output (default: <data-dir>/word-definitions.compact.json)")
+    ap.add_argument("--top-k", type=int, default=0, help="keep each word's first K definitions (0 = all)")
+    ap.add_argument("--no-compress", action="store_true", help="don't write .gz/.br sidecars (removes stale ones)")
+    ap.add_argument("--report", action="store_true", help="print size and load-time comparisons against the inputs")
+    instrument.add_instrument_args(ap)
+    args = ap.parse_args()
+    instrument.start(args, "compact_definitions")
+
+    data_dir = Path(args.data_dir)
+    inputs = [Path(p) for p in args.inputs] if args.inputs else definition_files(data_dir)
+    if not inputs:
+        raise SystemExit(f"no word-definitions-*.json in {data_dir}")
+    out = Path(args.out or data_dir / "word-definitions.compact.json")
+
+    with instrument.stage("load"):
+        merged, sources = merge_definitions(inputs)
+    with instrument.stage("compact"):
+        store = compact(merged, args.top_k)
+    refs = store.pop("references")
+    instrument.count("words", len(store["words"]))
+    instrument.count("strings", len(store["strings"]))
+    instrument.count("string_references", refs)
+    store["metadata"] = {"generated": datetime.now(timezone.utc).isoformat(), "topK": args.top_k, "sources": sources}
+    with instrument.stage("write"):
+        write_json(out, store, minify=True, compress=not args.no_compress)
+    print(f"Compacted {len(store['words'])} words: {refs:,} string references -> "
+          f"{len(store['strings']):,} distinct strings -> {out}")
+    if args.report:
+        with instrument.stage("report"):
+            report(inputs, merged if args.top_k <= 0 else
+                   {w: trim(v, args.top_k) if isinstance(v, list) else v for w, v in merged.items()}, out)
+
+if __name__ == "__main__":
+    main()
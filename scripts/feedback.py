@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Guess feedback with the same semantics as evaluateGuess in lib/gameLogic.ts:
+greens first, then presents left to right while the secret still has unmatched
+copies of the letter, so duplicate letters are only credited as often as they
+occur in the secret.
+
+A feedback row is encoded as one integer, sum(state_i * 3**i) with
+absent=0, present=1, correct=2; the all-green code is 3**L - 1.
+
+feedback_codes() computes a whole guess x answer block with NumPy, looping
+only over letter positions, never over word pairs.
+
+Usage:
+  python3 scripts/feedback.py CRANE REACT          (prints the feedback row)
+"""
+
+import sys
+from typing import List, Sequence
+
+import numpy as np
+
+ABSENT, PRESENT, CORRECT = 0, 1, 2
+STATE_NAMES = {ABSENT: "absent", PRESENT: "present", CORRECT: "correct"}
+
+def evaluate_guess(guess: str, secret: str) -> List[int]:
+    """Straight port of evaluateGuess, the reference for the vectorized version."""
+    result = [ABSENT] * len(guess)
+    counts = {}
+    for c in secret:
+        counts[c] = counts.get(c, 0) + 1
+    for i, c in enumerate(guess):
+        if c == secret[i]:
+            result[i] = CORRECT
+            counts[c] -= 1
+    for i, c in enumerate(guess):
+        if result[i] != CORRECT and counts.get(c, 0) > 0:
+            result[i] = PRESENT
+            counts[c] -= 1
+    return result
+
+def encode_states(states: Sequence[int]) -> int:
+    return sum(s * 3 ** i for i, s in enumerate(states))
+
+def decode_code(code: int, length: int) -> List[int]:
+    states = []
+    for _ in range(length):
+        states.append(code % 3)
+        code //= 3
+    return states
+
+def win_code(length: int) -> int:
+    return 3 ** length - 1
+
+def code_dtype(length: int):
+    return np.uint8 if 3 ** length <= 256 else np.uint16
+
+def encode_words(words: Sequence[str]) -> np.ndarray:
+    """(N, L) uint8 array of letter indices A=0 .. Z=25; all words must share one length."""
+    raw = "".join(words).encode("ascii")
+    return (np.frombuffer(raw, dtype=np.uint8) - 65).reshape(len(words), -1)
+
+def feedback_codes(guesses: np.ndarray, answers: np.ndarray, block: int = 512) -> np.ndarray:
+    """
+    (G, A) feedback codes for every guess against every answer.
+
+    Non-green guess position i is present iff fewer earlier non-green guess
+    positions carry the same letter than the secret has unmatched copies of
+    it, which is exactly what the left-to-right pass in evaluateGuess does.
+    """
+    n_guess, length = guesses.shape
+    out = np.empty((n_guess, answers.shape[0]), dtype=code_dtype(length))
+    for start in range(0, n_guess, block):
+        g = guesses[start:start + block]
+        green = g[:, None, :] == answers[None, :, :]  # (B, A, L)
+        open_ans = ~green
+        code = (green * (2 * 3 ** np.arange(length, dtype=np.int32))).sum(axis=2, dtype=np.int32)
+        for i in range(length):
+            letter = g[:, i, None]
+            # unmatched copies of this letter in the secret
+            avail = np.zeros(code.shape, dtype=np.int8)
+            for j in range(length):
+                avail += open_ans[:, :, j] & (answers[None, :, j] == letter)
+            # earlier non-green guess positions competing for them
+            earlier = np.zeros(code.shape, dtype=np.int8)
+            for k in range(i):
+                earlier += open_ans[:, :, k] & (g[:, k, None] == letter)
+            code += (open_ans[:, :, i] & (earlier < avail)) * 3 ** i
+        out[start:start + len(g)] = code
+    return out
+
+def pattern_matrix(words: Sequence[str], block: int = 512) -> np.ndarray:
+    """Square guess x answer code matrix over one word list."""
+    enc = encode_words(words)
+    return feedback_codes(enc, enc, block)
+
+def main():
+    if len(sys.argv) != 3 or len(sys.argv[1]) != len(sys.argv[2]):
+        sys.exit("usage: feedback.py GUESS SECRET  (same length)")
+    guess, secret = sys.argv[1].upper(), sys.argv[2].upper()
+    states = evaluate_guess(guess, secret)
+    vec = int(feedback_codes(encode_words([guess]), encode_words([secret]))[0, 0])
+    assert vec == encode_states(states), "vectorized feedback disagrees with the reference"
+    print(" ".join(f"{c}:{STATE_NAMES[s]}" for c, s in zip(guess, states)), f"(code {vec})")
+
+if __name__ == "__main__":
+    main()
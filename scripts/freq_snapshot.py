@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Compact, versioned snapshot of wordfreq's top-N list for offline wordlist builds.
+
+Export once (needs wordfreq installed):
+  python3 scripts/freq_snapshot.py --lang en --top 300000 --out data/wordfreq-en-300k.bin
+
+Then build without wordfreq:
+  python3 scripts/build_common_wordlists.py --freq-snapshot data/wordfreq-en-300k.bin
+  python3 scripts/build_common_wordlists567.py --freq-snapshot data/wordfreq-en-300k.bin
+
+File layout (little-endian):
+  header   magic "WFRQ", format version, word count, blob length,
+           language code, wordfreq version the snapshot was taken from
+  offsets  uint32 x (count + 1), start of each word in the blob
+  blob     UTF-8 words in rank order, newline-separated
+  zipf     float16 x count (2-byte aligned)
+
+Zipf values are stored as float16; wordfreq reports them to 2 decimals and
+every such value below 8 round-trips exactly, so snapshot builds match live ones.
+Every word is kept, non-ASCII ones included, so top_n_list(lang, N) returns
+the same N words as wordfreq does for any N up to --top. Version 1 snapshots
+dropped non-ASCII words, which shifted those ranks; re-export them.
+The file is written to a temp name and renamed into place.
+"""
+
+import argparse, mmap, os, struct
+from importlib.metadata import version as dist_version
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import instrument
+
+MAGIC = b"WFRQ"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sHHII8s24s")  # magic, version, reserved, count, blob_len, lang, source version
+
+class FreqSnapshot:
+    """
+    Read-only, memory-mapped snapshot exposing wordfreq's top_n_list /
+    zipf_frequency signatures. Words are decoded only for the requested
+    prefix of the ranking; the word -> score map is built on first lookup.
+    """
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = path.open("rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, blob_len, lang, source = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a frequency snapshot")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported snapshot version {version} (expected {FORMAT_VERSION})")
+        self.count = count
+        self.lang = lang.rstrip(b"\0").decode("ascii")
+        self.source_version = source.rstrip(b"\0").decode("ascii")
+        self._offsets_at = HEADER.size
+        self._blob_at = self._offsets_at + 4 * (count + 1)
+        self._zipf_at = self._blob_at + blob_len + (blob_len & 1)
+        self._scores: Optional[Dict[str, float]] = None
+
+    def _check_lang(self, lang: str):
+        if lang != self.lang:
+            raise ValueError(f"snapshot {self.path} is for '{self.lang}', not '{lang}'")
+
+    def _end_of(self, n: int) -> int:
+        return struct.unpack_from("<I", self._mm, self._offsets_at + 4 * n)[0]
+
+    def words(self, n: int) -> List[str]:
+        n = max(0, min(n, self.count))
+        if n == 0:
+            return []
+        end = self._end_of(n) - 1  # drop the trailing newline
+        return self._mm[self._blob_at:self._blob_at + end].decode("utf-8").split("\n")
+
+    def zipfs(self, n: int) -> Tuple[float, ...]:
+        n = max(0, min(n, self.count))
+        return tuple(round(z, 2) for z in struct.unpack_from(f"<{n}e", self._mm, self._zipf_at))
+
+    def top_n_list(self, lang: str, n: int) -> List[str]:
+        self._check_lang(lang)
+        return self.words(n)
+
+    def zipf_frequency(self, word: str, lang: str) -> float:
+        self._check_lang(lang)
+        if self._scores is None:
+            self._scores = {}
+            for w, z in zip(self.words(self.count), self.zipfs(self.count)):
+                self._scores.setdefault(w, z)
+        return self._scores.get(word, 0.0)
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+def write_snapshot(out: Path, lang: str, pairs: List[Tuple[str, float]], source_version: str) -> int:
+    """Write (word, zipf) pairs in rank order; returns the file size in bytes."""
+    blob = bytearray()
+    offsets = [0]
+    for w, _ in pairs:
+        if "\n" in w:
+            raise ValueError(f"word {w!r} contains a newline")
+        blob += w.encode("utf-8") + b"\n"
+        offsets.append(len(blob))
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(pairs), len(blob),
+                            lang.encode("ascii"), source_version.encode("ascii")[:24]))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(blob)
+        if len(blob) & 1:
+            f.write(b"\0")
+        f.write(struct.pack(f"<{len(pairs)}e", *(z for _, z in pairs)))
+    os.replace(tmp, out)
+    return out.stat().st_size
+
+def load_freq_source(snapshot: Optional[str]) -> Tuple[Callable[[str, int], List[str]], Callable[[str, str], float]]:
+    """(top_n_list, zipf_frequency) from a snapshot file, or from wordfreq when none is given."""
+    if snapshot:
+        snap = FreqSnapshot(Path(snapshot))
+        return snap.top_n_list, snap.zipf_frequency
+    from wordfreq import top_n_list, zipf_frequency
+    return top_n_list, zipf_frequency
+
+def main():
+    ap = argparse.ArgumentParser(description="Export wordfreq's top-N words and zipf scores to a compact snapshot.")
+    ap.add_argument("--lang", default="en", help="Language code for wordfreq (default en)")
+    ap.add_argument("--top", type=int, default=300_000, help="How many top words to export (default 300k)")
+    ap.add_argument("--out", required=True, help="Snapshot file to write")
+    instrument.add_instrument_args(ap)
+    args = ap.parse_args()
+    instrument.start(args, "freq_snapshot")
+
+    import wordfreq
+    pairs = []
+    with instrument.stage("score"):
+        for w in wordfreq.top_n_list(args.lang, args.top):
+            pairs.append((w, wordfreq.zipf_frequency(w, args.lang)))
+    version = dist_version("wordfreq")  # wordfreq has no __version__ attribute
+    with instrument.stage("write"):
+        size = write_snapshot(Path(args.out), args.lang, pairs, f"wordfreq {version}")
+    print(f"Wrote {len(pairs)} words ({size / 1024:.0f} KiB, wordfreq {version}) -> {args.out}")
+
+if __name__ == "__main__":
+    main()
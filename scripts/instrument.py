@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Shared run instrumentation for the data scripts.
+
+A script calls add_instrument_args(ap) and start(args, "<script>") at the
+top of main(). Code anywhere in the run can then use
+
+  with stage("fetch"): ...        named timer (calls + seconds, summed)
+  @timed("extract_refs")          the same as a decorator
+  count("cache_hits", n)          named counter
+
+These are no-ops costing one global lookup when no run is active (the
+script was imported, or run without any of the flags below).
+
+Flags:
+  --profile [PATH]     cProfile the run; dump stats to PATH (.prof) and print the top functions
+  --trace-mem          tracemalloc peak per top-level stage on the main thread, plus the run's peak
+  --run-report [PATH]  write a JSON report of stage timings, counters and memory
+
+PATH defaults to .cache/runs/<script>-<timestamp>.{prof,json}. The report
+(and a stage table on stderr) is written when the process exits, including
+after an error, so a failed build still leaves its timings behind.
+Work done in process-pool workers isn't seen by the parent's timers.
+"""
+
+import argparse, atexit, cProfile, io, platform, pstats, sys, threading, time, tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+from typing import Dict, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+RUNS_DIR = REPO_ROOT / ".cache" / "runs"
+AUTO = "auto"
+
+class Run:
+    def __init__(self, name: str, profile: Optional[str], trace_mem: bool, report: Optional[str]):
+        self.name = name
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.profile_path = RUNS_DIR / f"{name}-{stamp}.prof" if profile == AUTO else profile and Path(profile)
+        self.report_path = RUNS_DIR / f"{name}-{stamp}.json" if report == AUTO else report and Path(report)
+        self.trace_mem = trace_mem
+        self.started = datetime.now(timezone.utc)
+        self.t0 = time.perf_counter()
+        self.stages: Dict[str, dict] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._depth = threading.local()
+        self._profiler = None
+        self._peak = 0  # stage measurements reset tracemalloc's peak, so keep the max here
+        self._finished = False
+        if trace_mem:
+            tracemalloc.start()
+        if self.profile_path:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    @contextmanager
+    def stage(self, name: str):
+        depth = getattr(self._depth, "n", 0)
+        self._depth.n = depth + 1
+        # peaks are process-wide, so only measure non-overlapping stages
+        measure = self.trace_mem and depth == 0 and threading.current_thread() is threading.main_thread()
+        if measure:
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - t0
+            self._depth.n = depth
+            peak = tracemalloc.get_traced_memory()[1] if measure else None
+            with self._lock:
+                rec = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0})
+                rec["calls"] += 1
+                rec["seconds"] += seconds
+                if peak is not None:
+                    rec["peak_bytes"] = max(rec.get("peak_bytes", 0), peak)
+                    self._peak = max(self._peak, peak)
+
+    def count(self, name: str, n: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def finish(self):
+        if self._finished:
+            return
+        self._finished = True
+        wall = time.perf_counter() - self.t0
+        if self._profiler:
+            self._profiler.disable()
+        report = {
+            "script": self.name,
+            "argv": sys.argv[1:],
+            "started": self.started.isoformat(),
+            "wall_seconds": round(wall, 4),
+            "python": platform.python_version(),
+            "stages": {k: {**v, "seconds": round(v["seconds"], 4)} for k, v in self.stages.items()},
+            "counters": self.counters,
+        }
+        if self.trace_mem:
+            report["peak_bytes"] = max(self._peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        print(f"\n[{self.name}] {wall:.2f}s wall", file=sys.stderr)
+        for k, v in sorted(self.stages.items(), key=lambda kv: -kv[1]["seconds"]):
+            mem = f"  peak {v['peak_bytes'] / 2**20:8.1f} MiB" if "peak_bytes" in v else ""
+            print(f"  {k:<24} {v['calls']:>8} calls {v['seconds']:9.3f}s{mem}", file=sys.stderr)
+        for k, v in sorted(self.counters.items()):
+            print(f"  {k:<24} {v:>8g}", file=sys.stderr)
+        if self.trace_mem:
+            print(f"  peak traced memory {report['peak_bytes'] / 2**20:.1f} MiB", file=sys.stderr)
+
+        if self._profiler:
+            self.profile_path.parent.mkdir(parents=True, exist_ok=True)
+            self._profiler.dump_stats(str(self.profile_path))
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(15)
+            print(out.getvalue(), file=sys.stderr)
+            print(f"  profile -> {self.profile_path}", file=sys.stderr)
+            report["profile"] = str(self.profile_path)
+        if self.report_path:
+            from json_output import write_json
+            write_json(self.report_path, report, compress=False, quiet=True)
+            print(f"  run report -> {self.report_path}", file=sys.stderr)
+
+_active: Optional[Run] = None
+
+def add_instrument_args(ap: argparse.ArgumentParser):
+    g = ap.add_argument_group("instrumentation")
+    g.add_argument("--profile", nargs="?", const=AUTO, metavar="PATH", help="cProfile the run and dump stats")
+    g.add_argument("--trace-mem", action="store_true", help="track tracemalloc peak per stage")
+    g.add_argument("--run-report", nargs="?", const=AUTO, metavar="PATH", help="write a JSON report of stage timings and counters")
+
+def start(args, name: str) -> Optional[Run]:
+    """Begin instrumenting this process if any instrumentation flag was given."""
+    global _active
+    if not (args.profile or args.trace_mem or args.run_report):
+        return None
+    _active = Run(name, args.profile, args.trace_mem, args.run_report)
+    atexit.register(_active.finish)
+    return _active
+
+@contextmanager
+def stage(name: str):
+    run = _active
+    if run is None:
+        yield
+    else:
+        with run.stage(name):
+            yield
+
+def count(name: str, n: float = 1):
+    run = _active
+    if run is not None:
+        run.count(name, n)
+
+def timed(name: str):
+    def wrap(fn):
+        @wraps(fn)
+        def inner(*a, **kw):
+            run = _active
+            if run is None:
+                return fn(*a, **kw)
+            with run.stage(name):
+                return fn(*a, **kw)
+        return inner
+    return wrap
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Join clue text into the puzzle files at build time, so the app never has
+to look clues up while serving a request.
+
+Every clues-{YEAR}.json is read once into one index keyed by the
+normalized word (strip + upper). Each puzzle record then gets its "clue"
+from that index: the clue from its own year's file if there is one,
+otherwise the clue from the latest other year. A clue already embedded in a
+record is kept unless --overwrite is given.
+
+Puzzle files (in --data-dir):
+  puzzles-{YEAR}.json       {date: {"word", ...}}           build_daily_puzzles.py
+  puzzles{N}-{YEAR}.json    [{"date", "word"}, ...]         build_puzzles_from_clues.py
+Each file is rewritten in its own shape, and only if something changed.
+
+The report (stdout summary; full JSON with --report) lists
+  missing      puzzle days that still have no clue
+  orphaned     clue words no puzzle file schedules
+  conflicts    words whose keys normalize to the same word within one clues file
+               but carry different text (the later key wins)
+
+Usage:
+  python3 scripts/join_clues.py
+  python3 scripts/join_clues.py --dry-run --report /tmp/clue-join.json
+  python3 scripts/join_clues.py --overwrite --strict
+"""
+
+import argparse, json, re, sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import instrument
+from json_output import add_output_args, output_options, write_json, write_json_array
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "lib" / "data"
+CLUES_FILE_RE = re.compile(r"^clues-(\d{4})\.json$")
+PUZZLE_FILE_RE = re.compile(r"^puzzles(?:-|\d-)(\d{4})\.json$")
+
+def normalize(word) -> str:
+    return str(word or "").strip().upper()
+
+def build_clue_index(data_dir: Path) -> Tuple[Dict[str, Dict[int, str]], List[dict]]:
+    """WORD -> {year: clue} over every clues-{YEAR}.json, plus in-file normalization conflicts."""
+    index: Dict[str, Dict[int, str]] = {}
+    conflicts = []
+    for p in sorted(data_dir.glob("clues-*.json")):
+        m = CLUES_FILE_RE.match(p.name)
+        if not m:
+            continue
+        year = int(m.group(1))
+        for key, clue in json.loads(p.read_text(encoding="utf-8")).items():
+            word, clue = normalize(key), str(clue or "").strip()
+            if not word or not clue:
+                continue
+            by_year = index.setdefault(word, {})
+            if year in by_year and by_year[year] != clue:
+                conflicts.append({"file": p.name, "word": word, "kept": clue, "dropped": by_year[year]})
+            by_year[year] = clue
+    return index, conflicts
+
+def clue_for(index: Dict[str, Dict[int, str]], word: str, year: int) -> Optional[str]:
+    by_year = index.get(word)
+    if not by_year:
+        return None
+    return by_year.get(year) or by_year[max(by_year)]
+
+def puzzle_files(data_dir: Path) -> List[Tuple[Path, int]]:
+    out = []
+    for p in sorted(data_dir.glob("puzzles*.json")):
+        m = PUZZLE_FILE_RE.match(p.name)
+        if m:
+            out.append((p, int(m.group(1))))
+    return out
+
+def join_records(records: List[Tuple[str, dict]], index: Dict[str, Dict[int, str]], year: int,
+                 overwrite: bool) -> Tuple[int, List[Tuple[str, str]], set]:
+    """Fill rec["clue"] in place; returns (records changed, [(date, word)] still missing, words seen)."""
+    changed, missing, seen = 0, [], set()
+    for date, rec in records:
+        word = normalize(rec.get("word"))
+        seen.add(word)
+        current = str(rec.get("clue") or "").strip()
+        clue = clue_for(index, word, year)
+        if clue and (overwrite or not current) and clue != rec.get("clue"):
+            rec["clue"] = clue
+            changed += 1
+        elif not current and not clue:
+            missing.append((date, word))
+    return changed, missing, seen
+
+def main():
+    ap = argparse.ArgumentParser(description="Embed clues-{YEAR}.json text into the puzzle files.")
+    ap.add_argument("--data-dir", default=str(DATA_DIR), help="where puzzles and clues files live (default lib/data)")
+    ap.add_argument("--overwrite", action="store_true", help="replace clues already embedded in puzzle records")
+    ap.add_argument("--dry-run", action="store_true", help="report only; don't rewrite puzzle files")
+    ap.add_argument("--report", help="write the full JSON report here")
+    ap.add_argument("--strict", action="store_true", help="exit 1 if any puzzle is left without a clue")
+    add_output_args(ap)
+    instrument.add_instrument_args(ap)
+    args = ap.parse_args()
+    instrument.start(args, "join_clues")
+
+    data_dir = Path(args.data_dir)
+    with instrument.stage("index"):
+        index, conflicts = build_clue_index(data_dir)
+
+    files, missing = [], []
+    scheduled = set()
+    with instrument.stage("join"):
+        for path, year in puzzle_files(data_dir):
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if isinstance(data, dict):
+                for ds, rec in data.items():
+                    if not isinstance(rec, dict):
+                        data[ds] = {"word": rec}
+                records = list(data.items())
+            else:
+                records = [(rec.get("date", ""), rec) for rec in data if isinstance(rec, dict)]
+            changed, gaps, seen = join_records(records, index, year, args.overwrite)
+            scheduled |= seen
+            missing += [{"file": path.name, "date": ds, "word": w} for ds, w in gaps]
+            files.append({"file": path.name, "puzzles": len(records), "clues_added": changed, "missing": len(gaps)})
+            if changed and not args.dry_run:
+                with instrument.stage("write"):
+                    if isinstance(data, dict):
+                        write_json(path, data, quiet=True, **output_options(args))
+                    else:
+                        write_json_array(path, data, quiet=True, **output_options(args))
+
+    orphaned = sorted(w for w in index if w not in scheduled)
+    report = {
+        "files": files,
+        "counts": {"clue_words": len(index), "missing": len(missing), "orphaned": len(orphaned),
+                   "conflicts": len(conflicts)},
+        "missing": missing,
+        "orphaned": orphaned,
+        "conflicts": conflicts,
+    }
+    instrument.count("clues_added", sum(f["clues_added"] for f in files))
+    for f in files:
+        print(f"{f['file']}: {f['puzzles']} puzzles, {f['clues_added']} clues added, {f['missing']} missing"
+              + (" (dry run)" if args.dry_run and f["clues_added"] else ""))
+    print(f"Clue index: {len(index)} words | missing {len(missing)} | orphaned {len(orphaned)} | "
+          f"conflicts {len(conflicts)}")
+    if args.report:
+        write_json(args.report, report, compress=False, quiet=True)
+        print(f"Report -> {args.report}")
+    sys.exit(1 if args.strict and missing else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+One output path for every JSON file the build scripts write.
+
+write_json() encodes with JSONEncoder.iterencode in buffered chunks, so the
+whole document never exists as one string. Each chunk goes to a temp file
+and to streaming gzip / brotli compressors at the same time. The results
+are fsynced and renamed into place, sidecars first, so a crash never leaves
+a truncated file where Next.js reads it.
+
+  path.json      indent=2 by default, or minified (--minify)
+  path.json.gz   gzip -9 sidecar
+  path.json.br   brotli sidecar (needs the optional `brotli` package; skipped
+                 with a warning when it isn't installed)
+
+With --no-compress the sidecars aren't written and any stale ones are
+removed, so a server never prefers old pre-compressed bytes.
+
+write_json_array() does the same for a list produced lazily by an iterator.
+
+Scripts call add_output_args(ap) and pass output_options(args) through.
+"""
+
+import argparse, json, os, sys, zlib
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+CHUNK = 1 << 16
+SIDECARS = ("gz", "br")
+
+_warned_brotli = False
+
+def _brotli():
+    global _warned_brotli
+    try:
+        import brotli
+        return brotli
+    except ImportError:
+        if not _warned_brotli:
+            print("[json] brotli not installed; skipping .br sidecars (pip install brotli)", file=sys.stderr)
+            _warned_brotli = True
+        return None
+
+class _Sink:
+    """Temp file plus optional compressed temp files, committed together."""
+
+    def __init__(self, path: Path, sidecars: Sequence[str]):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.raw_bytes = 0
+        self.outputs = []  # (extension or None, final path, temp file, compress, finish)
+        self._open(None, None, None)
+        if "gz" in sidecars:
+            gz = zlib.compressobj(9, zlib.DEFLATED, 31)
+            self._open("gz", gz.compress, gz.flush)
+        if "br" in sidecars:
+            brotli = _brotli()
+            if brotli is not None:
+                br = brotli.Compressor(quality=11)
+                self._open("br", br.process, br.finish)
+
+    def _open(self, ext: Optional[str], compress, finish):
+        final = self.path.with_name(f"{self.path.name}.{ext}") if ext else self.path
+        tmp = final.with_name(f".{final.name}.tmp")
+        self.outputs.append((ext, final, tmp.open("wb"), compress, finish))
+
+    def write(self, data: bytes):
+        self.raw_bytes += len(data)
+        for _, _, f, compress, _ in self.outputs:
+            f.write(compress(data) if compress else data)
+
+    def commit(self) -> dict:
+        stats = {"path": str(self.path), "bytes": self.raw_bytes}
+        for _, _, f, _, finish in self.outputs:
+            if finish:
+                f.write(finish())
+            f.flush()
+            os.fsync(f.fileno())
+            f.close()
+        # sidecars first: the plain file appearing is the signal the set is complete
+        for ext, final, f, _, _ in reversed(self.outputs):
+            os.replace(f.name, final)
+            if ext:
+                stats[ext] = final.stat().st_size
+        for ext in SIDECARS:
+            if ext not in stats:
+                self.path.with_name(f"{self.path.name}.{ext}").unlink(missing_ok=True)
+        return stats
+
+    def abort(self):
+        for _, _, f, _, _ in self.outputs:
+            f.close()
+            Path(f.name).unlink(missing_ok=True)
+
+def _encoder(minify: bool, ensure_ascii: bool) -> json.JSONEncoder:
+    if minify:
+        return json.JSONEncoder(ensure_ascii=ensure_ascii, separators=(",", ":"))
+    return json.JSONEncoder(ensure_ascii=ensure_ascii, indent=2)
+
+def _pump(sink: _Sink, pieces: Iterable[str]):
+    buf: List[str] = []
+    size = 0
+    for piece in pieces:
+        buf.append(piece)
+        size += len(piece)
+        if size >= CHUNK:
+            sink.write("".join(buf).encode("utf-8"))
+            buf, size = [], 0
+    if buf:
+        sink.write("".join(buf).encode("utf-8"))
+
+def _finish(sink: _Sink, pieces: Iterable[str], quiet: bool) -> dict:
+    try:
+        _pump(sink, pieces)
+        stats = sink.commit()
+    except BaseException:
+        sink.abort()
+        raise
+    if not quiet:
+        print(f"[json] {describe(stats)}", file=sys.stderr)
+    return stats
+
+def describe(stats: dict) -> str:
+    parts = [f"{stats['path']}: {stats['bytes']:,} B"]
+    for ext in SIDECARS:
+        if ext in stats:
+            parts.append(f"{ext} {stats[ext]:,} B ({stats[ext] / max(stats['bytes'], 1):.0%})")
+    return ", ".join(parts)
+
+def write_json(path, obj, minify: bool = False, compress: bool = True, ensure_ascii: bool = False,
+               quiet: bool = False) -> dict:
+    """Atomically write `obj` as JSON (+ sidecars); returns {"path", "bytes", "gz"?, "br"?}."""
+    sink = _Sink(Path(path), SIDECARS if compress else ())
+    pieces = _encoder(minify, ensure_ascii).iterencode(obj)
+    return _finish(sink, _with_newline(pieces, minify), quiet)
+
+def write_json_array(path, items: Iterable, minify: bool = False, compress: bool = True,
+                     ensure_ascii: bool = False, quiet: bool = False) -> dict:
+    """Like write_json for a list whose items come from an iterator; one item per line unless minified."""
+    sink = _Sink(Path(path), SIDECARS if compress else ())
+    enc = json.JSONEncoder(ensure_ascii=ensure_ascii, separators=(",", ":") if minify else None)
+
+    def pieces() -> Iterator[str]:
+        first = True
+        yield "["
+        for item in items:
+            if minify:
+                yield ("" if first else ",") + enc.encode(item)
+            else:
+                yield ("\n  " if first else ",\n  ") + enc.encode(item)
+            first = False
+        yield "]" if minify else "]\n" if first else "\n]\n"
+
+    return _finish(sink, pieces(), quiet)
+
+def _with_newline(pieces: Iterable[str], minify: bool) -> Iterator[str]:
+    yield from pieces
+    if not minify:
+        yield "\n"
+
+def add_output_args(ap: argparse.ArgumentParser):
+    ap.add_argument("--minify", action="store_true", help="write compact JSON (no indentation)")
+    ap.add_argument("--no-compress", action="store_true", help="don't write .gz/.br sidecars (removes stale ones)")
+
+def output_options(args) -> dict:
+    return {"minify": args.minify, "compress": not args.no_compress}
+
+def main():
+    ap = argparse.ArgumentParser(description="Rewrite existing JSON files through the shared writer.")
+    ap.add_argument("files", nargs="+", help="JSON files to rewrite in place")
+    add_output_args(ap)
+    args = ap.parse_args()
+    for name in args.files:
+        p = Path(name)
+        write_json(p, json.loads(p.read_text(encoding="utf-8")), **output_options(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Local, offline definitions source: import a JSONL dictionary dump into SQLite
+once, then resolve any number of words in one query.
+
+Accepted dump lines (one JSON object per line; other keys are ignored):
+  Wiktionary / kaikki.org extract:
+    {"word": "abandon", "pos": "verb", "lang": "English",
+     "senses": [{"glosses": ["To give up ..."], "examples": [{"text": "..."}]}]}
+  Flat:
+    {"word": "abandon", "pos": "verb", "definitions": ["..."], "examples": ["..."]}
+Each line becomes one part-of-speech block. Lines with a "lang" other than
+--lang are skipped.
+
+Database (--db, default .cache/definitions.sqlite3):
+  entries(id, word, pos, definitions, examples)   definitions/examples are JSON arrays;
+                                                  word is lowercased and indexed
+  entries_fts                                     FTS5 over word + definition text
+                                                  (skipped if SQLite lacks FTS5)
+  meta(key, value)                                dump path, size, entry count, import time
+The import writes to a temp file and renames it into place, so readers never
+see a half-built database.
+
+lookup_many() returns blocks shaped exactly like
+build_word_definitions_full.to_structured: [{"partOfSpeech", "definitions", "examples"}],
+with dictionaryapi.dev part-of-speech names (adj -> adjective, ...).
+
+Usage:
+  python3 scripts/local_definitions.py --import data/kaikki-english.jsonl
+  python3 scripts/local_definitions.py --lookup ABANDON BEGAT
+  python3 scripts/local_definitions.py --search "shepherd flock" --limit 10
+  python3 scripts/build_word_definitions_full.py --puzzles lib/data/puzzles-2026.json --out /tmp/defs.json --source local
+"""
+
+import argparse, json, os, sqlite3, sys, time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import instrument
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB = REPO_ROOT / ".cache" / "definitions.sqlite3"
+
+# kaikki / Wiktionary part-of-speech tags -> the names dictionaryapi.dev uses
+POS_NAMES = {
+    "adj": "adjective", "adv": "adverb", "prep": "preposition", "conj": "conjunction",
+    "intj": "interjection", "pron": "pronoun", "num": "numeral", "det": "determiner",
+    "name": "proper noun", "article": "article", "particle": "particle",
+}
+
+SCHEMA = """
+CREATE TABLE entries (
+  id INTEGER PRIMARY KEY,
+  word TEXT NOT NULL,
+  pos TEXT NOT NULL,
+  definitions TEXT NOT NULL,
+  examples TEXT NOT NULL
+);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+def has_fts5(db: sqlite3.Connection) -> bool:
+    try:
+        db.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        db.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+def _strings(items) -> List[str]:
+    out = []
+    for it in items or []:
+        txt = it.get("text") if isinstance(it, dict) else it
+        txt = str(txt or "").strip()
+        if txt:
+            out.append(txt)
+    return out
+
+def parse_line(line: str, lang: Optional[str]) -> Optional[Tuple[str, str, List[str], List[str]]]:
+    """(word, pos, definitions, examples) from one dump line, or None to skip it."""
+    try:
+        obj = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(obj, dict):
+        return None
+    if lang and obj.get("lang") not in (None, lang):
+        return None
+    word = str(obj.get("word") or "").strip().lower()
+    if not word:
+        return None
+    pos = str(obj.get("pos") or obj.get("partOfSpeech") or "").strip().lower()
+    pos = POS_NAMES.get(pos, pos)
+    if "senses" in obj:
+        defs, exs = [], []
+        for sense in obj.get("senses") or []:
+            if isinstance(sense, dict):
+                defs += _strings(sense.get("glosses"))
+                exs += _strings(sense.get("examples"))
+    else:
+        defs, exs = _strings(obj.get("definitions")), _strings(obj.get("examples"))
+    if not defs:
+        return None
+    return word, pos, defs, exs
+
+def read_dump(path: Path, lang: Optional[str]) -> Iterator[Tuple[str, str, str, str]]:
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            rec = parse_line(line, lang)
+            if rec:
+                word, pos, defs, exs = rec
+                yield word, pos, json.dumps(defs, ensure_ascii=False), json.dumps(exs, ensure_ascii=False)
+
+def import_dump(dump: Path, db_path: Path, lang: Optional[str] = "English") -> dict:
+    """Build db_path from a JSONL dump; returns the meta row."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = db_path.with_name(db_path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    db = sqlite3.connect(str(tmp))
+    try:
+        db.execute("PRAGMA journal_mode=OFF")
+        db.execute("PRAGMA synchronous=OFF")
+        db.executescript(SCHEMA)
+        with db:
+            db.executemany("INSERT INTO entries (word, pos, definitions, examples) VALUES (?, ?, ?, ?)",
+                           read_dump(dump, lang))
+        # index after the bulk insert: one sort instead of a b-tree update per row
+        db.execute("CREATE INDEX entries_word ON entries (word)")
+        fts = has_fts5(db)
+        if fts:
+            db.execute("CREATE VIRTUAL TABLE entries_fts USING fts5("
+                       "word, definitions, content='entries', content_rowid='id')")
+            db.execute("INSERT INTO entries_fts (entries_fts) VALUES ('rebuild')")
+        else:
+            print("[local] SQLite was built without FTS5; --search will be unavailable", file=sys.stderr)
+        count = db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        meta = {
+            "dump": str(dump), "dump_bytes": str(dump.stat().st_size), "lang": lang or "",
+            "entries": str(count), "fts5": "1" if fts else "0",
+            "imported": datetime.now(timezone.utc).isoformat(),
+        }
+        with db:
+            db.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", meta.items())
+        db.execute("ANALYZE")
+        db.close()
+    except BaseException:
+        db.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, db_path)
+    return meta
+
+class LocalDefinitions:
+    """Read-only view of an imported database."""
+
+    def __init__(self, db_path: Path = DEFAULT_DB):
+        if not Path(db_path).exists():
+            raise FileNotFoundError(f"{db_path} not found; build it with: python3 scripts/local_definitions.py --import DUMP.jsonl")
+        self.db = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        self.meta = dict(self.db.execute("SELECT key, value FROM meta"))
+
+    def lookup_many(self, words: Iterable[str]) -> Dict[str, List[dict]]:
+        """{WORD: structured blocks} for every word found; one query for the whole batch."""
+        keys = sorted({w.strip().lower() for w in words if w and w.strip()})
+        out: Dict[str, List[dict]] = {}
+        rows = self.db.execute(
+            "SELECT e.word, e.pos, e.definitions, e.examples FROM entries e"
+            " WHERE e.word IN (SELECT value FROM json_each(?)) ORDER BY e.id",
+            (json.dumps(keys),))
+        for word, pos, defs, exs in rows:
+            out.setdefault(word.upper(), []).append(
+                {"partOfSpeech": pos, "definitions": json.loads(defs), "examples": json.loads(exs)})
+        return out
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[str, str, str]]:
+        """
+        (word, pos, first definition) for FTS5 matches, best first. Raises
+        ValueError if `query` isn't valid FTS5 syntax (e.g. an unbalanced quote).
+        """
+        if self.meta.get("fts5") != "1":
+            raise RuntimeError("this database was built without FTS5")
+        try:
+            rows = self.db.execute(
+                "SELECT e.word, e.pos, e.definitions FROM entries_fts f JOIN entries e ON e.id = f.rowid"
+                " WHERE entries_fts MATCH ? ORDER BY rank LIMIT ?", (query, limit)).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"invalid FTS5 query {query!r}: {e}") from None
+        return [(w, p, json.loads(d)[0]) for w, p, d in rows]
+
+    def close(self):
+        self.db.close()
+
+def main():
+    ap = argparse.ArgumentParser(description="Import a JSONL dictionary dump into SQLite and query it offline.")
+    ap.add_argument("--db", default=str(DEFAULT_DB), help="database path (default .cache/definitions.sqlite3)")
+    ap.add_argument("--import", dest="dump", metavar="DUMP", help="JSONL dump to (re)build the database from")
+    ap.add_argument("--lang", default="English", help='keep only lines with this "lang" (default English; "" keeps all)')
+    ap.add_argument("--lookup", nargs="+", metavar="WORD", help="print the structured definitions for these words")
+    ap.add_argument("--search", metavar="QUERY", help="FTS5 query over words and definitions")
+    ap.add_argument("--limit", type=int, default=20, help="rows for --search")
+    instrument.add_instrument_args(ap)
+    args = ap.parse_args()
+    instrument.start(args, "local_definitions")
+
+    db_path = Path(args.db)
+    if args.dump:
+        t0 = time.perf_counter()
+        with instrument.stage("import"):
+            meta = import_dump(Path(args.dump), db_path, args.lang or None)
+        instrument.count("entries", int(meta["entries"]))
+        print(f"Imported {int(meta['entries']):,} entries from {args.dump} in {time.perf_counter() - t0:.1f}s "
+              f"({db_path.stat().st_size / 2**20:.1f} MiB, fts5={'yes' if meta['fts5'] == '1' else 'no'}) -> {db_path}")
+    if args.lookup or args.search:
+        local = LocalDefinitions(db_path)
+        if args.lookup:
+            found = local.lookup_many(args.lookup)
+            for w in args.lookup:
+                print(json.dumps({w.upper(): found.get(w.upper(), [])}, ensure_ascii=False, indent=2))
+        if args.search:
+            try:
+                hits = local.search(args.search, args.limit)
+            except ValueError as e:
+                local.close()
+                sys.exit(f"--search: {e}")
+            for word, pos, first in hits:
+                print(f"{word} ({pos}): {first}")
+        local.close()
+    if not (args.dump or args.lookup or args.search):
+        ap.error("nothing to do: give --import, --lookup or --search")
+
+if __name__ == "__main__":
+    main()
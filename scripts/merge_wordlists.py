@@ -2,6 +2,9 @@
 import argparse, json, re
 from pathlib import Path
 
+import instrument
+from json_output import add_output_args, output_options, write_json
+
 ALPHA57 = re.compile(r"^[A-Z]{5,7}$")
 
 def load_words(p: Path):
@@ -23,10 +26,14 @@ def main():
     ap.add_argument("--base",  required=True)  # STRICT_top1000.json
     ap.add_argument("--extra", required=True)  # STRICT.json
     ap.add_argument("--out",   default="lib/data/biblical_words_final.json")
+    add_output_args(ap)
+    instrument.add_instrument_args(ap)
     args = ap.parse_args()
+    instrument.start(args, "merge_wordlists")
 
-    base  = load_words(Path(args.base))
-    extra = load_words(Path(args.extra))
+    with instrument.stage("load"):
+        base  = load_words(Path(args.base))
+        extra = load_words(Path(args.extra))
 
     base_set = set(base)
     additions = [w for w in extra if w not in base_set]
@@ -34,8 +41,8 @@ def main():
     merged = base + additions
 
     out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(merged, ensure_ascii=False, indent=2), encoding="utf-8")
+    with instrument.stage("write"):
+        write_json(out_path, merged, **output_options(args))
 
     print(f"Base: {len(base)}")
     print(f"Extras considered: {len(extra)}")
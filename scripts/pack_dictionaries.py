@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Pack lib/data/dictionary{5,6,7}.json into sorted fixed-width binary files and
+check membership by binary search, without parsing JSON or building a set.
+
+Encodings:
+  ascii  N bytes per word, uppercase A-Z                    (dictionary{N}.bin)
+  5bit   letters as 5-bit codes (A=0 .. Z=25), big-endian,  (dictionary{N}.5bit.bin)
+         packed into ceil(5N/8) bytes: 4 bytes for 5-6 letters, 5 for 7
+
+Both keep byte order == alphabetical order, so each record read as a
+big-endian integer sorts like the word and one bisect answers membership.
+
+File layout: 12-byte header (magic "WDIC", version, encoding, word length,
+record width, word count) followed by the sorted records.
+
+Usage:
+  python3 scripts/pack_dictionaries.py
+  python3 scripts/pack_dictionaries.py --encoding 5bit --lengths 7
+  python3 scripts/pack_dictionaries.py --bench
+"""
+
+import argparse, json, os, random, re, struct, time
+from pathlib import Path
+from typing import Iterable, List
+
+import instrument
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "lib" / "data"
+
+MAGIC = b"WDIC"
+FORMAT_VERSION = 1
+HEADER = struct.Struct(">4sBBBBI")  # magic, version, encoding, word length, record width, count
+ENCODINGS = {"ascii": 0, "5bit": 1}
+WORD_RE = re.compile(r"^[A-Z]+$")
+
+def record_width(length: int, encoding: str) -> int:
+    return length if encoding == "ascii" else (5 * length + 7) // 8
+
+def encode_word(word: str, encoding: str) -> int:
+    """The word's record as an integer; records compare in alphabetical order."""
+    if encoding == "ascii":
+        return int.from_bytes(word.encode("ascii"), "big")
+    code = 0
+    for ch in word:
+        code = (code << 5) | (ord(ch) - 65)
+    return code
+
+def decode_record(value: int, length: int, encoding: str) -> str:
+    if encoding == "ascii":
+        return value.to_bytes(length, "big").decode("ascii")
+    letters = []
+    for _ in range(length):
+        letters.append(chr(65 + (value & 31)))
+        value >>= 5
+    return "".join(reversed(letters))
+
+def normalize(words: Iterable, length: int) -> List[str]:
+    """Uppercased, de-duplicated, sorted N-letter A-Z words (others dropped)."""
+    return sorted({s for s in (str(w).strip().upper() for w in words)
+                   if len(s) == length and WORD_RE.match(s)})
+
+def pack_words(words: List[str], length: int, encoding: str) -> bytes:
+    width = record_width(length, encoding)
+    out = bytearray(HEADER.pack(MAGIC, FORMAT_VERSION, ENCODINGS[encoding], length, width, len(words)))
+    for w in words:
+        out += encode_word(w, encoding).to_bytes(width, "big")
+    return bytes(out)
+
+class PackedDictionary:
+    """Membership over a packed dictionary file via bisect on a memoryview."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._view = memoryview(path.read_bytes())
+        magic, version, enc, length, width, count = HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} packed dictionary")
+        self.encoding = next(k for k, v in ENCODINGS.items() if v == enc)
+        self.length, self.width, self.count = length, width, count
+        self._records = self._view[HEADER.size:HEADER.size + width * count]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _at(self, i: int) -> int:
+        w = self.width
+        return int.from_bytes(self._records[i * w:(i + 1) * w], "big")
+
+    def __contains__(self, word: str) -> bool:
+        word = word.strip().upper()
+        if len(word) != self.length or not WORD_RE.match(word):
+            return False
+        key = encode_word(word, self.encoding)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo < self.count and self._at(lo) == key
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield decode_record(self._at(i), self.length, self.encoding)
+
+def packed_path(outdir: Path, length: int, encoding: str) -> Path:
+    suffix = ".bin" if encoding == "ascii" else ".5bit.bin"
+    return outdir / f"dictionary{length}{suffix}"
+
+def bench(json_path: Path, bin_path: Path, words: List[str], queries: int, seed: int):
+    """Cold load + lookups: JSON parse + set build versus packed bisect."""
+    rng = random.Random(seed)
+    sample = [rng.choice(words) for _ in range(queries // 2)]
+    sample += ["".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in w) for w in sample]
+
+    t0 = time.perf_counter()
+    as_set = {str(w).upper() for w in json.loads(json_path.read_text(encoding="utf-8"))}
+    t_json_load = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    hits_json = sum(q in as_set for q in sample)
+    t_json_q = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    packed = PackedDictionary(bin_path)
+    t_bin_load = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    hits_bin = sum(q in packed for q in sample)
+    t_bin_q = time.perf_counter() - t0
+
+    assert hits_json == hits_bin, f"membership mismatch: json {hits_json} vs packed {hits_bin}"
+    print(f"  {bin_path.name}: {json_path.stat().st_size:,} B json -> {bin_path.stat().st_size:,} B packed")
+    print(f"    load    json+set {t_json_load * 1e3:7.2f} ms | packed {t_bin_load * 1e3:7.2f} ms")
+    print(f"    lookup  json+set {t_json_q / len(sample) * 1e6:7.2f} us | packed {t_bin_q / len(sample) * 1e6:7.2f} us"
+          f"  ({len(sample)} queries, {hits_bin} hits)")
+
+def main():
+    ap = argparse.ArgumentParser(description="Pack dictionary JSON files into sorted fixed-width binary files.")
+    ap.add_argument("--lengths", nargs="+", type=int, default=[5, 6, 7], help="word lengths to pack (default 5 6 7)")
+    ap.add_argument("--encoding", choices=sorted(ENCODINGS), default="ascii", help="record encoding (default ascii)")
+    ap.add_argument("--data-dir", default=str(DATA_DIR), help="where dictionary{N}.json live (default lib/data)")
+    ap.add_argument("--outdir", default=None, help="output directory (default: --data-dir)")
+    ap.add_argument("--bench", action="store_true", help="compare load + lookup cost against the JSON path")
+    ap.add_argument("--queries", type=int, default=20000, help="lookups per dictionary for --bench")
+    ap.add_argument("--seed", type=int, default=1)
+    instrument.add_instrument_args(ap)
+    args = ap.parse_args()
+    instrument.start(args, "pack_dictionaries")
+
+    data_dir = Path(args.data_dir)
+    outdir = Path(args.outdir or args.data_dir)
+    outdir.mkdir(parents=True, exist_ok=True)
+
+    for n in args.lengths:
+        src = data_dir / f"dictionary{n}.json"
+        with instrument.stage("load"):
+            words = normalize(json.loads(src.read_text(encoding="utf-8")), n)
+        out = packed_path(outdir, n, args.encoding)
+        with instrument.stage("pack"):
+            tmp = out.with_name(f".{out.name}.tmp")  # renamed into place so readers never see a partial file
+            tmp.write_bytes(pack_words(words, n, args.encoding))
+            os.replace(tmp, out)
+        instrument.count("words", len(words))
+        print(f"Wrote {len(words)} words ({out.stat().st_size:,} bytes, {args.encoding}) -> {out}")
+        if args.bench:
+            with instrument.stage("bench"):
+                bench(src, out, words, args.queries, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Build-once cache of the full guess x answer feedback matrix for each
+dictionary{N}.json, stored as .npy and opened with mmap_mode so solvers and
+hint tools start without recomputing it.
+
+Cache files live in --cache-dir (default .cache/patterns):
+  patterns{N}-{hash}.npy   rows = guesses, cols = answers, both in
+                           dictionary_words() order; uint8 for 5 letters,
+                           uint16 for 6-7 (feedback.code_dtype)
+{hash} is a content hash of the dictionary file, so editing the dictionary
+changes the file name: the next load rebuilds and removes the stale matrix.
+
+Rows are computed in blocks across a process pool; each worker writes its
+block straight into the memory-mapped output, which is renamed into place
+only once complete.
+
+Usage:
+  python3 scripts/pattern_cache.py
+  python3 scripts/pattern_cache.py --lengths 7 --workers 8 --rebuild
+"""
+
+import argparse, hashlib, json, os, re, time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+import instrument
+from feedback import code_dtype, encode_words, feedback_codes
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "lib" / "data"
+CACHE_DIR = REPO_ROOT / ".cache" / "patterns"
+
+WORD_RE = re.compile(r"^[A-Z]+$")
+
+def dictionary_words(path: Path, n: int) -> List[str]:
+    """Uppercased, de-duplicated, sorted N-letter words: the matrix row/column order."""
+    words = json.loads(path.read_text(encoding="utf-8"))
+    return sorted({s for s in (str(w).strip().upper() for w in words) if len(s) == n and WORD_RE.match(s)})
+
+def dictionary_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+
+def cache_path(cache_dir: Path, n: int, digest: str) -> Path:
+    return cache_dir / f"patterns{n}-{digest}.npy"
+
+_worker_words: Optional[np.ndarray] = None
+_worker_out: Optional[Path] = None
+
+def _init_worker(encoded: np.ndarray, out: Path):
+    global _worker_words, _worker_out
+    _worker_words, _worker_out = encoded, out
+
+def _fill_rows(bounds: Tuple[int, int]) -> int:
+    start, stop = bounds
+    out = np.load(_worker_out, mmap_mode="r+")
+    out[start:stop] = feedback_codes(_worker_words[start:stop], _worker_words)
+    out.flush()
+    del out
+    return stop - start
+
+def build_matrix(words: List[str], out: Path, workers: int, block: int) -> None:
+    encoded = encode_words(words)
+    tmp = out.with_name(out.name + ".tmp")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    mm = np.lib.format.open_memmap(tmp, mode="w+", dtype=code_dtype(encoded.shape[1]),
+                                   shape=(len(words), len(words)))
+    del mm  # header and size are on disk; workers map it themselves
+    bounds = [(s, min(s + block, len(words))) for s in range(0, len(words), block)]
+    if workers <= 1:
+        _init_worker(encoded, tmp)
+        for b in bounds:
+            _fill_rows(b)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(encoded, tmp)) as pool:
+            for _ in pool.map(_fill_rows, bounds):
+                pass
+    os.replace(tmp, out)
+
+def load_patterns(dict_path: Path, n: int, cache_dir: Path = CACHE_DIR, workers: int = os.cpu_count() or 1,
+                  block: int = 256, rebuild: bool = False) -> Tuple[List[str], np.ndarray]:
+    """(words, read-only memory-mapped matrix) for dictionary{N}, building it if the hash changed."""
+    words = dictionary_words(dict_path, n)
+    path = cache_path(cache_dir, n, dictionary_hash(dict_path))
+    if rebuild or not path.exists():
+        t0 = time.perf_counter()
+        with instrument.stage("build_matrix"):
+            build_matrix(words, path, workers, block)
+        instrument.count("matrices_built")
+        print(f"[patterns] built {path.name} ({len(words)}x{len(words)}) in {time.perf_counter() - t0:.2f}s")
+        for stale in cache_dir.glob(f"patterns{n}-*.npy"):
+            if stale != path:
+                stale.unlink()
+    matrix = np.load(path, mmap_mode="r")
+    if matrix.shape != (len(words), len(words)):
+        raise ValueError(f"{path} has shape {matrix.shape}, expected {len(words)}x{len(words)}; rerun with --rebuild")
+    return words, matrix
+
+def main():
+    ap = argparse.ArgumentParser(description="Build or refresh the cached guess x answer feedback matrices.")
+    ap.add_argument("--lengths", nargs="+", type=int, default=[5, 6, 7], help="dictionary lengths (default 5 6 7)")
+    ap.add_argument("--data-dir", default=str(DATA_DIR), help="where dictionary{N}.json live (default lib/data)")
+    ap.add_argument("--cache-dir", default=str(CACHE_DIR), help="matrix cache directory (default .cache/patterns)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="process pool size (1=serial)")
+    ap.add_argument("--block", type=int, default=256, help="guess rows per work unit")
+    ap.add_argument("--rebuild", action="store_true", help="rebuild even if the cached hash matches")
+    instrument.add_instrument_args(ap)
+    args = ap.parse_args()
+    instrument.start(args, "pattern_cache")
+
+    for n in args.lengths:
+        t0 = time.perf_counter()
+        words, matrix = load_patterns(Path(args.data_dir) / f"dictionary{n}.json", n, Path(args.cache_dir),
+                                      args.workers, args.block, args.rebuild)
+        print(f"[{n}] {len(words)} words, {matrix.dtype} matrix {matrix.nbytes / 2**20:.1f} MiB "
+              f"ready in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
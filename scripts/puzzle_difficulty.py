@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Score puzzle difficulty as the number of guesses an entropy-maximizing solver
+needs to find each puzzle word, guessing only dictionary{len}.json words.
+
+The solver starts from every dictionary word as a candidate, always plays the
+guess whose feedback splits the remaining candidates with the highest
+entropy (preferring a guess that could itself be the answer on ties), and
+filters candidates by the feedback (feedback.py, same rules as evaluateGuess).
+Feedback for the whole dictionary comes from the cached guess x answer
+matrix (pattern_cache.py, built on first use), and solver decisions are
+memoized per feedback history, so a year of puzzles shares most of its work.
+
+Output (--out, default lib/data/puzzle-difficulty.json):
+  {
+    "metadata": {...},
+    "words": { "SMEAR": { "len": 5, "guesses": 3, "within_max": true } },
+    "days":  { "2026-01-01": { "word": "SMEAR", "guesses": 3 } }
+  }
+The "words" map is what schedule builders read (load_word_difficulty).
+
+Usage:
+  python3 scripts/puzzle_difficulty.py
+  python3 scripts/puzzle_difficulty.py --years 2026 --all-words --out /tmp/difficulty.json
+  python3 scripts/puzzle_difficulty.py --no-cache          (compute the matrices in memory)
+"""
+
+import argparse, json, os, re, time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import instrument
+from json_output import add_output_args, output_options, write_json
+from feedback import encode_words, feedback_codes, pattern_matrix, win_code
+from pattern_cache import CACHE_DIR, dictionary_words, load_patterns
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "lib" / "data"
+
+LENGTHS = (5, 6, 7)
+MAX_GUESSES = 3  # GAME_CONFIG.MAX_GUESSES in lib/config.ts
+WORD_RE = re.compile(r"^[A-Z]+$")
+PUZZLE_FILE_RE = re.compile(r"^puzzles-(\d{4})\.json$")
+
+class EntropySolver:
+    """Greedy max-entropy solver over a square guess x answer pattern matrix."""
+
+    def __init__(self, words: List[str], patterns: np.ndarray):
+        self.words = words
+        self.patterns = patterns
+        self.win = win_code(len(words[0]))
+        self._choice: Dict[tuple, int] = {}
+
+    def best_guess(self, cands: np.ndarray) -> int:
+        if len(cands) <= 2:
+            return int(cands[0])
+        # H = log2(C) - sum(n log2 n) / C over each guess's feedback buckets;
+        # only the sum varies by guess. Bucket sizes are runs in the sorted row.
+        sub = np.sort(self.patterns[:, cands], axis=1)
+        starts = np.ones(sub.shape, dtype=bool)
+        starts[:, 1:] = sub[:, 1:] != sub[:, :-1]
+        flat = np.flatnonzero(starts.ravel())
+        sizes = np.diff(np.append(flat, sub.size)).astype(np.float64)
+        nlogn = np.bincount(flat // sub.shape[1], weights=sizes * np.log2(sizes), minlength=len(self.words))
+        best = nlogn.min()
+        tied = np.flatnonzero(nlogn <= best + 1e-9)
+        in_cands = np.intersect1d(tied, cands)
+        return int(in_cands[0] if len(in_cands) else tied[0])
+
+    def solve(self, answer: int, limit: int = 20) -> List[int]:
+        """Guess indices played until `answer` is found."""
+        cands = np.arange(len(self.words))
+        history: tuple = ()
+        played = []
+        while len(played) < limit:
+            guess = self._choice.get(history)
+            if guess is None:
+                guess = self._choice[history] = self.best_guess(cands)
+            played.append(guess)
+            code = int(self.patterns[guess, answer])
+            if code == self.win:
+                break
+            cands = cands[self.patterns[guess, cands] == code]
+            history += ((guess, code),)
+        return played
+
+def load_schedule(data_dir: Path, years: Optional[List[int]]) -> Dict[str, str]:
+    days: Dict[str, str] = {}
+    for p in sorted(data_dir.glob("puzzles-*.json")):
+        m = PUZZLE_FILE_RE.match(p.name)
+        if not m or (years and int(m.group(1)) not in years):
+            continue
+        for ds, rec in json.loads(p.read_text(encoding="utf-8")).items():
+            word = str((rec.get("word") if isinstance(rec, dict) else rec) or "").strip().upper()
+            if WORD_RE.match(word) and len(word) in LENGTHS:
+                days[ds] = word
+    return dict(sorted(days.items()))
+
+def load_word_difficulty(path: Path) -> Dict[str, int]:
+    """WORD -> solver guesses from a difficulty file, for the schedule builders."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {w: rec["guesses"] for w, rec in data.get("words", {}).items()}
+
+def extend_patterns(words: List[str], patterns: np.ndarray, extra: List[str]) -> np.ndarray:
+    """Add rows and columns for `extra` words to a cached dictionary matrix."""
+    if not extra:
+        return patterns
+    enc, enc_extra = encode_words(words), encode_words(extra)
+    vocab = np.concatenate([enc, enc_extra])
+    return np.block([[np.asarray(patterns), feedback_codes(enc, enc_extra)],
+                     [feedback_codes(enc_extra, vocab)]])
+
+def score_length(words: List[str], targets: List[str], max_guesses: int,
+                 patterns: Optional[np.ndarray] = None) -> Tuple[Dict[str, dict], dict]:
+    # puzzle words missing from the dictionary still need to be guessable
+    extra = sorted(set(targets) - set(words))
+    vocab = words + extra
+    t0 = time.perf_counter()
+    with instrument.stage("matrix"):
+        if patterns is None:
+            patterns = pattern_matrix(vocab)
+        else:
+            patterns = extend_patterns(words, patterns, extra)
+    solver = EntropySolver(vocab, patterns)
+    t_matrix = time.perf_counter() - t0
+    index = {w: i for i, w in enumerate(vocab)}
+    scored = {}
+    with instrument.stage("solve"):
+        for w in targets:
+            played = solver.solve(index[w])
+            scored[w] = {"len": len(w), "guesses": len(played), "within_max": len(played) <= max_guesses}
+            if w in extra:
+                scored[w]["in_dictionary"] = False
+    instrument.count("solver_decisions", len(solver._choice))
+    stats = {
+        "dictionary": len(words), "not_in_dictionary": extra, "scored": len(scored),
+        "opening": vocab[solver.best_guess(np.arange(len(vocab)))],
+        "mean_guesses": round(sum(r["guesses"] for r in scored.values()) / max(len(scored), 1), 3),
+        "matrix_seconds": round(t_matrix, 2), "total_seconds": round(time.perf_counter() - t0, 2),
+    }
+    return scored, stats
+
+def main():
+    ap = argparse.ArgumentParser(description="Score puzzle words by entropy-solver guess count.")
+    ap.add_argument("--data-dir", default=str(DATA_DIR), help="where dictionaries and puzzles-{YEAR}.json live")
+    ap.add_argument("--years", nargs="+", type=int, help="only these puzzle years (default: all)")
+    ap.add_argument("--all-words", action="store_true", help="score every dictionary word, not just scheduled ones")
+    ap.add_argument("--max-guesses", type=int, default=MAX_GUESSES, help=f"guess limit for within_max (default {MAX_GUESSES})")
+    ap.add_argument("--cache-dir", default=str(CACHE_DIR), help="pattern matrix cache (default .cache/patterns)")
+    ap.add_argument("--no-cache", action="store_true", help="compute the feedback matrices in memory instead")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes for building a missing matrix")
+    ap.add_argument("--out", default=None, help="output JSON (default: <data-dir>/puzzle-difficulty.json)")
+    add_output_args(ap)
+    instrument.add_instrument_args(ap)
+    args = ap.parse_args()
+    instrument.start(args, "puzzle_difficulty")
+
+    data_dir = Path(args.data_dir)
+    with instrument.stage("load_schedule"):
+        days = load_schedule(data_dir, args.years)
+    words_out: Dict[str, dict] = {}
+    per_length = {}
+    for n in LENGTHS:
+        dict_path = data_dir / f"dictionary{n}.json"
+        with instrument.stage("load_patterns"):
+            if args.no_cache:
+                words, patterns = dictionary_words(dict_path, n), None
+            else:
+                words, patterns = load_patterns(dict_path, n, Path(args.cache_dir), args.workers)
+        targets = sorted({w for w in days.values() if len(w) == n} | (set(words) if args.all_words else set()))
+        if not targets:
+            continue
+        scored, stats = score_length(words, targets, args.max_guesses, patterns)
+        words_out.update(scored)
+        per_length[str(n)] = stats
+        print(f"[{n}] {stats['scored']} words | opening {stats['opening']} | mean {stats['mean_guesses']} guesses | "
+              f"matrix {stats['matrix_seconds']}s, total {stats['total_seconds']}s")
+
+    out = {
+        "metadata": {
+            "generated": datetime.now(timezone.utc).isoformat(),
+            "solver": "max-entropy over dictionary{len}.json",
+            "max_guesses": args.max_guesses,
+            "lengths": per_length,
+        },
+        "words": dict(sorted(words_out.items())),
+        "days": {ds: {"word": w, "guesses": words_out[w]["guesses"]} for ds, w in days.items()},
+    }
+    out_path = Path(args.out or data_dir / "puzzle-difficulty.json")
+    with instrument.stage("write"):
+        write_json(out_path, out, **output_options(args))
+    hard = sum(1 for w in days.values() if not words_out[w]["within_max"])
+    print(f"Scored {len(days)} days ({hard} over {args.max_guesses} guesses) -> {out_path}")
+
+if __name__ == "__main__":
+    main()
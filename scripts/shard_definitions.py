@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Split word-definitions-{YEAR}.json (from build_word_definitions_full.py or
+apply_easton_definitions.py) into small shards, so serving one word reads
+only that word's bytes rather than parsing every year's definitions.
+
+Layouts (--by):
+  word   <outdir>/words/<WORD>.json holds just that word's definitions value.
+         A reader builds the path from the word and needs no manifest, so the
+         cost of serving one word doesn't grow as years are added.
+  month  <outdir>/<YYYY-MM>.json holds the words whose first puzzle date is in that month,
+         as one minified {"WORD": value, ...} object (unscheduled words go to
+         unscheduled.json). The manifest gives each value's byte range, so a reader
+         seeks and parses only that slice.
+
+<outdir>/manifest.json (written last; its presence marks a complete set):
+  {"version": 1, "layout": "month", "shards": ["2025-01.json", ...],
+   "words": {"ABRAHAM": [shard index, byte offset, byte length], ...}, "metadata": {...}}
+Word layout uses the same format with a shard per word, offset 0.
+
+Inputs default to every lib/data/word-definitions-{YEAR}.json. When a word
+appears in several years, the later year wins. Shards listed in the previous
+manifest that are no longer produced are removed; nothing else in --outdir is
+ever deleted.
+
+Usage:
+  python3 scripts/shard_definitions.py
+  python3 scripts/shard_definitions.py --by month --outdir /tmp/defs
+  python3 scripts/shard_definitions.py --lookup ABRAHAM JESUS --bench
+"""
+
+import argparse, json, random, re, time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import instrument
+from json_output import write_json
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "lib" / "data"
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+DEFS_FILE_RE = re.compile(r"^word-definitions-(\d{4})\.json$")
+PUZZLE_FILE_RE = re.compile(r"^puzzles-(\d{4})\.json$")
+WORD_RE = re.compile(r"^[A-Z]+$")
+UNSCHEDULED = "unscheduled"
+SHARD_NAME_RE = re.compile(rf"^(?:words/[A-Z]+|\d{{4}}-\d{{2}}|{UNSCHEDULED})\.json$")
+
+def definition_files(data_dir: Path) -> List[Path]:
+    return sorted(p for p in data_dir.glob("word-definitions-*.json") if DEFS_FILE_RE.match(p.name))
+
+def merge_definitions(paths: List[Path]) -> Tuple[Dict[str, object], List[dict]]:
+    """WORD -> definitions value across files (later files win), plus each file's metadata."""
+    merged: Dict[str, object] = {}
+    sources = []
+    for p in paths:
+        data = json.loads(p.read_text(encoding="utf-8"))
+        defs = data.get("definitions") if isinstance(data, dict) else None
+        if not isinstance(defs, dict):
+            raise RuntimeError(f"{p} missing {{\"definitions\": {{...}}}}")
+        for w, v in defs.items():
+            if v:
+                merged[w.strip().upper()] = v
+        sources.append({"file": p.name, **(data.get("metadata") or {})})
+    return merged, sources
+
+def first_dates(data_dir: Path) -> Dict[str, str]:
+    """WORD -> earliest puzzle date across every puzzles-{YEAR}.json."""
+    first: Dict[str, str] = {}
+    for p in sorted(data_dir.glob("puzzles-*.json")):
+        if not PUZZLE_FILE_RE.match(p.name):
+            continue
+        for ds, rec in json.loads(p.read_text(encoding="utf-8")).items():
+            w = str((rec.get("word") if isinstance(rec, dict) else rec) or "").strip().upper()
+            if w and (w not in first or ds < first[w]):
+                first[w] = ds
+    return first
+
+def _encode(value) -> bytes:
+    # must match write_json(minify=True) byte for byte; main() re-reads every range to check
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def write_month_shard(path: Path, entries: Dict[str, object]) -> Dict[str, Tuple[int, int]]:
+    """Write one minified shard; returns WORD -> (offset, length) of each value."""
+    ranges = {}
+    pos = 1  # "{"
+    for i, (w, v) in enumerate(entries.items()):
+        pos += (1 if i else 0) + len(_encode(w)) + 1  # "," + "KEY" + ":"
+        n = len(_encode(v))
+        ranges[w] = (pos, n)
+        pos += n
+    write_json(path, entries, minify=True, compress=False, quiet=True)
+    return ranges
+
+def build_shards(defs: Dict[str, object], outdir: Path, layout: str, dates: Dict[str, str]) -> dict:
+    shards: List[str] = []
+    words: Dict[str, list] = {}
+    keys = [w for w in sorted(defs) if WORD_RE.match(w)]  # the only keys ShardedDefinitions.get accepts
+    if layout == "word":
+        for w in keys:
+            name = f"words/{w}.json"
+            stats = write_json(outdir / name, defs[w], minify=True, compress=False, quiet=True)
+            words[w] = [len(shards), 0, stats["bytes"]]
+            shards.append(name)
+    else:
+        groups: Dict[str, Dict[str, object]] = {}
+        for w in keys:
+            groups.setdefault(dates[w][:7] if w in dates else UNSCHEDULED, {})[w] = defs[w]
+        for key in sorted(groups):
+            name = f"{key}.json"
+            for w, (off, n) in write_month_shard(outdir / name, groups[key]).items():
+                words[w] = [len(shards), off, n]
+            shards.append(name)
+    return {"shards": shards, "words": words}
+
+def previous_shards(outdir: Path) -> List[str]:
+    """Shard names listed by the manifest already in outdir; none if there is no manifest."""
+    try:
+        old = json.loads((outdir / MANIFEST).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    return [n for n in old.get("shards") or [] if isinstance(n, str) and SHARD_NAME_RE.match(n)]
+
+def prune(outdir: Path, previous: List[str], keep: List[str]) -> int:
+    """Remove shards the previous manifest listed that this run didn't write."""
+    keep_set = set(keep)
+    removed = 0
+    for name in previous:
+        p = outdir / name
+        if name not in keep_set and p.is_file():
+            p.unlink()
+            removed += 1
+    return removed
+
+class ShardedDefinitions:
+    """Reader for a shard directory. The manifest is only loaded when a word has no words/<WORD>.json."""
+
+    def __init__(self, outdir: Path):
+        self.outdir = Path(outdir)
+        self._manifest: Optional[dict] = None
+        self.bytes_read = 0
+
+    @property
+    def manifest(self) -> dict:
+        if self._manifest is None:
+            self._manifest = json.loads((self.outdir / MANIFEST).read_text(encoding="utf-8"))
+        return self._manifest
+
+    def get(self, word: str) -> Optional[object]:
+        w = word.strip().upper()
+        if not WORD_RE.match(w):
+            return None
+        p = self.outdir / "words" / f"{w}.json"
+        if p.exists():
+            raw = p.read_bytes()
+        elif self.manifest["layout"] == "month" and w in self.manifest["words"]:
+            shard, off, n = self.manifest["words"][w]
+            with (self.outdir / self.manifest["shards"][shard]).open("rb") as f:
+                f.seek(off)
+                raw = f.read(n)
+        else:
+            return None
+        self.bytes_read += len(raw)
+        return json.loads(raw)
+
+def bench(inputs: List[Path], outdir: Path, words: List[str], queries: int, seed: int):
+    """Cold single-word reads: whole-file parse of every input vs one shard read."""
+    sample = random.Random(seed).choices(words, k=queries)
+    t0 = time.perf_counter()
+    for w in sample:
+        for p in reversed(inputs):
+            if w in json.loads(p.read_text(encoding="utf-8"))["definitions"]:
+                break
+    t_full = (time.perf_counter() - t0) / queries
+    full_bytes = sum(p.stat().st_size for p in inputs)
+    t0 = time.perf_counter()
+    read = 0
+    for w in sample:
+        reader = ShardedDefinitions(outdir)  # fresh reader: nothing cached between requests
+        reader.get(w)
+        read += reader.bytes_read
+    t_shard = (time.perf_counter() - t0) / queries
+    print(f"[bench] whole file: {t_full * 1e6:9.1f} us/word, up to {full_bytes:,} B parsed | "
+          f"shard: {t_shard * 1e6:9.1f} us/word, {read / queries:,.0f} B/word | {t_full / max(t_shard, 1e-9):.1f}x")
+
+def main():
+    ap = argparse.ArgumentParser(description="Shard word-definitions-{YEAR}.json into per-word or per-month files.")
+    ap.add_argument("--data-dir", default=str(DATA_DIR), help="where word-definitions-* and puzzles-* live (default lib/data)")
+    ap.add_argument("--inputs", nargs="+", help="definition files (default: every <data-dir>/word-definitions-{YEAR}.json)")
+    ap.add_argument("--outdir", default=None, help="shard directory (default: <data-dir>/definitions)")
+    ap.add_argument("--by", choices=["word", "month"], default="word", help="shard layout (default word)")
+    ap.add_argument("--lookup", nargs="+", metavar="WORD", help="read these words back from the shards and print them")
+    ap.add_argument("--bench", action="store_true", help="time cold single-word reads against whole-file parsing")
+    ap.add_argument("--queries", type=int, default=200, help="lookups for --bench")
+    ap.add_argument("--seed", type=int, default=1)
+    instrument.add_instrument_args(ap)
+    args = ap.parse_args()
+    instrument.start(args, "shard_definitions")
+
+    data_dir = Path(args.data_dir)
+    outdir = Path(args.outdir or data_dir / "definitions")
+    inputs = [Path(p) for p in args.inputs] if args.inputs else definition_files(data_dir)
+
+    if not args.lookup or args.bench:
+        if not inputs:
+            raise SystemExit(f"no word-definitions-*.json in {data_dir}")
+        with instrument.stage("load"):
+            defs, sources = merge_definitions(inputs)
+            dates = first_dates(data_dir) if args.by == "month" else {}
+        instrument.count("words", len(defs))
+        with instrument.stage("write"):
+            previous = previous_shards(outdir)
+            built = build_shards(defs, outdir, args.by, dates)
+            removed = prune(outdir, previous, built["shards"])
+            manifest = {
+                "version": FORMAT_VERSION, "layout": args.by, **built,
+                "metadata": {"generated": datetime.now(timezone.utc).isoformat(), "sources": sources},
+            }
+            write_json(outdir / MANIFEST, manifest, minify=True, compress=False, quiet=True)
+        instrument.count("shards", len(built["shards"]))
+        instrument.count("stale_removed", removed)
+
+        with instrument.stage("verify"):
+            reader = ShardedDefinitions(outdir)
+            bad = [w for w in built["words"] if reader.get(w) != defs[w]]
+        if bad:
+            raise SystemExit(f"round-trip failed on {len(bad)} word(s): {', '.join(bad[:20])}")
+        skipped = len(defs) - len(built["words"])
+        sizes = sorted(n for _, _, n in built["words"].values())
+        median = sizes[len(sizes) // 2] if sizes else 0
+        print(f"Wrote {len(built['words'])} words in {len(built['shards'])} {args.by} shards "
+              f"({skipped} non A-Z keys skipped, median {median:,} B/word, manifest "
+              f"{(outdir / MANIFEST).stat().st_size:,} B, {removed} stale removed) -> {outdir}")
+        if args.bench:
+            with instrument.stage("bench"):
+                bench(inputs, outdir, sorted(built["words"]), args.queries, args.seed)
+
+    if args.lookup:
+        reader = ShardedDefinitions(outdir)
+        for w in args.lookup:
+            print(json.dumps({w.upper(): reader.get(w)}, ensure_ascii=False, indent=2))
+        print(f"({reader.bytes_read:,} B read)")
+
+if __name__ == "__main__":
+    main()
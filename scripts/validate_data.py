@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Validate every game data file in lib/data in one pass.
+
+Loads dictionary{5,6,7}.json, puzzles-{YEAR}.json, clues-{YEAR}.json and
+word-definitions-{YEAR}.json once into set/dict indexes, then checks:
+
+  dictionary_duplicates     same word twice in a dictionary (case-insensitive)
+  dictionary_bad_words      word that isn't N letters a-z in dictionary{N}.json
+  dictionary_non_strings    entry in a dictionary that isn't a string (number, null, ...)
+  duplicate_keys            repeated object key inside any JSON file
+  puzzle_bad_words          puzzle word not 5-7 letters a-z, or "len" disagrees
+  puzzle_wrong_year         date key outside the file's year
+  puzzle_not_in_dictionary  puzzle word missing from dictionary{len}.json
+  puzzle_duplicate_words    same word scheduled on more than one date
+  puzzle_missing_clue       no embedded clue and none in clues-{YEAR}.json
+  puzzle_missing_definition no (non-empty) entry in word-definitions-{YEAR}.json
+  definitions_file_missing  puzzle year with no word-definitions file at all
+
+Prints a JSON report (or writes it with --report) and exits 1 if any check
+not listed in --ignore found problems.
+
+Usage:
+  python3 scripts/validate_data.py
+  python3 scripts/validate_data.py --report /tmp/data-report.json --ignore puzzle_missing_definition
+"""
+
+import argparse, json, re, sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import instrument
+from json_output import write_json
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "lib" / "data"
+
+LENGTHS = (5, 6, 7)
+WORD_RE = re.compile(r"^[A-Z]+$")
+YEAR_FILE_RE = re.compile(r"^(puzzles|clues|word-definitions)-(\d{4})\.json$")
+
+CHECKS = (
+    "dictionary_duplicates", "dictionary_bad_words", "dictionary_non_strings", "duplicate_keys",
+    "puzzle_bad_words", "puzzle_wrong_year", "puzzle_not_in_dictionary",
+    "puzzle_duplicate_words", "puzzle_missing_clue", "puzzle_missing_definition",
+    "definitions_file_missing",
+)
+
+def length_for(path) -> int:
+    """Word length from a dictionary{N}.json file name (7 if the name has no digit)."""
+    m = re.search(r"(\d+)", Path(path).name)
+    return int(m.group(1)) if m else 7
+
+def dictionary_issues(words: Iterable, length: int) -> Dict[str, List]:
+    """
+    Duplicates (case-insensitive, in order), words that aren't `length`
+    letters a-z, and entries that aren't strings at all (reported only there).
+    """
+    seen = set()
+    duplicates, bad, non_strings = [], [], []
+    for w in words:
+        if not isinstance(w, str):
+            non_strings.append(w)
+            continue
+        s = w.strip().upper()
+        if not WORD_RE.match(s) or len(s) != length:
+            bad.append(w)
+        if s in seen:
+            duplicates.append(w)
+        seen.add(s)
+    return {"duplicates": duplicates, "bad_words": bad, "non_strings": non_strings}
+
+class DataSet:
+    """Every data file parsed once, plus the indexes the checks share."""
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = data_dir
+        self.duplicate_keys: List[dict] = []
+        self.dictionaries: Dict[int, list] = {}
+        self.dictionary_sets: Dict[int, set] = {}
+        self.puzzles: Dict[int, dict] = {}
+        self.clues: Dict[int, Dict[str, str]] = {}
+        self.definitions: Dict[int, dict] = {}
+        self.ignored_files: List[str] = []
+
+        for n in LENGTHS:
+            p = data_dir / f"dictionary{n}.json"
+            if p.exists():
+                words = self._load(p)
+                self.dictionaries[n] = words
+                self.dictionary_sets[n] = {w.strip().upper() for w in words if isinstance(w, str)}
+
+        for p in sorted(data_dir.glob("*.json")):
+            m = YEAR_FILE_RE.match(p.name)
+            if not m:
+                if p.name.startswith(("puzzles-", "clues-", "word-definitions-")):
+                    self.ignored_files.append(p.name)
+                continue
+            kind, year = m.group(1), int(m.group(2))
+            data = self._load(p)
+            if kind == "puzzles":
+                self.puzzles[year] = data
+            elif kind == "clues":
+                # normalize keys once so lookups are a single hash probe
+                self.clues[year] = {str(k).strip().upper(): v for k, v in data.items()}
+            else:
+                defs = data.get("definitions", {}) if isinstance(data, dict) else {}
+                self.definitions[year] = {str(k).strip().upper(): v for k, v in defs.items()}
+
+    def _load(self, path: Path):
+        def pairs_hook(pairs):
+            obj = {}
+            for k, v in pairs:
+                if k in obj:
+                    self.duplicate_keys.append({"file": path.name, "key": k})
+                obj[k] = v
+            return obj
+        return json.loads(path.read_text(encoding="utf-8"), object_pairs_hook=pairs_hook)
+
+def validate(ds: DataSet) -> Dict[str, List]:
+    found: Dict[str, List] = {c: [] for c in CHECKS}
+    found["duplicate_keys"] = ds.duplicate_keys
+
+    for n, words in ds.dictionaries.items():
+        issues = dictionary_issues(words, n)
+        found["dictionary_duplicates"] += [{"file": f"dictionary{n}.json", "word": w} for w in issues["duplicates"]]
+        found["dictionary_bad_words"] += [{"file": f"dictionary{n}.json", "word": w} for w in issues["bad_words"]]
+        found["dictionary_non_strings"] += [{"file": f"dictionary{n}.json", "entry": w} for w in issues["non_strings"]]
+
+    dates_by_word: Dict[str, List[str]] = defaultdict(list)
+    for year in sorted(ds.puzzles):
+        fname = f"puzzles-{year}.json"
+        clues = ds.clues.get(year, {})
+        defs = ds.definitions.get(year)
+        if defs is None:
+            found["definitions_file_missing"].append({"year": year, "file": f"word-definitions-{year}.json"})
+        for date, rec in ds.puzzles[year].items():
+            rec = rec if isinstance(rec, dict) else {"word": rec}
+            word = str(rec.get("word") or "").strip().upper()
+            where = {"file": fname, "date": date, "word": word}
+
+            if not date.startswith(f"{year}-"):
+                found["puzzle_wrong_year"].append(where)
+            declared = rec.get("len")
+            if not WORD_RE.match(word) or len(word) not in LENGTHS or (declared is not None and declared != len(word)):
+                found["puzzle_bad_words"].append({**where, "len": declared})
+                continue
+            dates_by_word[word].append(date)
+
+            if word not in ds.dictionary_sets.get(len(word), ()):
+                found["puzzle_not_in_dictionary"].append(where)
+            if not (rec.get("clue") or "").strip() and not (clues.get(word) or "").strip():
+                found["puzzle_missing_clue"].append(where)
+            if defs is not None and not defs.get(word):
+                found["puzzle_missing_definition"].append(where)
+
+    found["puzzle_duplicate_words"] = [
+        {"word": w, "dates": dates} for w, dates in dates_by_word.items() if len(dates) > 1
+    ]
+    return found
+
+def build_report(ds: DataSet, found: Dict[str, List], ignore: Iterable[str]) -> dict:
+    ignore = set(ignore)
+    failed = [c for c in CHECKS if found[c] and c not in ignore]
+    return {
+        "ok": not failed,
+        "failed": failed,
+        "ignored": sorted(ignore),
+        "files": {
+            "dictionaries": {str(n): len(w) for n, w in ds.dictionaries.items()},
+            "puzzles": {str(y): len(p) for y, p in ds.puzzles.items()},
+            "clues": {str(y): len(c) for y, c in ds.clues.items()},
+            "definitions": {str(y): len(d) for y, d in ds.definitions.items()},
+            "not_checked": ds.ignored_files,
+        },
+        "counts": {c: len(found[c]) for c in CHECKS},
+        "issues": found,
+    }
+
+def main():
+    ap = argparse.ArgumentParser(description="Validate lib/data dictionaries, puzzles, clues and definitions together.")
+    ap.add_argument("--data-dir", default=str(DATA_DIR), help="data directory (default lib/data)")
+    ap.add_argument("--report", help="write the JSON report here instead of stdout")
+    ap.add_argument("--ignore", nargs="+", default=[], choices=CHECKS, metavar="CHECK",
+                    help="checks that are reported but don't fail the run")
+    instrument.add_instrument_args(ap)
+    args = ap.parse_args()
+    instrument.start(args, "validate_data")
+
+    ds = DataSet(Path(args.data_dir))
+    with instrument.stage("validate"):
+        found = validate(ds)
+    report = build_report(ds, found, args.ignore)
+    if args.report:
+        write_json(args.report, report, compress=False, quiet=True)
+        summary = ", ".join(f"{c}={report['counts'][c]}" for c in report["failed"]) or "all checks passed"
+        print(f"{'OK' if report['ok'] else 'FAILED'}: {summary} -> {args.report}", file=sys.stderr)
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    sys.exit(0 if report["ok"] else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Root extraction for upper-case puzzle words, shared by
+apply_easton_definitions.py (lemma headword matches) and
+build_daily_puzzles.py (no two days in a row on the same root).
+
+The rules are deliberately conservative: a listed irregular form, or one
+verb inflection stripped from a stem of at least three letters. A missed
+root costs a little variety; a wrong one links unrelated words.
+"""
+
+from typing import FrozenSet, Iterator
+
+# Archaic / irregular forms common in puzzle words whose lemma no suffix rule reaches
+IRREGULAR_LEMMAS = {
+    "AROSE": "ARISE", "ARISEN": "ARISE", "ATE": "EAT", "BADE": "BID", "BEGAT": "BEGET",
+    "BEGOT": "BEGET", "BEGOTTEN": "BEGET", "BEHELD": "BEHOLD", "BORE": "BEAR",
+    "BORNE": "BEAR", "BOUGHT": "BUY", "BROUGHT": "BRING", "BROKE": "BREAK",
+    "BROKEN": "BREAK", "CAUGHT": "CATCH", "CHOSE": "CHOOSE",
+    "CHOSEN": "CHOOSE", "CLAVE": "CLEAVE", "CLOVEN": "CLEAVE", "DREW": "DRAW",
+    "DRAWN": "DRAW", "DROVE": "DRIVE", "DRIVEN": "DRIVE", "DWELT": "DWELL",
+    "FED": "FEED", "FELL": "FALL", "FLED": "FLEE", "FORGAVE": "FORGIVE",
+    "FORGIVEN": "FORGIVE", "FORSOOK": "FORSAKE", "FORSAKEN": "FORSAKE",
+    "FOUGHT": "FIGHT", "GAVE": "GIVE", "GIVEN": "GIVE", "HELD": "HOLD",
+    "KNEW": "KNOW", "KNOWN": "KNOW", "LAID": "LAY", "LED": "LEAD", "MADE": "MAKE",
+    "RENT": "REND", "ROSE": "RISE", "RISEN": "RISE", "SAT": "SIT", "SENT": "SEND",
+    "SHOD": "SHOE", "SLAIN": "SLAY", "SLEW": "SLAY", "SMITTEN": "SMITE",
+    "SMOTE": "SMITE", "SOLD": "SELL", "SOUGHT": "SEEK", "SPAKE": "SPEAK",
+    "SPOKE": "SPEAK", "SPOKEN": "SPEAK", "STOOD": "STAND", "SWARE": "SWEAR",
+    "SWORE": "SWEAR", "SWORN": "SWEAR", "TAUGHT": "TEACH", "TOOK": "TAKE",
+    "TAKEN": "TAKE", "THOUGHT": "THINK", "TROD": "TREAD", "TRODDEN": "TREAD",
+    "WENT": "GO", "WEPT": "WEEP", "WON": "WIN", "WOVE": "WEAVE", "WROTE": "WRITE",
+    "WRITTEN": "WRITE", "WROUGHT": "WORK",
+}
+
+# (suffix, replacement) pairs tried in order: CALLETH -> CALL, LOVETH -> LOVE, ...
+# Only verb inflections; -ER/-EN and doubled consonants map too many unrelated
+# words onto each other (BITTER -> BIT), so those forms go in IRREGULAR_LEMMAS.
+_SUFFIX_RULES = (
+    ("IES", "Y"), ("IED", "Y"), ("IETH", "Y"),
+    ("ETH", ""), ("ETH", "E"), ("EST", ""), ("EST", "E"),
+    ("ING", ""), ("ING", "E"), ("ED", ""), ("ED", "E"), ("S", ""),
+)
+
+def lemma_candidates(key: str) -> Iterator[str]:
+    """Possible lemmas of an upper-case word (not including the word itself)."""
+    if key in IRREGULAR_LEMMAS:
+        yield IRREGULAR_LEMMAS[key]
+    for suf, rep in _SUFFIX_RULES:
+        if key.endswith(suf) and len(key) - len(suf) >= 3 and not key.endswith("SS"):
+            yield key[:-len(suf)] + rep
+
+def roots(word: str) -> FrozenSet[str]:
+    """The word plus its plausible lemmas; two words share a root if these intersect."""
+    return frozenset((word, *lemma_candidates(word)))